@@ -0,0 +1,171 @@
+"""
+Relationship storage for graph nodes
+Edges are held as compressed sparse row (CSR) arrays over node ordinals
+"""
+from array import array
+from copy import copy
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
+
+
+OUTGOING = "OUTGOING"
+INCOMING = "INCOMING"
+BOTH = "BOTH"
+
+
+class CSRAdjacency:
+    """
+    Adjacency for one edge direction in compressed sparse row form
+
+    The neighbors of node i are neighbors[offsets[i]:offsets[i + 1]], with
+    the matching edge ordinals at the same positions in edges. Expanding a
+    node is a slice of length degree; no edge list is ever scanned.
+    """
+
+    def __init__(self, node_count: int, pairs: Sequence[Tuple[int, int]]):
+        """
+        Args:
+            node_count: Number of node ordinals
+            pairs: (from ordinal, to ordinal) per edge, indexed by edge ordinal
+        """
+        # Counting sort: degree per node, prefix sums, then scatter
+        offsets = array("q", bytes(8 * (node_count + 1)))
+        for source, _ in pairs:
+            offsets[source + 1] += 1
+        for i in range(node_count):
+            offsets[i + 1] += offsets[i]
+
+        neighbors = array("q", bytes(8 * len(pairs)))
+        edges = array("q", bytes(8 * len(pairs)))
+        cursor = array("q", offsets[:-1])
+        for edge, (source, target) in enumerate(pairs):
+            position = cursor[source]
+            neighbors[position] = target
+            edges[position] = edge
+            cursor[source] = position + 1
+
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.edges = edges
+
+    def extended(self, node_count: int) -> "CSRAdjacency":
+        """
+        Get adjacency over more node ordinals, the new ones without edges
+
+        The edge arrays are shared with this instance, which is unchanged.
+        """
+        adjacency = CSRAdjacency.__new__(CSRAdjacency)
+        adjacency.neighbors = self.neighbors
+        adjacency.edges = self.edges
+        added = node_count + 1 - len(self.offsets)
+        adjacency.offsets = self.offsets + array("q", [self.offsets[-1]]) * added
+        return adjacency
+
+    def degree(self, ordinal: int) -> int:
+        """Number of edges leaving a node in this direction"""
+        return self.offsets[ordinal + 1] - self.offsets[ordinal]
+
+    def expand(self, ordinal: int) -> Tuple[array, array]:
+        """Get (neighbor ordinals, edge ordinals) of a node"""
+        start, end = self.offsets[ordinal], self.offsets[ordinal + 1]
+        return self.neighbors[start:end], self.edges[start:end]
+
+
+class RelationshipStore:
+    """
+    Typed edges between nodes with outgoing and incoming CSR adjacency
+    """
+
+    def __init__(self, relationships: Sequence[Dict[str, Any]], ids: Dict[str, int],
+                 node_count: int):
+        """
+        Args:
+            relationships: Edge dicts with relationship_id, type, source,
+                target and optional properties
+            ids: node_id -> ordinal map of the node index
+            node_count: Number of node ordinals
+        """
+        # Edges whose endpoints are not loaded are dropped
+        self.source = relationships
+        self.relationships = []
+        self.dropped = []
+        for rel in relationships:
+            if rel["source"] in ids and rel["target"] in ids:
+                self.relationships.append(rel)
+            else:
+                self.dropped.append(rel)
+        self.types: List[str] = []
+        type_ids: Dict[str, int] = {}
+        self.edge_types = array("l")
+        pairs = []
+        for rel in self.relationships:
+            type_id = type_ids.get(rel["type"])
+            if type_id is None:
+                type_id = type_ids[rel["type"]] = len(self.types)
+                self.types.append(rel["type"])
+            self.edge_types.append(type_id)
+            pairs.append((ids[rel["source"]], ids[rel["target"]]))
+
+        self.type_ids = type_ids
+        self.outgoing = CSRAdjacency(node_count, pairs)
+        self.incoming = CSRAdjacency(node_count, [(t, s) for s, t in pairs])
+
+    def with_nodes(self, ids: Dict[str, int], node_count: int) -> "RelationshipStore":
+        """
+        Get the store for a node set that grew, keeping existing ordinals
+
+        Unless a new node completes one of the dropped edges, the CSR
+        arrays are shared and only padded for the new ordinals.
+
+        Args:
+            ids: node_id -> ordinal map of the new node index
+            node_count: Number of node ordinals in the new index
+        """
+        if any(rel["source"] in ids and rel["target"] in ids for rel in self.dropped):
+            return RelationshipStore(self.source, ids, node_count)
+        store = copy(self)
+        store.outgoing = self.outgoing.extended(node_count)
+        store.incoming = self.incoming.extended(node_count)
+        return store
+
+    def expand(self, ordinal: int, direction: str = BOTH,
+               types: Optional[List[str]] = None) -> Iterator[Tuple[int, int, str]]:
+        """
+        Iterate over the edges of a node
+
+        Args:
+            ordinal: Node ordinal
+            direction: OUTGOING, INCOMING or BOTH
+            types: Relationship types to keep, or None for all
+
+        Yields:
+            (neighbor ordinal, edge ordinal, direction) per edge
+        """
+        wanted = None
+        if types is not None:
+            wanted = {self.type_ids[t] for t in types if t in self.type_ids}
+            if not wanted:
+                return
+
+        sides = []
+        if direction in (OUTGOING, BOTH):
+            sides.append((self.outgoing, OUTGOING))
+        if direction in (INCOMING, BOTH):
+            sides.append((self.incoming, INCOMING))
+
+        edge_types = self.edge_types
+        for adjacency, side in sides:
+            neighbors, edges = adjacency.expand(ordinal)
+            for neighbor, edge in zip(neighbors, edges):
+                if wanted is None or edge_types[edge] in wanted:
+                    yield neighbor, edge, side
+
+    def describe(self, edge: int, direction: str, neighbor_id: str) -> Dict[str, Any]:
+        """Build the API representation of an edge seen from one endpoint"""
+        rel = self.relationships[edge]
+        return {
+            "relationship_id": rel["relationship_id"],
+            "type": rel["type"],
+            "direction": direction,
+            "target_node_id": neighbor_id,
+            "properties": rel.get("properties", {}),
+        }
@@ -0,0 +1,171 @@
+"""
+Aggregations over node indexes
+Counts come from posting list sizes and numeric summaries from range
+indexes, so no node is ever read
+"""
+import heapq
+import math
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .indexes import NodeIndex, contains_ordinal
+
+# Most histogram buckets one summary may return
+MAX_BUCKETS = 1000
+
+
+class HistogramError(ValueError):
+    """The histogram would have more than MAX_BUCKETS buckets"""
+
+
+class Aggregator:
+    """
+    Computes group-by counts and numeric summaries against a NodeIndex
+
+    Groups are the posting lists of a label or property value, so an
+    unfiltered count is the length of each list. A filter, given as the
+    ascending ordinals it matched, is intersected with each list by
+    probing or by set membership, whichever touches fewer entries.
+    """
+
+    def __init__(self, index: NodeIndex):
+        self.index = index
+
+    def groups(self, group_by: str) -> List[Tuple[Any, List[int]]]:
+        """
+        Get (value, ascending ordinals) for every value of a field
+
+        Labels group by label, so a node with several labels is in several
+        groups. String properties group case-insensitively under their
+        folded value; numbers keep their numeric value.
+        """
+        index = self.index
+        if group_by in ("label", "type"):
+            return list(index.labels.items())
+
+        groups = list(index.text_values.get(group_by, {}).items())
+        ranges = index.ranges.get(group_by)
+        for value, ordinals in index.raw_values.get(group_by, {}).items():
+            # Numbers are only indexed as str(value); the range index has the number
+            if ranges is not None and ordinals[0] in ranges.values:
+                value = ranges.values[ordinals[0]]
+            groups.append((value, ordinals))
+        return groups
+
+    @staticmethod
+    def restrict(ordinals: List[int], selected: Optional[List[int]],
+                 selected_set: Optional[set]) -> List[int]:
+        """Intersect a posting list with the filter's ordinals, if any"""
+        if selected is None:
+            return ordinals
+        if len(selected) * max(len(ordinals).bit_length(), 1) < len(ordinals):
+            return [ordinal for ordinal in selected if contains_ordinal(ordinals, ordinal)]
+        return [ordinal for ordinal in ordinals if ordinal in selected_set]
+
+    def summarize(self, ordinals: Optional[List[int]], field: Optional[str] = None,
+                  bucket_size: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Summarize a set of nodes
+
+        Args:
+            ordinals: The nodes, or None for every node
+            field: Numeric field to report min, max and avg of
+            bucket_size: Width of the histogram buckets over field, if wanted
+
+        Returns:
+            Dict with count, plus min/max/avg and histogram when requested
+
+        Raises:
+            HistogramError: If the histogram would have too many buckets
+        """
+        count = len(self.index.nodes) if ordinals is None else len(ordinals)
+        summary: Dict[str, Any] = {"count": count}
+        if field is None:
+            return summary
+
+        values = self._sorted_values(field, ordinals)
+        if values:
+            summary.update(min=values[0], max=values[-1], avg=math.fsum(values) / len(values))
+        else:
+            summary.update(min=None, max=None, avg=None)
+        if bucket_size is not None:
+            summary["histogram"] = self.histogram(values, bucket_size)
+        return summary
+
+    def _sorted_values(self, field: str, ordinals: Optional[List[int]]) -> Sequence[float]:
+        """Get the values of a numeric field for some nodes, ascending"""
+        ranges = self.index.ranges.get(field)
+        if ranges is None:
+            return []
+        if ordinals is None:
+            # The range index keeps every value sorted already
+            return ranges.keys
+        get = ranges.values.get
+        return sorted(value for value in map(get, ordinals) if value is not None)
+
+    @staticmethod
+    def histogram(values: Sequence[float], bucket_size: float) -> List[Dict[str, Any]]:
+        """
+        Count ascending values into buckets of equal width
+
+        Each non-empty bucket is found with one binary search, so the cost
+        depends on the number of buckets, not the number of values.
+
+        Raises:
+            HistogramError: If there would be more than MAX_BUCKETS buckets
+        """
+        if values and (values[-1] - values[0]) / bucket_size >= MAX_BUCKETS:
+            raise HistogramError(
+                f"bucket_size {bucket_size:g} would give more than {MAX_BUCKETS} buckets"
+            )
+        buckets = []
+        start = 0
+        while start < len(values):
+            low = math.floor(values[start] / bucket_size) * bucket_size
+            high = low + bucket_size
+            # Guard against rounding leaving a value below its own bucket's end
+            end = max(bisect_left(values, high, start), start + 1)
+            buckets.append({"start": low, "end": high, "count": end - start})
+            start = end
+        return buckets
+
+    def aggregate(self, ordinals: Optional[List[int]], group_by: Optional[str] = None,
+                  field: Optional[str] = None, bucket_size: Optional[float] = None,
+                  limit: int = 100) -> Dict[str, Any]:
+        """
+        Summarize the matched nodes overall and, optionally, per group
+
+        Args:
+            ordinals: Ascending ordinals matched by the filter, or None for all nodes
+            group_by: Field to group by ('label'/'type' or a property name)
+            field: Numeric field to summarize
+            bucket_size: Histogram bucket width over field
+            limit: Maximum number of groups to return, largest first
+
+        Returns:
+            The overall summary; with group_by, also "groups" (value plus
+            summary, largest first) and "group_count" (non-empty groups)
+
+        Raises:
+            HistogramError: If a histogram would have too many buckets
+        """
+        result = self.summarize(ordinals, field, bucket_size)
+        if group_by is None:
+            return result
+
+        selected_set = set(ordinals) if ordinals is not None else None
+        members = []
+        for value, postings in self.groups(group_by):
+            postings = self.restrict(postings, ordinals, selected_set)
+            if postings:
+                members.append((value, postings))
+
+        largest = heapq.nlargest(limit, members, key=lambda item: len(item[1]))
+        # Stable order among equal counts regardless of index layout
+        largest.sort(key=lambda item: (-len(item[1]), str(item[0])))
+        result["group_count"] = len(members)
+        result["groups"] = [
+            dict({"value": value}, **self.summarize(postings, field, bucket_size))
+            for value, postings in largest
+        ]
+        return result
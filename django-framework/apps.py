@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class GraphNodesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'graph_nodes'
+
+    def ready(self):
+        # Load the graph while the process starts, so it is ready (and, with
+        # uWSGI's lazy-apps off, shared by forked workers) before the first
+        # request. A failure is logged and retried on first use instead of
+        # stopping Django from starting.
+        from .services import GraphDatabaseService, GraphNotLoaded
+        try:
+            GraphDatabaseService.ensure_loaded()
+        except GraphNotLoaded:
+            pass
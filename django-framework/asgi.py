@@ -0,0 +1,16 @@
+"""
+ASGI config for graph_api project.
+
+Serves the async views without tying up a thread per in-flight request
+(set GRAPH_ASYNC_VIEWS = True in settings to route to them):
+
+    uvicorn graph_api.asgi:application --workers 4
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'graph_api.settings')
+
+application = get_asgi_application()
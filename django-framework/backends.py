@@ -0,0 +1,303 @@
+"""
+Graph database backends for the service layer
+A backend supplies the nodes and relationships GraphDatabaseService indexes
+
+A backend is a load source only: the graph is read from it in bulk when
+a worker loads (or reloads) its indexes, and every request is then
+answered from those in-memory indexes without a backend round trip.
+
+Select one with the GRAPH_BACKEND setting, e.g.
+
+    GRAPH_BACKEND = {
+        'BACKEND': 'graph_nodes.backends.NetworkBackend',
+        'OPTIONS': {'host': '127.0.0.1', 'port': 7688, 'pool_size': 8},
+    }
+
+or, to share one copy of the nodes between uWSGI workers,
+
+    GRAPH_BACKEND = {
+        'BACKEND': 'graph_nodes.backends.MappedBackend',
+        'OPTIONS': {'path': '/var/lib/graph_api/graph.nodes'},
+    }
+"""
+import os
+import random
+import socket
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .encoding import dumps, loads
+from .nodestore import MappedNodes, NodeStore, StoreError
+from .pool import ConnectionPool, PoolTimeout
+
+
+class BackendError(Exception):
+    """Base class for graph backend failures"""
+
+
+class BackendUnavailable(BackendError):
+    """The backend could not be reached, even after retrying"""
+
+
+class QueryError(BackendError):
+    """The backend rejected a request; retrying would not help"""
+
+
+class GraphBackend(ABC):
+    """
+    Interface every graph backend implements
+    """
+
+    @abstractmethod
+    def fetch_nodes(self) -> List[Dict[str, Any]]:
+        """Get every node in the graph"""
+
+    @abstractmethod
+    def fetch_relationships(self) -> List[Dict[str, Any]]:
+        """Get every relationship in the graph"""
+
+    def source(self) -> str:
+        """
+        Identify the data this backend serves, e.g. for matching snapshots
+
+        Backends configured with OPTIONS that pick the data (a file, a
+        server) include them, so pointing the backend elsewhere changes it.
+        """
+        return f"{type(self).__module__}.{type(self).__qualname__}"
+
+    def ping(self) -> bool:
+        """Check the backend is reachable"""
+        return True
+
+    def close(self):
+        """Release any connections held by the backend"""
+
+
+class InMemoryBackend(GraphBackend):
+    """
+    Backend over node and relationship lists held in this process
+    """
+
+    def __init__(self, nodes: List[Dict[str, Any]], relationships: List[Dict[str, Any]]):
+        self.nodes = nodes
+        self.relationships = relationships
+
+    def fetch_nodes(self) -> List[Dict[str, Any]]:
+        return self.nodes
+
+    def fetch_relationships(self) -> List[Dict[str, Any]]:
+        return self.relationships
+
+
+class MappedBackend(GraphBackend):
+    """
+    Backend over a memory-mapped node store file (see nodestore.py)
+
+    Every worker process maps the same file, so the nodes are held in
+    memory once however many workers there are. Nodes are decoded when
+    read, not when the store is opened. The indexes built over them are
+    still per worker; see nodestore.py for what that costs.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Node store file written by write_node_store
+
+        Raises:
+            BackendUnavailable: If the file cannot be opened or read
+        """
+        self.path = os.path.realpath(path)
+        try:
+            self.store = NodeStore(path)
+            stat = os.stat(self.path)
+        except (OSError, StoreError) as exc:
+            raise BackendUnavailable(f"Cannot open node store {path}: {exc}") from exc
+        # Size and modification time, so a rewritten file is a new source
+        self.signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def source(self) -> str:
+        return f"{super().source()}:{self.path}:{self.signature}"
+
+    def fetch_nodes(self) -> MappedNodes:
+        return MappedNodes(self.store)
+
+    def fetch_relationships(self) -> List[Dict[str, Any]]:
+        return self.store.relationships()
+
+    # close() keeps the mapping: indexes built from this backend still read
+    # nodes through it, and it is unmapped once the last of them is gone
+
+
+class SocketConnection:
+    """
+    One TCP connection speaking line-delimited JSON
+
+    Each request is a JSON object with an "op" key on a single line; the
+    reply is {"ok": true, "result": ...} or {"ok": false, "error": ...}.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile('rb')
+
+    def request(self, op: str, **params) -> Any:
+        """
+        Send one request and wait for its reply
+
+        Raises:
+            OSError: If the connection fails or times out
+            ValueError: If the reply is not valid JSON
+            QueryError: If the server rejects the request
+        """
+        self.sock.sendall(dumps({"op": op, **params}) + b"\n")
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by graph server")
+        reply = loads(line)
+        if not reply.get("ok"):
+            raise QueryError(reply.get("error", "Unknown error"))
+        return reply.get("result")
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+class NetworkBackend(GraphBackend):
+    """
+    Backend that queries a graph server over pooled TCP connections
+
+    The pool carries the bulk loads of the graph, not per-request reads;
+    requests are answered from the indexes built over what it loaded.
+    Failed requests (connection errors, timeouts, a full pool) are retried
+    with exponential backoff and jitter; a request the server rejects is
+    not. Every request is a read, so retrying is always safe.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 7688, pool_size: int = 8,
+                 timeout: float = 5.0, retries: int = 3, backoff: float = 0.1,
+                 max_backoff: float = 2.0, health_check_interval: float = 30.0,
+                 batch_size: int = 10000):
+        """
+        Args:
+            host: Graph server host
+            port: Graph server port
+            pool_size: Maximum open connections
+            timeout: Seconds allowed to connect, to read a reply, or to wait
+                for a free connection
+            retries: Extra attempts after a failed request
+            backoff: Delay before the first retry, doubled for each retry after
+            max_backoff: Longest delay between retries
+            health_check_interval: Idle seconds after which a pooled
+                connection is pinged before reuse
+            batch_size: Nodes or relationships fetched per request
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+        self.pool = ConnectionPool(
+            lambda: SocketConnection(host, port, timeout),
+            max_size=pool_size,
+            acquire_timeout=timeout,
+            health_check=lambda conn: conn.request("ping") == "pong",
+            health_check_interval=health_check_interval,
+        )
+
+    def fetch_nodes(self) -> List[Dict[str, Any]]:
+        return self._fetch_all("nodes")
+
+    def fetch_relationships(self) -> List[Dict[str, Any]]:
+        return self._fetch_all("relationships")
+
+    def source(self) -> str:
+        return f"{super().source()}:{self.host.lower()}:{self.port}"
+
+    def ping(self) -> bool:
+        try:
+            return self._call("ping") == "pong"
+        except BackendError:
+            return False
+
+    def close(self):
+        self.pool.close()
+
+    def _fetch_all(self, op: str) -> List[Dict[str, Any]]:
+        """Fetch a whole collection in batches over reused connections"""
+        items = []
+        while True:
+            batch = self._call(op, offset=len(items), limit=self.batch_size)
+            items.extend(batch)
+            if len(batch) < self.batch_size:
+                return items
+
+    def _call(self, op: str, **params) -> Any:
+        """
+        Run one request on a pooled connection, retrying transient failures
+
+        Raises:
+            BackendUnavailable: If every attempt failed
+            QueryError: If the server rejected the request
+        """
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+            try:
+                conn = self.pool.acquire()
+            except (PoolTimeout, OSError) as exc:
+                last_error = exc
+                continue
+
+            try:
+                result = conn.request(op, **params)
+            except QueryError:
+                self.pool.release(conn)
+                raise
+            except (OSError, ValueError) as exc:
+                # The connection may be left mid-reply, so never reuse it
+                self.pool.discard(conn)
+                last_error = exc
+                continue
+            except BaseException:
+                self.pool.discard(conn)
+                raise
+            self.pool.release(conn)
+            return result
+
+        raise BackendUnavailable(
+            f"Graph server at {self.host}:{self.port} unavailable after "
+            f"{self.retries + 1} attempts: {last_error}"
+        ) from last_error
+
+
+def load_backend(config: Optional[Dict[str, Any]] = None) -> Optional[GraphBackend]:
+    """
+    Create the backend described by a config dict or the GRAPH_BACKEND setting
+
+    Args:
+        config: {'BACKEND': dotted class path, 'OPTIONS': constructor kwargs},
+            or None to read settings.GRAPH_BACKEND
+
+    Returns:
+        The backend, or None if none is configured
+    """
+    if config is None:
+        if not settings.configured:
+            return None
+        config = getattr(settings, 'GRAPH_BACKEND', None)
+        if not config:
+            return None
+    backend_class = import_string(config['BACKEND'])
+    return backend_class(**config.get('OPTIONS', {}))
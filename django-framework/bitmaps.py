@@ -0,0 +1,168 @@
+"""
+Compressed bitmaps over dense node ordinals
+Used to combine label sets with bitwise AND, OR and ANDNOT
+"""
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Sequence, Union
+
+# Ordinals are split into chunks by their high bits
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+LOW_MASK = CHUNK_SIZE - 1
+
+# Chunks with more members than this are stored as bitsets, fewer as arrays.
+# At 4096 members both take 8 KiB.
+ARRAY_MAX = 4096
+
+# A chunk: sorted array('H') of low bits, or an int with bit i set for low bits i
+Container = Union[array, int]
+
+# Set bit positions of every byte value
+_BYTE_BITS = [[bit for bit in range(8) if byte >> bit & 1] for byte in range(256)]
+
+try:
+    _popcount = int.bit_count
+except AttributeError:
+    # Python < 3.10
+    def _popcount(bits: int) -> int:
+        return bin(bits).count("1")
+
+
+def _to_bits(lows: Sequence[int]) -> int:
+    """Convert an array container to a bitset"""
+    buffer = bytearray(CHUNK_SIZE >> 3)
+    for low in lows:
+        buffer[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _to_lows(bits: int) -> List[int]:
+    """Get the set bit positions of a bitset, ascending"""
+    lows = []
+    for position, byte in enumerate(bits.to_bytes(CHUNK_SIZE >> 3, 'little')):
+        if byte:
+            base = position << 3
+            lows.extend(base + bit for bit in _BYTE_BITS[byte])
+    return lows
+
+
+def _filter(lows: Sequence[int], bits: int, keep: bool) -> List[int]:
+    """Keep the low bits that are (or, with keep=False, are not) set in a bitset"""
+    buffer = bits.to_bytes(CHUNK_SIZE >> 3, 'little')
+    return [low for low in lows if bool(buffer[low >> 3] >> (low & 7) & 1) == keep]
+
+
+def _compact(container: Union[Container, List[int]]) -> Container:
+    """Store a chunk in whichever form suits its size; empty chunks become 0"""
+    if isinstance(container, int):
+        if container and _popcount(container) <= ARRAY_MAX:
+            return array('H', _to_lows(container))
+        return container
+    if len(container) > ARRAY_MAX:
+        return _to_bits(container)
+    return container if isinstance(container, array) else array('H', container)
+
+
+def _size(container: Container) -> int:
+    return _popcount(container) if isinstance(container, int) else len(container)
+
+
+def _and(a: Container, b: Container) -> Container:
+    if isinstance(a, int) and isinstance(b, int):
+        return _compact(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return array('H', _filter(a, b, True))
+    return array('H', sorted(set(a).intersection(b)))
+
+
+def _or(a: Container, b: Container) -> Container:
+    if isinstance(a, int) or isinstance(b, int):
+        return (a if isinstance(a, int) else _to_bits(a)) | (b if isinstance(b, int) else _to_bits(b))
+    return _compact(sorted(set(a).union(b)))
+
+
+def _andnot(a: Container, b: Container) -> Container:
+    if isinstance(a, int):
+        return _compact(a & ~(b if isinstance(b, int) else _to_bits(b)))
+    if isinstance(b, int):
+        return array('H', _filter(a, b, False))
+    return array('H', sorted(set(a).difference(b)))
+
+
+class Bitmap:
+    """
+    Immutable set of node ordinals, compressed in the style of a roaring bitmap
+
+    Ordinals are grouped into chunks of 65536 by their high bits. A sparse
+    chunk is a sorted array of its low 16 bits; a dense one is a 65536-bit
+    bitset, so combining two dense chunks is a single integer operation.
+    Absent chunks cost nothing.
+    """
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks: Dict[int, Container] = None):
+        self.chunks = chunks or {}
+
+    @classmethod
+    def from_sorted(cls, ordinals: Sequence[int]) -> "Bitmap":
+        """Build a bitmap from ascending ordinals, e.g. a posting list"""
+        chunks = {}
+        start, end = 0, len(ordinals)
+        while start < end:
+            high = ordinals[start] >> CHUNK_BITS
+            stop = bisect_left(ordinals, (high + 1) << CHUNK_BITS, start, end)
+            chunks[high] = _compact([ordinal & LOW_MASK for ordinal in ordinals[start:stop]])
+            start = stop
+        return cls(chunks)
+
+    @classmethod
+    def full(cls, size: int) -> "Bitmap":
+        """Build the bitmap of every ordinal below size"""
+        chunks = {}
+        for high in range((size + LOW_MASK) >> CHUNK_BITS):
+            members = min(CHUNK_SIZE, size - (high << CHUNK_BITS))
+            chunks[high] = _compact((1 << members) - 1)
+        return cls(chunks)
+
+    def __len__(self) -> int:
+        return sum(_size(container) for container in self.chunks.values())
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        chunks = {}
+        for high, container in self.chunks.items():
+            if high in other.chunks:
+                result = _and(container, other.chunks[high])
+                if result:
+                    chunks[high] = result
+        return Bitmap(chunks)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict(self.chunks)
+        for high, container in other.chunks.items():
+            chunks[high] = _or(chunks[high], container) if high in chunks else container
+        return Bitmap(chunks)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        """ANDNOT: ordinals in this bitmap but not the other"""
+        chunks = {}
+        for high, container in self.chunks.items():
+            if high in other.chunks:
+                container = _andnot(container, other.chunks[high])
+            if container:
+                chunks[high] = container
+        return Bitmap(chunks)
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self.chunks):
+            container = self.chunks[high]
+            base = high << CHUNK_BITS
+            lows = _to_lows(container) if isinstance(container, int) else container
+            for low in lows:
+                yield base + low
+
+    def to_list(self) -> List[int]:
+        """Get the ordinals in ascending order"""
+        return list(self)
@@ -0,0 +1,197 @@
+"""
+Query result cache
+Keeps the matching ordinals of recent queries, so the handful of criteria
+that make up most traffic are resolved once per dataset version
+
+Configure with the GRAPH_QUERY_CACHE setting, e.g.
+
+    GRAPH_QUERY_CACHE = {
+        'MAX_SIZE': 1000000,
+        'ENCODED_MAX_BYTES': 64 * 1024 * 1024,
+    }
+
+MAX_SIZE budgets the total ordinals held across all cached results;
+0 turns the cache off. ENCODED_MAX_BYTES budgets the JSON bytes of
+encoded nodes kept by EncodedCache in each worker.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from django.conf import settings
+
+# Ordinals held when GRAPH_QUERY_CACHE gives no MAX_SIZE
+DEFAULT_MAX_SIZE = 1_000_000
+
+# Encoded node bytes held when GRAPH_QUERY_CACHE gives no ENCODED_MAX_BYTES
+DEFAULT_ENCODED_MAX_BYTES = 64 * 1024 * 1024
+
+# Rough per-entry cost of the key, tuple and ETag on top of the JSON bytes
+ENCODED_ENTRY_OVERHEAD = 200
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of query results for one dataset generation
+
+    Entries are not timed out. Every lookup names the generation (dataset
+    version) it reads, and a newer generation than the cached one empties
+    the cache, so results never outlive the data they were computed from.
+    Lookups and stores for an older generation, from readers still on the
+    previous snapshot, miss and are dropped rather than switching back.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.generation: Optional[int] = None
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # key -> (ordinals, plan), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[List[int], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _weight(ordinals: List[int]) -> int:
+        # Every entry costs at least 1, so empty results still count
+        return len(ordinals) + 1
+
+    def _switch(self, generation: int) -> bool:
+        """
+        Drop every entry if the generation is newer than the cached one
+
+        Returns:
+            False if the generation is older, so must not be read or stored
+        """
+        if self.generation is not None and generation < self.generation:
+            return False
+        if generation != self.generation:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.size = 0
+            self.generation = generation
+        return True
+
+    def get(self, key: Hashable, generation: int) -> Optional[Tuple[List[int], Any]]:
+        """
+        Get a cached result
+
+        Returns:
+            Tuple of (ordinals, plan), or None on a miss (or when disabled)
+        """
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key) if self._switch(generation) else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, generation: int, ordinals: List[int], plan: Any = None):
+        """Cache a result, evicting the least recently used ones to make room"""
+        weight = self._weight(ordinals)
+        if weight > self.max_size:
+            return
+        with self._lock:
+            if not self._switch(generation):
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= self._weight(previous[0])
+            while self._entries and self.size + weight > self.max_size:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.size -= self._weight(evicted)
+                self.evictions += 1
+            self._entries[key] = (ordinals, plan)
+            self.size += weight
+
+    def clear(self):
+        """Drop every entry, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.generation = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.max_size > 0,
+                "generation": self.generation,
+                "entries": len(self._entries),
+                "size": self.size,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class EncodedCache:
+    """
+    Bounded LRU cache of encoded nodes, as (JSON bytes, ETag)
+
+    Keys name a node version, not just a position, so one cache can be
+    shared by every index derived from the same load: a replaced node gets
+    a new key and its old encoding simply ages out.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_ENCODED_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        # key -> (body, etag), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _weight(body: bytes) -> int:
+        return len(body) + ENCODED_ENTRY_OVERHEAD
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, str]]:
+        """Get a cached (body, etag), or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, body: bytes, etag: str):
+        """Cache an encoding, evicting the least recently used ones to make room"""
+        weight = self._weight(body)
+        if weight > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= self._weight(previous[0])
+            while self._entries and self.size + weight > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.size -= self._weight(evicted)
+                self.evictions += 1
+            self._entries[key] = (body, etag)
+            self.size += weight
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_cache_config() -> Dict[str, Any]:
+    """Get the GRAPH_QUERY_CACHE setting, or {} for the defaults"""
+    if not settings.configured:
+        return {}
+    return getattr(settings, 'GRAPH_QUERY_CACHE', None) or {}
+
+
+def get_encoded_cache_size() -> int:
+    """Get the encoded node budget from the GRAPH_QUERY_CACHE setting"""
+    return get_cache_config().get('ENCODED_MAX_BYTES', DEFAULT_ENCODED_MAX_BYTES)
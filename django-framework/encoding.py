@@ -0,0 +1,114 @@
+"""
+JSON encoding helpers shared by the service layer, renderers and views
+Output matches DRF's JSONRenderer defaults (compact, UTF-8, and no NaN or
+infinities: encoding one raises ValueError)
+
+orjson is used when installed; the standard library encoder is the fallback.
+"""
+import json
+import math
+from hashlib import blake2b
+from typing import Any, Dict, Iterable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# NaN and infinities are not JSON; like DRF's strict default, refuse them
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+
+# Types orjson would encode differently from DRF's JSONEncoder are handed
+# back to the fallback instead
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None else 0
+)
+
+# Like DRF, escape the two line separators JavaScript does not allow in strings
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Encode with the standard library encoder"""
+    return _encoder.encode(obj).encode('utf-8')
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether obj holds a NaN or infinite float anywhere"""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(map(_has_non_finite, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        return any(map(_has_non_finite, obj))
+    return False
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"{name} is not valid JSON")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode an object to compact UTF-8 JSON bytes
+
+    Raises:
+        TypeError: If the object holds values JSON cannot represent
+        ValueError: If the object holds a NaN or infinite float
+    """
+    encoded = None
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. integers wider than 64 bits; let the stdlib decide
+            pass
+        # orjson writes NaN and infinities as null; only look for them
+        # when the output has a null they could have become
+        if encoded is not None and b'null' in encoded and _has_non_finite(obj):
+            raise ValueError("Out of range float values are not JSON compliant")
+    if encoded is None:
+        encoded = _stdlib_dumps(obj)
+
+    for raw, escaped in _LINE_SEPARATORS:
+        if raw in encoded:
+            encoded = encoded.replace(raw, escaped)
+    return encoded
+
+
+def loads(data: bytes) -> Any:
+    """
+    Decode JSON bytes
+
+    Raises:
+        ValueError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    # orjson rejects NaN and Infinity literals; so does the fallback
+    return json.loads(data, parse_constant=_reject_constant)
+
+
+def etag_for(*parts: bytes) -> str:
+    """Build a strong, quoted ETag from a content digest"""
+    digest = blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+
+def encode_envelope(envelope: Dict[str, Any], nodes: Iterable[bytes]) -> bytes:
+    """
+    Encode a response dict with pre-encoded nodes spliced in as "nodes"
+
+    Args:
+        envelope: Every response key except "nodes"
+        nodes: Already-encoded node objects
+
+    Returns:
+        JSON bytes of the envelope with a trailing "nodes" array
+    """
+    head = dumps(envelope)[:-1]
+    separator = b',' if len(head) > 1 else b''
+    return head + separator + b'"nodes":[' + b','.join(nodes) + b']}'
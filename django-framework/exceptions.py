@@ -0,0 +1,33 @@
+"""
+Exception handling for the graph API
+
+Enable with
+
+    REST_FRAMEWORK = {
+        'EXCEPTION_HANDLER': 'graph_nodes.exceptions.exception_handler',
+    }
+"""
+import math
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import exception_handler as drf_exception_handler
+
+from .backends import BackendUnavailable
+
+
+def exception_handler(exc, context):
+    """
+    DRF's exception handler, plus 503 Service Unavailable when the graph
+    backend cannot be reached
+
+    A Retry-After header gives the seconds until the next load attempt,
+    when known.
+    """
+    if isinstance(exc, BackendUnavailable):
+        response = Response({"error": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        retry_after = getattr(exc, 'retry_after', None)
+        if retry_after is not None:
+            response['Retry-After'] = str(max(math.ceil(retry_after), 1))
+        return response
+    return drf_exception_handler(exc, context)
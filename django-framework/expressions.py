@@ -0,0 +1,129 @@
+"""
+Boolean label expressions, e.g. "Person AND NOT Admin" or "(User OR Admin) AND Person"
+
+Operators, loosest first: OR, AND, NOT; parentheses group. Keywords are
+case-insensitive. Quote a label that contains spaces or parentheses or
+that is itself a keyword: "Not Sure" AND Person.
+
+Expressions are limited to MAX_LENGTH characters and MAX_DEPTH levels of
+parentheses and NOTs, so a hostile one cannot exhaust the stack.
+"""
+import re
+from functools import lru_cache
+from typing import Tuple, Union
+
+# ("label", name) | ("not", expr) | ("and", left, right) | ("or", left, right)
+Expression = Tuple[Union[str, tuple], ...]
+
+KEYWORDS = ("AND", "OR", "NOT")
+
+# Longest expression accepted, in characters
+MAX_LENGTH = 1000
+
+# Deepest nesting of parentheses and NOTs accepted
+MAX_DEPTH = 32
+
+_TOKEN = re.compile(r'\s*(?:(\(|\))|"((?:[^"\\]|\\.)*)"|([^\s()"]+))')
+
+
+class ExpressionError(ValueError):
+    """The label expression is malformed"""
+
+
+def _tokenize(text: str):
+    """Split an expression into (kind, value) tokens"""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise ExpressionError(f"Unexpected character at position {position + 1}")
+        paren, quoted, word = match.groups()
+        if paren:
+            tokens.append((paren, paren))
+        elif quoted is not None:
+            tokens.append(("label", re.sub(r'\\(.)', r'\1', quoted)))
+        elif word.upper() in KEYWORDS:
+            tokens.append((word.upper(), word))
+        else:
+            tokens.append(("label", word))
+        position = match.end()
+    return tokens
+
+
+@lru_cache(maxsize=256)
+def parse_label_expression(text: str) -> Expression:
+    """
+    Parse a label expression into a tree
+
+    Raises:
+        ExpressionError: If the expression is malformed, longer than
+            MAX_LENGTH or nested deeper than MAX_DEPTH
+    """
+    if len(text) > MAX_LENGTH:
+        raise ExpressionError(f"Expression is longer than {MAX_LENGTH} characters")
+    tokens = _tokenize(text)
+    if not tokens:
+        raise ExpressionError("Expression is empty")
+    position = 0
+    depth = 0
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def take(kind):
+        nonlocal position
+        if peek() != kind:
+            found = tokens[position][1] if position < len(tokens) else "end of expression"
+            raise ExpressionError(f"Expected {kind}, found '{found}'")
+        position += 1
+        return tokens[position - 1][1]
+
+    def parse_or():
+        expression = parse_and()
+        while peek() == "OR":
+            take("OR")
+            expression = ("or", expression, parse_and())
+        return expression
+
+    def parse_and():
+        expression = parse_not()
+        while peek() == "AND":
+            take("AND")
+            expression = ("and", expression, parse_not())
+        return expression
+
+    def parse_not():
+        nonlocal depth
+        if peek() not in ("NOT", "("):
+            return ("label", take("label"))
+        depth += 1
+        if depth > MAX_DEPTH:
+            raise ExpressionError(f"Expression is nested deeper than {MAX_DEPTH} levels")
+        if peek() == "NOT":
+            take("NOT")
+            expression = ("not", parse_not())
+        else:
+            take("(")
+            expression = parse_or()
+            take(")")
+        depth -= 1
+        return expression
+
+    expression = parse_or()
+    if position < len(tokens):
+        raise ExpressionError(f"Unexpected '{tokens[position][1]}'")
+    return expression
+
+
+def matches_labels(expression: Expression, labels) -> bool:
+    """Test an expression against one node's set of labels"""
+    kind = expression[0]
+    if kind == "label":
+        return expression[1] in labels
+    if kind == "not":
+        return not matches_labels(expression[1], labels)
+    if kind == "and":
+        return matches_labels(expression[1], labels) and matches_labels(expression[2], labels)
+    return matches_labels(expression[1], labels) or matches_labels(expression[2], labels)
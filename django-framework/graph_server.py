@@ -0,0 +1,169 @@
+"""
+Stand-in graph server for local development and tests
+Serves nodes and relationships over the protocol NetworkBackend speaks
+
+Run from the project root:
+
+    python -m graph_nodes.graph_server --port 7688 [--data graph.json]
+
+where graph.json holds {"nodes": [...], "relationships": [...]}. Without
+--data the built-in sample graph is served.
+"""
+import argparse
+import json
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .encoding import dumps, loads
+
+
+class GraphRequestHandler(socketserver.StreamRequestHandler):
+    """Answer line-delimited JSON requests until the client disconnects"""
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.clients.add(self.connection)
+
+    def finish(self):
+        with self.server.lock:
+            self.server.clients.discard(self.connection)
+        super().finish()
+
+    def handle(self):
+        server = self.server
+        try:
+            for line in self.rfile:
+                if server.delay:
+                    time.sleep(server.delay)
+                try:
+                    request = loads(line)
+                    reply = {"ok": True, "result": server.execute(request)}
+                except (ValueError, KeyError, TypeError) as exc:
+                    reply = {"ok": False, "error": str(exc)}
+                self.wfile.write(dumps(reply) + b"\n")
+        except ConnectionError:
+            # The client gave up on us (e.g. timed out); nothing left to answer
+            pass
+
+
+class GraphServer(socketserver.ThreadingTCPServer):
+    """
+    Threaded TCP server over an in-memory graph
+
+    Operations:
+        ping: Returns "pong"
+        nodes: Nodes[offset:offset + limit]
+        relationships: Relationships[offset:offset + limit]
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, nodes: List[Dict[str, Any]],
+                 relationships: List[Dict[str, Any]], delay: float = 0.0):
+        """
+        Args:
+            address: (host, port) to listen on; port 0 picks a free port
+            nodes: Nodes to serve
+            relationships: Relationships to serve
+            delay: Seconds to wait before each reply, to simulate latency
+        """
+        super().__init__(address, GraphRequestHandler)
+        self.collections = {"nodes": nodes, "relationships": relationships}
+        self.delay = delay
+        # Open client sockets, so closing the server drops them too
+        self.clients = set()
+        self.lock = threading.Lock()
+
+    def execute(self, request: Dict[str, Any]) -> Any:
+        """
+        Run one request
+
+        Raises:
+            ValueError: If the operation is unknown
+        """
+        op = request["op"]
+        if op == "ping":
+            return "pong"
+        if op not in self.collections:
+            raise ValueError(f"Unknown operation '{op}'")
+        offset = int(request.get("offset", 0))
+        limit = int(request.get("limit", 10000))
+        return self.collections[op][offset:offset + limit]
+
+    def server_close(self):
+        """Stop listening and disconnect every client, as a crashed server would"""
+        super().server_close()
+        with self.lock:
+            clients = list(self.clients)
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def sample_graph():
+    """Get the built-in sample nodes and relationships"""
+    from .services import GraphDatabaseService
+    return GraphDatabaseService.DUMMY_NODES, GraphDatabaseService.DUMMY_RELATIONSHIPS
+
+
+def start_server(nodes: Optional[List[Dict[str, Any]]] = None,
+                 relationships: Optional[List[Dict[str, Any]]] = None,
+                 host: str = '127.0.0.1', port: int = 0,
+                 delay: float = 0.0) -> GraphServer:
+    """
+    Start a graph server on a background thread
+
+    Call shutdown() and then server_close() on the result to stop it.
+
+    Args:
+        nodes: Nodes to serve, or None for the sample graph
+        relationships: Relationships to serve, or None for the sample graph
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free port (see server_address)
+        delay: Seconds to wait before each reply
+
+    Returns:
+        The running server
+    """
+    sample_nodes, sample_relationships = sample_graph()
+    nodes = sample_nodes if nodes is None else nodes
+    relationships = sample_relationships if relationships is None else relationships
+
+    server = GraphServer((host, port), nodes, relationships, delay)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in graph server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7688)
+    parser.add_argument('--data', help="JSON file with 'nodes' and 'relationships'")
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help="Seconds to wait before each reply")
+    args = parser.parse_args()
+
+    if args.data:
+        with open(args.data) as f:
+            data = json.load(f)
+        nodes, relationships = data['nodes'], data['relationships']
+    else:
+        nodes, relationships = sample_graph()
+
+    with GraphServer((args.host, args.port), nodes, relationships, args.delay) as server:
+        print(f"Graph server listening on {args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,900 @@
+"""
+In-memory indexes over graph nodes
+Built once when the dataset is loaded so lookups avoid scanning every node
+"""
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from heapq import merge
+from itertools import accumulate
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from .bitmaps import Bitmap
+from .cache import EncodedCache, get_encoded_cache_size
+from .encoding import dumps, etag_for
+from .expressions import Expression, matches_labels, parse_label_expression
+
+
+# Node-level fields holding ISO 8601 timestamps, range-indexed as epoch seconds
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+# Comparison operators answered by a RangeIndex
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte", "between")
+
+# Partial-match operators answered by a TextIndex; a fuzzy value is
+# (text, maximum edit distance)
+TEXT_OPERATORS = ("startswith", "contains", "fuzzy")
+
+# Marks the ends of a value in its indexed trigrams, so edits near the
+# ends of short values still leave trigrams to match on
+TRIGRAM_PAD = "\x00\x00"
+
+# A predicate is a (field, operator, value) triple; 'eq' is exact match
+Predicate = Tuple[str, str, Any]
+
+# Top-level fields of a node, in response order
+NODE_FIELDS = (
+    "node_id", "labels", "properties", "created_at", "updated_at",
+    "relationship_count", "degree",
+)
+
+# A projection is (top-level fields, property names); None keeps everything
+Projection = Tuple[Optional[Sequence[str]], Optional[Sequence[str]]]
+
+# Bitmap of labels no node carries; shared, since bitmaps are immutable
+EMPTY_BITMAP = Bitmap()
+
+
+def fold(value: str) -> str:
+    """Normalize a string value for case-insensitive matching"""
+    return value.lower()
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Parse an ISO 8601 timestamp into seconds since the epoch
+
+    Timestamps without an offset are taken to be UTC.
+
+    Raises:
+        ValueError: If the value is not a valid timestamp
+    """
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def trigrams(value: str) -> set:
+    """Get the distinct three-character substrings of a folded value"""
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def padded_trigrams(value: str) -> set:
+    """Get the trigrams of a folded value including its padded ends"""
+    return trigrams(TRIGRAM_PAD + value + TRIGRAM_PAD)
+
+
+def auto_distance(value: str) -> int:
+    """Maximum edit distance for fuzzy matching a value of this length"""
+    if len(value) < 3:
+        return 0
+    return 1 if len(value) < 6 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between two strings, bounded by limit
+
+    Only cells within limit of the diagonal are computed, and the search
+    stops as soon as a whole row exceeds limit.
+
+    Returns:
+        The distance, or limit + 1 if it is greater than limit
+    """
+    over = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return over
+    if len(a) > len(b):
+        a, b = b, a
+    width = len(b)
+    previous = [j if j <= limit else over for j in range(width + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (width + 1)
+        if i <= limit:
+            current[0] = i
+        char = a[i - 1]
+        lowest = current[0]
+        for j in range(max(1, i - limit), min(width, i + limit) + 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1,
+                       previous[j - 1] + (char != b[j - 1]))
+            current[j] = cost if cost < over else over
+            if cost < lowest:
+                lowest = cost
+        if lowest > limit:
+            return over
+        previous = current
+    return previous[width]
+
+
+def keeps_field(key: str, fields: Optional[Sequence[str]],
+                properties: Optional[Sequence[str]]) -> bool:
+    """Whether a projection keeps a top-level node field"""
+    if fields is None or key == "node_id" or key in fields:
+        return True
+    return key == "properties" and properties is not None
+
+
+def project_node(node: Dict[str, Any], fields: Optional[Sequence[str]] = None,
+                 properties: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Copy only the requested parts of a node
+
+    Args:
+        node: Full node dict
+        fields: Top-level fields to keep; node_id is always kept
+        properties: Property names to keep; implies the properties field
+
+    Returns:
+        The node itself when nothing is filtered out, otherwise a new dict
+    """
+    if fields is None and properties is None:
+        return node
+
+    projected = {}
+    for key, value in node.items():
+        if not keeps_field(key, fields, properties):
+            continue
+        if key == "properties" and properties is not None:
+            value = {name: value[name] for name in properties if name in value}
+        projected[key] = value
+    return projected
+
+
+def contains_ordinal(ordinals: List[int], ordinal: int) -> bool:
+    """Binary search for an ordinal in an ascending posting list"""
+    position = bisect_left(ordinals, ordinal)
+    return position < len(ordinals) and ordinals[position] == ordinal
+
+
+def is_number(value: Any) -> bool:
+    """Whether a property value belongs in a numeric range index"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class RangeIndex:
+    """
+    Sorted index over one numeric field for bisect range lookups
+    """
+
+    def __init__(self, pairs: List[Tuple[float, int]]):
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.ordinals = [ordinal for _, ordinal in pairs]
+        # ordinal -> key, to test a single node without a search
+        self.values = {ordinal: key for key, ordinal in pairs}
+
+    def updated(self, removed: set, added: List[Tuple[float, int]]) -> "RangeIndex":
+        """
+        Build the index with some (key, ordinal) pairs removed and others added
+
+        A few changes are spliced into copies of the sorted arrays; many
+        are merged in with one linear pass. This index is left unchanged.
+        """
+        if (len(removed) + len(added)) << 8 > len(self.keys):
+            if removed:
+                pairs = [pair for pair in zip(self.keys, self.ordinals) if pair not in removed]
+            else:
+                pairs = list(zip(self.keys, self.ordinals))
+            pairs.extend(added)
+            return RangeIndex(pairs)
+
+        index = RangeIndex.__new__(RangeIndex)
+        keys = index.keys = list(self.keys)
+        ordinals = index.ordinals = list(self.ordinals)
+        values = index.values = dict(self.values)
+        for key, ordinal in removed:
+            position = self._position(keys, ordinals, key, ordinal)
+            del keys[position]
+            del ordinals[position]
+            del values[ordinal]
+        for key, ordinal in added:
+            position = self._position(keys, ordinals, key, ordinal)
+            keys.insert(position, key)
+            ordinals.insert(position, ordinal)
+            values[ordinal] = key
+        return index
+
+    @staticmethod
+    def _position(keys: List[float], ordinals: List[int], key: float, ordinal: int) -> int:
+        """Find where (key, ordinal) is, or would go, in the sorted arrays"""
+        start = bisect_left(keys, key)
+        end = bisect_right(keys, key, start)
+        return bisect_left(ordinals, ordinal, start, end)
+
+    def bounds(self, op: str, value: Any) -> Tuple[int, int]:
+        """Get the [start, end) positions of keys satisfying a comparison"""
+        keys = self.keys
+        start, end = 0, len(keys)
+        if op == "gt":
+            start = bisect_right(keys, value)
+        elif op == "gte":
+            start = bisect_left(keys, value)
+        elif op == "lt":
+            end = bisect_left(keys, value)
+        elif op == "lte":
+            end = bisect_right(keys, value)
+        elif op == "between":
+            low, high = value
+            start = bisect_left(keys, low)
+            end = bisect_right(keys, high)
+        else:
+            raise ValueError(f"Unsupported range operator '{op}'")
+        return start, max(start, end)
+
+    def count(self, op: str, value: Any) -> int:
+        """Count nodes satisfying a comparison in O(log N)"""
+        start, end = self.bounds(op, value)
+        return end - start
+
+    def lookup(self, op: str, value: Any) -> List[int]:
+        """Get ascending ordinals of nodes satisfying a comparison"""
+        start, end = self.bounds(op, value)
+        return sorted(self.ordinals[start:end])
+
+    def matches(self, op: str, value: Any, ordinal: int) -> bool:
+        """Test whether a single node satisfies a comparison"""
+        key = self.values.get(ordinal)
+        if key is None:
+            return False
+        if op == "gt":
+            return key > value
+        if op == "gte":
+            return key >= value
+        if op == "lt":
+            return key < value
+        if op == "lte":
+            return key <= value
+        low, high = value
+        return low <= key <= high
+
+
+class TextIndex:
+    """
+    Prefix and substring index over the string values of one property
+
+    Distinct folded values are kept sorted, so a prefix is a contiguous
+    run found by bisect, with cumulative posting sizes to count it in
+    O(log N). Substring queries intersect per-value trigram postings to
+    find candidate values, which are then verified directly. Fuzzy queries
+    take candidates from the trigram postings too: a value within edit
+    distance d of the query shares all but at most 3d of its padded
+    trigrams, so it appears in any 3d + 1 of them.
+    """
+
+    def __init__(self, values: Dict[str, List[int]]):
+        self.postings = values
+        self.keys = sorted(values)
+        self.cumulative = self._cumulative(self.keys, values)
+        # trigram (padded at the ends of values) -> distinct values containing it
+        self.trigrams: Dict[str, set] = {}
+        for key in self.keys:
+            for gram in padded_trigrams(key):
+                self.trigrams.setdefault(gram, set()).add(key)
+
+    @staticmethod
+    def _cumulative(keys: List[str], values: Dict[str, List[int]]) -> List[int]:
+        """cumulative[i] = number of nodes holding keys[:i]"""
+        return list(accumulate(map(len, map(values.__getitem__, keys)), initial=0))
+
+    def updated(self, values: Dict[str, List[int]], added: set, removed: set) -> "TextIndex":
+        """
+        Build the index for a changed set of postings, sharing what it can
+
+        Args:
+            values: The new folded value -> ordinals postings
+            added: Values present in values but not in this index
+            removed: Values in this index no longer present in values
+
+        Returns:
+            A new TextIndex; this one is left unchanged
+        """
+        index = TextIndex.__new__(TextIndex)
+        index.postings = values
+        if added or removed:
+            keys = [key for key in self.keys if key not in removed] if removed else list(self.keys)
+            # Two sorted runs, so this sort is a linear merge
+            keys.extend(sorted(added))
+            keys.sort()
+            index.keys = keys
+            # Copy only the trigram postings the changed values touch
+            grams = index.trigrams = dict(self.trigrams)
+            touched = {}
+            for key in removed | added:
+                for gram in padded_trigrams(key):
+                    if gram not in touched:
+                        touched[gram] = grams[gram] = set(grams.get(gram, ()))
+            for key in removed:
+                for gram in padded_trigrams(key):
+                    touched[gram].discard(key)
+            for key in added:
+                for gram in padded_trigrams(key):
+                    touched[gram].add(key)
+            for gram, members in touched.items():
+                if not members:
+                    del grams[gram]
+        else:
+            index.keys = self.keys
+            index.trigrams = self.trigrams
+        index.cumulative = self._cumulative(index.keys, values)
+        return index
+
+    def _prefix_bounds(self, prefix: str) -> Tuple[int, int]:
+        """Get the [start, end) positions of keys starting with a prefix"""
+        start = bisect_left(self.keys, prefix)
+        # No folded key sorts after prefix + the highest code point
+        end = bisect_left(self.keys, prefix + "\U0010ffff", start)
+        return start, end
+
+    def _matching_keys(self, op: str, value: Any) -> List[str]:
+        """Get the distinct values matching a partial-match query"""
+        if op == "fuzzy":
+            return self._fuzzy_keys(fold(value[0]), value[1])
+        value = fold(value)
+        if op == "startswith":
+            start, end = self._prefix_bounds(value)
+            return self.keys[start:end]
+
+        grams = trigrams(value)
+        if not grams:
+            # Too short for trigrams; check every distinct value
+            return [key for key in self.keys if value in key]
+
+        postings = sorted((self.trigrams.get(gram, set()) for gram in grams), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return [key for key in candidates if value in key]
+
+    def _fuzzy_keys(self, value: str, distance: int) -> List[str]:
+        """Get the distinct values within an edit distance of a folded value"""
+        grams = padded_trigrams(value)
+        # Postings that every match must appear in at least one of
+        needed = len(grams) - 3 * distance
+        if needed < 1:
+            # Too short to rule anything out by trigrams; check every distinct value
+            candidates = self.keys
+        else:
+            postings = sorted((self.trigrams.get(gram, ()) for gram in grams), key=len)
+            candidates = set().union(*postings[:len(grams) - needed + 1])
+        return [key for key in candidates
+                if abs(len(key) - len(value)) <= distance
+                and edit_distance(key, value, distance) <= distance]
+
+    def count(self, op: str, value: Any) -> int:
+        """Count nodes whose value matches a partial-match query"""
+        if op == "startswith":
+            start, end = self._prefix_bounds(fold(value))
+            return self.cumulative[end] - self.cumulative[start]
+        postings = self.postings
+        return sum(len(postings[key]) for key in self._matching_keys(op, value))
+
+    def lookup(self, op: str, value: Any) -> List[int]:
+        """Get ascending ordinals of nodes whose value matches a query"""
+        postings = self.postings
+        keys = self._matching_keys(op, value)
+        if len(keys) == 1:
+            return postings[keys[0]]
+        return sorted(ordinal for key in keys for ordinal in postings[key])
+
+
+class NodeIndex:
+    """
+    Hash and inverted indexes over a list of nodes
+
+    Nodes are addressed by their dense ordinal (position in the node list).
+    Every posting list holds ordinals in ascending order, so results come
+    back in the same order as the underlying node list.
+    """
+
+    def __init__(self, nodes: Sequence[Dict[str, Any]], version: int = 0):
+        self.nodes = nodes
+        # Dataset version this index was built for
+        self.version = version
+        # (ordinal, updated_at) -> (encoded JSON bytes, ETag), filled on first
+        # use and shared with the indexes apply() derives from this one
+        self.encoded = EncodedCache(get_encoded_cache_size())
+        # node_id -> ordinal
+        self.ids: Dict[str, int] = {}
+        # label -> [ordinals]
+        self.labels: Dict[str, List[int]] = {}
+        # label -> bitmap of the same ordinals, built on first use
+        self.label_bitmaps: Dict[str, Bitmap] = {}
+        # property -> folded string value -> [ordinals]
+        self.text_values: Dict[str, Dict[str, List[int]]] = {}
+        # property -> str(value) -> [ordinals], for non-string values
+        self.raw_values: Dict[str, Dict[str, List[int]]] = {}
+        # numeric property or timestamp field -> sorted range index
+        self.ranges: Dict[str, RangeIndex] = {}
+        # string property -> prefix/substring index
+        self.texts: Dict[str, TextIndex] = {}
+
+        range_pairs: Dict[str, List[Tuple[float, int]]] = {}
+        for ordinal, node in enumerate(nodes):
+            self._add(ordinal, node, range_pairs)
+        for field, pairs in range_pairs.items():
+            self.ranges[field] = RangeIndex(pairs)
+        for field, values in self.text_values.items():
+            self.texts[field] = TextIndex(values)
+
+    def __getstate__(self):
+        # The encoded-node cache refills on demand; it is not worth persisting
+        state = self.__dict__.copy()
+        del state["encoded"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.encoded = EncodedCache(get_encoded_cache_size())
+
+    @staticmethod
+    def _terms(node: Dict[str, Any]) -> Tuple[List[str], List[Tuple[str, str]],
+                                              List[Tuple[str, str]], List[Tuple[str, float]]]:
+        """
+        Get everything a node contributes to the indexes
+
+        Returns:
+            (labels, (property, folded value) pairs for strings,
+            (property, str(value)) pairs for other values,
+            (field, numeric key) pairs for range indexes)
+        """
+        text, raw, ranges = [], [], []
+        for key, value in node["properties"].items():
+            if isinstance(value, str):
+                text.append((key, fold(value)))
+            else:
+                raw.append((key, str(value)))
+                if is_number(value):
+                    ranges.append((key, value))
+
+        # Timestamps are parsed once here rather than on every query
+        for field in TIMESTAMP_FIELDS:
+            value = node.get(field)
+            if value:
+                ranges.append((field, parse_timestamp(value)))
+        return list(dict.fromkeys(node["labels"])), text, raw, ranges
+
+    def _add(self, ordinal: int, node: Dict[str, Any],
+             range_pairs: Dict[str, List[Tuple[float, int]]]):
+        """Add a single node to every index"""
+        self.ids.setdefault(node["node_id"], ordinal)
+
+        labels, text, raw, ranges = self._terms(node)
+        for label in labels:
+            self.labels.setdefault(label, []).append(ordinal)
+        for key, value in text:
+            self.text_values.setdefault(key, {}).setdefault(value, []).append(ordinal)
+        for key, value in raw:
+            self.raw_values.setdefault(key, {}).setdefault(value, []).append(ordinal)
+        for field, key in ranges:
+            range_pairs.setdefault(field, []).append((key, ordinal))
+
+    def apply(self, nodes: Sequence[Dict[str, Any]],
+              version: int) -> Tuple["NodeIndex", int, int]:
+        """
+        Build the index for this dataset with a batch of nodes upserted
+
+        A node whose node_id exists replaces it and keeps its ordinal; any
+        other node is appended. Only the posting lists and field indexes
+        the batch touches are copied, everything else is shared, and this
+        index is left unchanged for readers still using it.
+
+        Args:
+            nodes: Nodes to insert or replace, applied in order
+            version: Dataset version of the new index
+
+        Returns:
+            Tuple of (new index, nodes created, nodes replaced)
+        """
+        index = NodeIndex.__new__(NodeIndex)
+        # Node sequences that hold their nodes elsewhere (MappedNodes) copy cheaply
+        index.nodes = self.nodes.copy() if hasattr(self.nodes, 'copy') else list(self.nodes)
+        index.version = version
+        index.encoded = self.encoded
+        index.ids = dict(self.ids)
+        index.labels = dict(self.labels)
+        index.text_values = dict(self.text_values)
+        index.raw_values = dict(self.raw_values)
+        index.ranges = dict(self.ranges)
+        index.texts = dict(self.texts)
+
+        # Containers already copied for the new index
+        owned = set()
+
+        def own_dict(table, kind, field):
+            if (kind, field) not in owned or field not in table:
+                owned.add((kind, field))
+                table[field] = dict(table.get(field, {}))
+            return table[field]
+
+        def own_list(container, key, value):
+            if key not in owned or value not in container:
+                owned.add(key)
+                container[value] = list(container.get(value, ()))
+            return container[value]
+
+        touched_text: Dict[str, set] = {}
+        touched_raw = set()
+        # field -> (pairs to remove, pairs to add)
+        range_changes: Dict[str, Tuple[set, set]] = {}
+
+        def terms(node):
+            """Every (kind, ...) entry a node has in the indexes"""
+            labels, text, raw, ranges = self._terms(node)
+            entries = {("label", label) for label in labels}
+            entries.update(("text", field, value) for field, value in text)
+            entries.update(("raw", field, value) for field, value in raw)
+            entries.update(("range", field, key) for field, key in ranges)
+            return entries
+
+        def posting_list(term):
+            """Get the posting list for a term, copied for the new index"""
+            kind = term[0]
+            if kind == "label":
+                return index.labels, term[1], own_list(index.labels, term, term[1])
+            field, value = term[1], term[2]
+            if kind == "text":
+                touched_text.setdefault(field, set()).add(value)
+                values = own_dict(index.text_values, kind, field)
+            else:
+                touched_raw.add(field)
+                values = own_dict(index.raw_values, kind, field)
+            return values, value, own_list(values, term, value)
+
+        def unindex(term, ordinal):
+            if term[0] == "range":
+                removed, added = range_changes.setdefault(term[1], (set(), set()))
+                pair = (term[2], ordinal)
+                if pair in added:
+                    added.discard(pair)
+                else:
+                    removed.add(pair)
+                return
+            container, value, ordinals = posting_list(term)
+            position = bisect_left(ordinals, ordinal)
+            if position < len(ordinals) and ordinals[position] == ordinal:
+                del ordinals[position]
+            if not ordinals:
+                del container[value]
+
+        def reindex(term, ordinal):
+            if term[0] == "range":
+                range_changes.setdefault(term[1], (set(), set()))[1].add((term[2], ordinal))
+                return
+            insort(posting_list(term)[2], ordinal)
+
+        created = replaced = 0
+        # Ordinals whose node in this index was replaced
+        superseded = set()
+        for node in nodes:
+            ordinal = index.ids.get(node["node_id"])
+            new_terms = terms(node)
+            if ordinal is None:
+                ordinal = index.ids[node["node_id"]] = len(index.nodes)
+                index.nodes.append(node)
+                old_terms = set()
+                created += 1
+            else:
+                old_terms = terms(index.nodes[ordinal])
+                index.nodes[ordinal] = node
+                if ordinal < len(self.nodes):
+                    superseded.add(ordinal)
+                replaced += 1
+            # Only entries that differ between the old and new node change
+            for term in old_terms - new_terms:
+                unindex(term, ordinal)
+            for term in new_terms - old_terms:
+                reindex(term, ordinal)
+
+        # Rebuild only the field indexes the batch changed
+        for field, (removed, added) in range_changes.items():
+            if not removed and not added:
+                continue
+            previous = self.ranges.get(field)
+            ranges = previous.updated(removed, list(added)) if previous else RangeIndex(list(added))
+            if ranges.keys:
+                index.ranges[field] = ranges
+            else:
+                index.ranges.pop(field, None)
+        for field in touched_raw:
+            if not index.raw_values.get(field, True):
+                del index.raw_values[field]
+        for field, changed in touched_text.items():
+            values = index.text_values.get(field)
+            if not values:
+                index.text_values.pop(field, None)
+                index.texts.pop(field, None)
+                continue
+            previous = self.texts.get(field)
+            if previous is None:
+                index.texts[field] = TextIndex(values)
+                continue
+            before = previous.postings
+            index.texts[field] = previous.updated(
+                values,
+                {value for value in changed if value in values and value not in before},
+                {value for value in changed if value not in values and value in before},
+            )
+
+        # Encodings are keyed by (ordinal, updated_at), so they carry over
+        # as long as every replaced node got a newer updated_at
+        for ordinal in superseded:
+            old, new = self.modified_at(ordinal), index.modified_at(ordinal)
+            if new is None or (old is not None and new <= old):
+                index.encoded = EncodedCache(self.encoded.max_bytes)
+                break
+
+        # Bitmaps of labels the batch did not touch are still valid
+        index.label_bitmaps = {
+            label: bitmap for label, bitmap in self.label_bitmaps.items()
+            if ("label", label) not in owned
+        }
+        return index, created, replaced
+
+    def ordinal_of(self, node_id: str) -> Optional[int]:
+        """Get the ordinal of a node by ID, or None if it does not exist"""
+        return self.ids.get(node_id)
+
+    def lookup(self, by: str, value: Any) -> List[int]:
+        """
+        Get the ordinals of nodes whose field matches a value
+
+        Args:
+            by: Field name ('node_id', 'label'/'type' or a property name),
+                or 'labels' to match a boolean label expression
+            value: Value to match (case-insensitive for string properties)
+
+        Returns:
+            Ascending list of matching ordinals
+        """
+        if by == "node_id":
+            ordinal = self.ids.get(value)
+            return [] if ordinal is None else [ordinal]
+
+        if by == "label" or by == "type":
+            return self.labels.get(value, [])
+
+        if by == "labels":
+            return self.evaluate_labels(value).to_list()
+
+        if not isinstance(value, str):
+            return []
+
+        text = self.text_values.get(by, {}).get(fold(value), [])
+        raw = self.raw_values.get(by, {}).get(value, [])
+        if not raw:
+            return text
+        if not text:
+            return raw
+        return list(merge(text, raw))
+
+    def label_bitmap(self, label: str) -> Bitmap:
+        """Get the bitmap of nodes carrying a label"""
+        bitmap = self.label_bitmaps.get(label)
+        if bitmap is None:
+            ordinals = self.labels.get(label)
+            if ordinals is None:
+                # Not cached, so made-up labels in queries cannot grow the cache
+                return EMPTY_BITMAP
+            bitmap = self.label_bitmaps[label] = Bitmap.from_sorted(ordinals)
+        return bitmap
+
+    def evaluate_labels(self, expression: str) -> Bitmap:
+        """
+        Get the bitmap of nodes whose labels satisfy a boolean expression
+
+        Args:
+            expression: e.g. "Person AND NOT Admin" (see expressions.py)
+
+        Raises:
+            ExpressionError: If the expression is malformed
+        """
+        return self._evaluate(parse_label_expression(expression))
+
+    def _evaluate(self, expression: Expression) -> Bitmap:
+        kind = expression[0]
+        if kind == "label":
+            return self.label_bitmap(expression[1])
+        if kind == "not":
+            return Bitmap.full(len(self.nodes)) - self._evaluate(expression[1])
+        left, right = expression[1], expression[2]
+        if kind == "or":
+            return self._evaluate(left) | self._evaluate(right)
+        # x AND NOT y is an ANDNOT; the complement of y is never built
+        if right[0] == "not":
+            return self._evaluate(left) - self._evaluate(right[1])
+        if left[0] == "not":
+            return self._evaluate(right) - self._evaluate(left[1])
+        return self._evaluate(left) & self._evaluate(right)
+
+    def count(self, predicate: Predicate) -> int:
+        """Estimate how many nodes match a predicate without materializing them"""
+        field, op, value = predicate
+        if field == "labels":
+            return len(self.evaluate_labels(value))
+        if op == "eq":
+            return len(self.lookup(field, value))
+        if op in TEXT_OPERATORS:
+            texts = self.texts.get(field)
+            return 0 if texts is None else texts.count(op, value)
+        ranges = self.ranges.get(field)
+        return 0 if ranges is None else ranges.count(op, value)
+
+    def cache_key(self, predicate: Predicate) -> tuple:
+        """
+        Normalize a predicate for caching
+
+        Predicates with equal keys match the same nodes: 'type' is keyed as
+        'label', case-insensitive values are folded and label expressions
+        are keyed by their parsed form.
+        """
+        field, op, value = predicate
+        if field == "type":
+            field = "label"
+        if field == "labels":
+            return (field, op, parse_label_expression(value))
+        if op == "fuzzy":
+            return (field, op, fold(value[0]), value[1])
+        if op in TEXT_OPERATORS:
+            return (field, op, fold(value))
+        if op == "eq" and field not in ("node_id", "label") and isinstance(value, str):
+            # A string lookup also matches non-string values by exact str(),
+            # so the unfolded value only matters when one of those exists
+            if value in self.raw_values.get(field, ()):
+                return (field, op, fold(value), value)
+            return (field, op, fold(value))
+        return (field, op, value)
+
+    def resolve(self, predicate: Predicate) -> List[int]:
+        """Get ascending ordinals of nodes matching a predicate"""
+        field, op, value = predicate
+        if op == "eq":
+            return self.lookup(field, value)
+        if op in TEXT_OPERATORS:
+            texts = self.texts.get(field)
+            return [] if texts is None else texts.lookup(op, value)
+        ranges = self.ranges.get(field)
+        return [] if ranges is None else ranges.lookup(op, value)
+
+    def matches(self, predicate: Predicate, ordinal: int) -> bool:
+        """Test whether a single node matches a predicate"""
+        field, op, value = predicate
+        if field == "labels":
+            labels = self.nodes[ordinal]["labels"]
+            return matches_labels(parse_label_expression(value), set(labels))
+        if op == "eq":
+            return contains_ordinal(self.lookup(field, value), ordinal)
+        if op in TEXT_OPERATORS:
+            current = self.nodes[ordinal]["properties"].get(field)
+            if not isinstance(current, str):
+                return False
+            if op == "startswith":
+                return fold(current).startswith(fold(value))
+            if op == "fuzzy":
+                text, distance = value
+                return edit_distance(fold(current), fold(text), distance) <= distance
+            return fold(value) in fold(current)
+        ranges = self.ranges.get(field)
+        return ranges is not None and ranges.matches(op, value, ordinal)
+
+    def page(self, ordinals: Optional[List[int]], after: Optional[int],
+             limit: int) -> Tuple[List[int], Optional[int]]:
+        """
+        Seek to the first ordinal past a cursor and take one page
+
+        Args:
+            ordinals: Ascending ordinals to page over, or None for all nodes
+            after: Ordinal of the last node on the previous page, if any
+            limit: Maximum number of ordinals to return
+
+        Returns:
+            Tuple of (ordinals on this page, ordinal to continue after or None)
+        """
+        start_after = -1 if after is None else after
+
+        if ordinals is None:
+            total = len(self.nodes)
+            start = start_after + 1
+            end = min(start + limit, total)
+            page = list(range(start, end))
+            return page, (end - 1 if end < total else None)
+
+        start = bisect_right(ordinals, start_after)
+        page = ordinals[start:start + limit]
+        has_more = start + limit < len(ordinals)
+        return page, (page[-1] if has_more else None)
+
+    def encode(self, ordinal: int, projection: Optional[Projection] = None) -> Tuple[bytes, str]:
+        """
+        Get the JSON bytes and ETag of a node, encoding it only once
+
+        Encodings go in a size-bounded LRU keyed by ordinal and updated_at,
+        so a node left alone by apply() stays cached across versions while
+        a replaced one is encoded afresh. Rebuilding the index discards the
+        cache. Projected nodes are encoded on the fly, from only the
+        requested fields.
+        """
+        if projection is not None:
+            body = dumps(project_node(self.nodes[ordinal], *projection))
+            return body, etag_for(body)
+
+        key = (ordinal, self.modified_at(ordinal))
+        cached = self.encoded.get(key)
+        if cached is None:
+            body = dumps(self.nodes[ordinal])
+            cached = (body, etag_for(body))
+            self.encoded.put(key, *cached)
+        return cached
+
+    def modified_at(self, ordinal: int) -> Optional[float]:
+        """Get a node's updated_at as epoch seconds, if it has one"""
+        updated = self.ranges.get("updated_at")
+        return None if updated is None else updated.values.get(ordinal)
+
+    def latest(self, field: str, ordinals: List[int]) -> Optional[int]:
+        """
+        Get the ordinal whose value of a range-indexed field is greatest
+
+        Args:
+            field: Field with a range index, e.g. "updated_at"
+            ordinals: Ordinals to choose from; nodes without the field are skipped
+
+        Returns:
+            The ordinal, or None if none of the nodes has the field
+        """
+        index = self.ranges.get(field)
+        if index is None:
+            return None
+        values = index.values
+        present = [ordinal for ordinal in ordinals if ordinal in values]
+        if not present:
+            return None
+        return max(present, key=values.__getitem__)
+
+    def materialize(self, ordinals: List[int],
+                    projection: Optional[Projection] = None) -> List[Dict[str, Any]]:
+        """Turn a list of ordinals into the corresponding nodes"""
+        nodes = self.nodes
+        if projection is None:
+            return [nodes[ordinal] for ordinal in ordinals]
+        return [project_node(nodes[ordinal], *projection) for ordinal in ordinals]
+
+    def columns(self, ordinals: List[int],
+                projection: Optional[Projection] = None) -> Dict[str, Any]:
+        """
+        Gather the fields of several nodes column by column
+
+        Values are read straight out of the stored nodes; no per-node dict
+        is built. Object fields (properties, degree) become nested columns,
+        one per key in order of first appearance.
+
+        Returns:
+            field -> list of values (None where a node lacks the field),
+            or field -> {key -> list of values} for object fields
+        """
+        fields, properties = projection or (None, None)
+        nodes = [self.nodes[ordinal] for ordinal in ordinals]
+        columns = {}
+        for field in NODE_FIELDS:
+            if not keeps_field(field, fields, properties):
+                continue
+            values = [node.get(field) for node in nodes]
+            if not any(isinstance(value, dict) for value in values):
+                columns[field] = values
+                continue
+            if field == "properties" and properties is not None:
+                keys = properties
+            else:
+                keys = dict.fromkeys(key for value in values if value for key in value)
+            columns[field] = {
+                key: [value.get(key) if value else None for value in values]
+                for key in keys
+            }
+        return columns
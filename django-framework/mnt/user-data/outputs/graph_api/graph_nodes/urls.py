@@ -1,13 +1,50 @@
 """
 URL Configuration for graph_nodes app
 """
+from django.conf import settings
 from django.urls import path
-from .views import GetNodesView, GetAllNodesView, GetNodeByIdView
+from .views import (
+    AsyncGetAllNodesView,
+    AsyncGetNodeByIdView,
+    AsyncGetNodesView,
+    GetNodesView,
+    GetAllNodesView,
+    GetNodeByIdView,
+    GetNodeRelationshipsView,
+    GetNodeNeighborhoodView,
+    GetShortestPathView,
+    GetNodesByIdsView,
+    ExportNodesView,
+    BulkIngestNodesView,
+    QueryCacheStatsView,
+    SearchNodesView,
+    AggregateNodesView,
+)
 
 app_name = 'graph_nodes'
 
+# Coroutine versions of the list and lookup views, for ASGI deployments
+if getattr(settings, 'GRAPH_ASYNC_VIEWS', False):
+    NodesView, AllNodesView, NodeByIdView = (
+        AsyncGetNodesView, AsyncGetAllNodesView, AsyncGetNodeByIdView
+    )
+else:
+    NodesView, AllNodesView, NodeByIdView = GetNodesView, GetAllNodesView, GetNodeByIdView
+
 urlpatterns = [
-    path('nodes/', GetNodesView.as_view(), name='get-nodes'),
-    path('nodes/all/', GetAllNodesView.as_view(), name='get-all-nodes'),
-    path('nodes/<str:node_id>/', GetNodeByIdView.as_view(), name='get-node-by-id'),
+    path('nodes/', NodesView.as_view(), name='get-nodes'),
+    path('nodes/all/', AllNodesView.as_view(), name='get-all-nodes'),
+    path('nodes/batch/', GetNodesByIdsView.as_view(), name='get-nodes-by-ids'),
+    path('nodes/export/', ExportNodesView.as_view(), name='export-nodes'),
+    path('nodes/bulk/', BulkIngestNodesView.as_view(), name='bulk-ingest-nodes'),
+    path('nodes/aggregate/', AggregateNodesView.as_view(), name='aggregate-nodes'),
+    path('nodes/search/', SearchNodesView.as_view(), name='search-nodes'),
+    path('nodes/cache/', QueryCacheStatsView.as_view(), name='query-cache-stats'),
+    path('nodes/<str:node_id>/', NodeByIdView.as_view(), name='get-node-by-id'),
+    path('nodes/<str:node_id>/relationships/', GetNodeRelationshipsView.as_view(),
+         name='get-node-relationships'),
+    path('nodes/<str:node_id>/neighborhood/', GetNodeNeighborhoodView.as_view(),
+         name='get-node-neighborhood'),
+    path('nodes/<str:node_id>/shortest-path/', GetShortestPathView.as_view(),
+         name='get-shortest-path'),
 ]
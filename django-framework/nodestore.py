@@ -0,0 +1,328 @@
+"""
+Memory-mapped columnar node store
+The graph is written to a file once and mapped read-only by every worker
+process, so the operating system keeps one physical copy of it however
+many workers serve it
+
+Only the node records are shared. Each worker still builds its own
+NodeIndex (id map, posting lists, range and trigram indexes), SearchIndex,
+relationship adjacency and encoded-node cache on its heap. Over 100k
+sample nodes that is about 1.4 KB per node for the NodeIndex and 0.3 KB
+for the SearchIndex, against under 0.3 KB per node in the shared file,
+plus up to GRAPH_QUERY_CACHE['ENCODED_MAX_BYTES'] of encoded nodes.
+
+Build a store from the project root:
+
+    python -m graph_nodes.nodestore graph.nodes [--data graph.json]
+
+where graph.json holds {"nodes": [...], "relationships": [...]}. Without
+--data the built-in sample graph is written. Serve it with MappedBackend.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from hashlib import blake2b
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List
+
+from .encoding import dumps, loads
+
+MAGIC = b'GRAPHNS\x00'
+FORMAT_VERSION = 2
+
+# Magic, format version, length of the JSON table of contents that follows
+HEADER = struct.Struct('<8sII')
+
+# How each node field is laid out:
+#   str: UTF-8 values back to back, with an offsets array
+#   json: JSON-encoded values back to back, with an offsets array
+#   int: one signed 64-bit integer per node
+#   labels: distinct label names, plus per-node label codes and offsets
+FIELD_KINDS = {
+    "node_id": "str",
+    "labels": "labels",
+    "properties": "json",
+    "created_at": "str",
+    "updated_at": "str",
+    "relationship_count": "int",
+    "degree": "json",
+}
+
+
+class StoreError(Exception):
+    """The file is not a node store this version can read"""
+
+
+def _aligned(offset: int) -> int:
+    """Round an offset up so arrays start on an 8-byte boundary"""
+    return (offset + 7) & ~7
+
+
+def _encode_column(kind: str, values: List[Any]) -> Dict[str, Any]:
+    """Lay out one field of every node as named buffers"""
+    if kind == "int":
+        return {"values": array('q', values)}
+
+    offsets = array('Q', [0])
+    if kind == "labels":
+        names: Dict[str, int] = {}
+        codes = array('I')
+        for labels in values:
+            codes.extend(names.setdefault(label, len(names)) for label in labels)
+            offsets.append(len(codes))
+        return {"names": dumps(list(names)), "offsets": offsets, "codes": codes}
+
+    encode = dumps if kind == "json" else str.encode
+    data = bytearray()
+    for value in values:
+        data += encode(value)
+        offsets.append(len(data))
+    return {"offsets": offsets, "data": data}
+
+
+def write_node_store(path: str, nodes: List[Dict[str, Any]],
+                     relationships: List[Dict[str, Any]]):
+    """
+    Write nodes and relationships to a node store file
+
+    The file is written alongside and renamed into place, so workers that
+    still map an older store keep reading it undisturbed.
+
+    Args:
+        path: File to create or replace
+        nodes: Nodes to store; only the fields in FIELD_KINDS are kept
+        relationships: Relationships to store
+    """
+    sections = {}
+    for field, kind in FIELD_KINDS.items():
+        column = _encode_column(kind, [node[field] for node in nodes])
+        for part, buffer in column.items():
+            sections[f"{field}.{part}"] = memoryview(buffer)
+    sections["relationships"] = memoryview(dumps(relationships))
+
+    layout, offset = {}, 0
+    digest = blake2b(digest_size=16)
+    for name, view in sections.items():
+        layout[name] = [offset, view.nbytes, view.format]
+        offset = _aligned(offset + view.nbytes)
+        digest.update(view.cast('B'))
+    toc = dumps({
+        "byteorder": sys.byteorder,
+        "count": len(nodes),
+        "digest": digest.hexdigest(),
+        "sections": layout,
+    })
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.nodestore-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(toc)) + toc)
+            base = _aligned(HEADER.size + len(toc))
+            for name, view in sections.items():
+                f.seek(base + layout[name][0])
+                f.write(view)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class _VariableColumn:
+    """Values of a str or json field, decoded on access"""
+
+    def __init__(self, offsets: memoryview, data: memoryview, json_encoded: bool):
+        self.offsets = offsets
+        self.data = data
+        self.json_encoded = json_encoded
+
+    def __getitem__(self, ordinal: int) -> Any:
+        value = self.data[self.offsets[ordinal]:self.offsets[ordinal + 1]]
+        return loads(bytes(value)) if self.json_encoded else str(value, 'utf-8')
+
+
+class _LabelColumn:
+    """Label lists, rebuilt from label codes on access"""
+
+    def __init__(self, names: List[str], offsets: memoryview, codes: memoryview):
+        self.names = names
+        self.offsets = offsets
+        self.codes = codes
+
+    def __getitem__(self, ordinal: int) -> List[str]:
+        names = self.names
+        return [names[code] for code in self.codes[self.offsets[ordinal]:self.offsets[ordinal + 1]]]
+
+
+class NodeStore:
+    """
+    Read-only view of a node store file
+
+    The file is memory-mapped, never read into the process: pages are
+    loaded on first touch and shared with every other process mapping the
+    same file. A node dict is only built when that node is asked for.
+    """
+
+    def __init__(self, path: str):
+        """
+        Raises:
+            OSError: If the file cannot be opened
+            StoreError: If the file is not a node store this version can read
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise StoreError(f"{path} is too short to be a node store")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, version, toc_length = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise StoreError(f"{path} is not a node store")
+        if version != FORMAT_VERSION:
+            raise StoreError(f"{path} has format version {version}, expected {FORMAT_VERSION}")
+        toc = loads(bytes(view[HEADER.size:HEADER.size + toc_length]))
+        if toc["byteorder"] != sys.byteorder:
+            raise StoreError(f"{path} was written on a {toc['byteorder']}-endian machine")
+
+        base = _aligned(HEADER.size + toc_length)
+        end = max((base + offset + length for offset, length, _ in toc["sections"].values()),
+                  default=base)
+        if end > len(view):
+            raise StoreError(f"{path} is truncated")
+        sections = {
+            name: view[base + offset:base + offset + length].cast(fmt)
+            for name, (offset, length, fmt) in toc["sections"].items()
+        }
+        self.count = toc["count"]
+        # Digest of the stored data, identifying this version of the store
+        self.digest = toc["digest"]
+        self._relationships = sections["relationships"]
+
+        self._columns = []
+        for field, kind in FIELD_KINDS.items():
+            if kind == "int":
+                column = sections[f"{field}.values"]
+            elif kind == "labels":
+                column = _LabelColumn(loads(bytes(sections[f"{field}.names"])),
+                                      sections[f"{field}.offsets"],
+                                      sections[f"{field}.codes"])
+            else:
+                column = _VariableColumn(sections[f"{field}.offsets"],
+                                         sections[f"{field}.data"], kind == "json")
+            self._columns.append((field, column))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def node(self, ordinal: int) -> Dict[str, Any]:
+        """Decode one node"""
+        return {field: column[ordinal] for field, column in self._columns}
+
+    def relationships(self) -> List[Dict[str, Any]]:
+        """Decode every relationship"""
+        return loads(bytes(self._relationships))
+
+
+class MappedNodes(Sequence):
+    """
+    Sequence of the nodes in a NodeStore, decoded on access
+
+    Nodes replaced or appended after loading (e.g. by bulk ingest) are
+    held in a private overlay; copy() shares the store and copies only
+    the overlay, so NodeIndex.apply never materializes the whole graph.
+    """
+
+    def __init__(self, store: NodeStore):
+        self.store = store
+        self._replaced: Dict[int, Dict[str, Any]] = {}
+        self._appended: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return self.store.count + len(self._appended)
+
+    def __getitem__(self, ordinal):
+        if isinstance(ordinal, slice):
+            return [self[i] for i in range(*ordinal.indices(len(self)))]
+        if ordinal < 0:
+            ordinal += len(self)
+        if ordinal >= self.store.count:
+            return self._appended[ordinal - self.store.count]
+        if ordinal < 0:
+            raise IndexError("node ordinal out of range")
+        node = self._replaced.get(ordinal)
+        return self.store.node(ordinal) if node is None else node
+
+    def __setitem__(self, ordinal: int, node: Dict[str, Any]):
+        if ordinal >= self.store.count:
+            self._appended[ordinal - self.store.count] = node
+        else:
+            self._replaced[ordinal] = node
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        replaced = self._replaced
+        store = self.store
+        for ordinal in range(store.count):
+            node = replaced.get(ordinal)
+            yield store.node(ordinal) if node is None else node
+        yield from self._appended
+
+    def append(self, node: Dict[str, Any]):
+        self._appended.append(node)
+
+    def copy(self) -> "MappedNodes":
+        nodes = MappedNodes(self.store)
+        nodes._replaced = dict(self._replaced)
+        nodes._appended = list(self._appended)
+        return nodes
+
+    def __reduce__(self):
+        # Pickled (e.g. in an index snapshot) as a reference to the store
+        # file, not as the nodes in it
+        return _reopen, (self.store.path, self.store.digest, self._replaced, self._appended)
+
+
+def _reopen(path: str, digest: str, replaced: Dict[int, Dict[str, Any]],
+            appended: List[Dict[str, Any]]) -> MappedNodes:
+    """
+    Map a store file again for an unpickled MappedNodes
+
+    Raises:
+        StoreError: If the file no longer holds the store that was pickled
+    """
+    store = NodeStore(path)
+    if store.digest != digest:
+        raise StoreError(f"{path} has changed since it was referenced")
+    nodes = MappedNodes(store)
+    nodes._replaced = replaced
+    nodes._appended = appended
+    return nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a memory-mapped node store")
+    parser.add_argument('output', help="Node store file to create or replace")
+    parser.add_argument('--data', help="JSON file with 'nodes' and 'relationships'")
+    args = parser.parse_args()
+
+    if args.data:
+        with open(args.data) as f:
+            data = json.load(f)
+        nodes, relationships = data['nodes'], data['relationships']
+    else:
+        from .graph_server import sample_graph
+        nodes, relationships = sample_graph()
+
+    write_node_store(args.output, nodes, relationships)
+    print(f"Wrote {len(nodes)} nodes and {len(relationships)} relationships to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
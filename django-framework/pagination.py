@@ -0,0 +1,52 @@
+"""
+Cursor pagination helpers for Graph Node API
+Pages are keyed on the node ordinal, the dense sort key behind every index
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+CURSOR_QUERY_PARAM = 'cursor'
+PAGE_SIZE_QUERY_PARAM = 'page_size'
+HIGH_WATER_MARK_QUERY_PARAM = 'high_water_mark'
+DEFAULT_PAGE_SIZE = api_settings.PAGE_SIZE or 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(ordinal: int) -> str:
+    """Encode the ordinal of the last node on a page as an opaque cursor"""
+    return urlsafe_b64encode(f"o={ordinal}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (Base64Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    key, _, ordinal = raw.partition("=")
+    if key != "o" or not ordinal.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(ordinal)
+
+
+def get_next_link(request, next_ordinal, high_water_mark=None):
+    """
+    Build the absolute URL of the next page, or None on the last page
+
+    A changed-since poll's high water mark is carried along, so every page
+    reports the one taken when the first page was served.
+    """
+    if next_ordinal is None:
+        return None
+    url = request.build_absolute_uri()
+    if high_water_mark is not None:
+        url = replace_query_param(url, HIGH_WATER_MARK_QUERY_PARAM, high_water_mark)
+    return replace_query_param(url, CURSOR_QUERY_PARAM, encode_cursor(next_ordinal))
@@ -0,0 +1,22 @@
+"""
+Request parsers for Graph Node API
+"""
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parser for newline-delimited JSON bodies
+
+    The body is not read up front: request.data is an iterator of
+    (line number, line) pairs over the non-blank lines, so an upload of any
+    size is decoded and validated one line at a time.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return (
+            (number, line)
+            for number, line in enumerate(stream, 1)
+            if line.strip()
+        )
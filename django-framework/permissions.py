@@ -0,0 +1,43 @@
+"""
+Permissions for the endpoints that change the graph
+
+Reads are open to everyone; writes are limited by the
+GRAPH_WRITE_PERMISSION_CLASSES setting, a list of dotted DRF permission
+class paths that must all allow the request, e.g.
+
+    GRAPH_WRITE_PERMISSION_CLASSES = [
+        'rest_framework.permissions.IsAuthenticated',
+    ]
+
+Without the setting only admin (staff) users may write.
+"""
+from typing import List
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.permissions import BasePermission
+
+# Used when GRAPH_WRITE_PERMISSION_CLASSES is not set
+DEFAULT_WRITE_PERMISSION_CLASSES = ['rest_framework.permissions.IsAdminUser']
+
+
+def get_write_permission_classes() -> List[type]:
+    """Get the permission classes named by GRAPH_WRITE_PERMISSION_CLASSES"""
+    paths = DEFAULT_WRITE_PERMISSION_CLASSES
+    if settings.configured:
+        paths = getattr(settings, 'GRAPH_WRITE_PERMISSION_CLASSES', None) or paths
+    return [import_string(path) for path in paths]
+
+
+class CanWriteGraph(BasePermission):
+    """
+    Allows a request only if every configured write permission does
+
+    The setting is read on each request rather than at import time.
+    """
+
+    def has_permission(self, request, view) -> bool:
+        return all(
+            permission_class().has_permission(request, view)
+            for permission_class in get_write_permission_classes()
+        )
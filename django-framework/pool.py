@@ -0,0 +1,140 @@
+"""
+Bounded connection pool for network graph backends
+Connections are reused across requests and checked before reuse when idle
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the acquire timeout"""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool holding at most max_size open connections
+
+    Idle connections are handed out most recently used first, so a quiet
+    pool keeps a few warm connections rather than cycling through all of
+    them. A connection that sat idle longer than health_check_interval is
+    checked with health_check before reuse and replaced if it fails.
+    """
+
+    def __init__(self, connect: Callable[[], Any], max_size: int = 8,
+                 acquire_timeout: float = 5.0,
+                 health_check: Optional[Callable[[Any], bool]] = None,
+                 health_check_interval: float = 30.0,
+                 close: Callable[[Any], None] = lambda conn: conn.close()):
+        """
+        Args:
+            connect: Opens a new connection
+            max_size: Maximum number of open connections, idle or in use
+            acquire_timeout: Seconds to wait for a free connection
+            health_check: Returns whether a connection is still usable
+            health_check_interval: Idle seconds after which a connection is checked
+            close: Closes a connection
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self._close = close
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check = health_check
+        self.health_check_interval = health_check_interval
+        # (connection, time it was released)
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._available = threading.Condition(threading.Lock())
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or in use"""
+        return self._size
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        Take a connection from the pool, opening one if there is room
+
+        Raises:
+            PoolTimeout: If the pool is full and nothing is released in time
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._available:
+                while not self._idle and self._size >= self.max_size:
+                    if self._closed:
+                        raise PoolTimeout("Connection pool is closed")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f"No connection available within {timeout}s "
+                            f"({self.max_size} in use)"
+                        )
+                    self._available.wait(remaining)
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                else:
+                    # Reserve the slot before connecting outside the lock
+                    self._size += 1
+                    conn = None
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except BaseException:
+                    self._discard_slot()
+                    raise
+
+            if (self.health_check is None
+                    or time.monotonic() - released_at < self.health_check_interval
+                    or self._is_healthy(conn)):
+                return conn
+            self.discard(conn)
+
+    def release(self, conn: Any):
+        """Return a healthy connection to the pool"""
+        with self._available:
+            if not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                self._available.notify()
+                return
+        self.discard(conn)
+
+    def discard(self, conn: Any):
+        """Close a broken connection and free its slot"""
+        try:
+            self._close(conn)
+        except Exception:
+            pass
+        self._discard_slot()
+
+    def close(self):
+        """Close every idle connection; connections in use close on release"""
+        with self._available:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._available.notify_all()
+        for conn, _ in idle:
+            self.discard(conn)
+
+    def _is_healthy(self, conn: Any) -> bool:
+        """Run the health check, treating any error as a failure"""
+        try:
+            return bool(self.health_check(conn))
+        except Exception:
+            return False
+
+    def _discard_slot(self):
+        """Give back a slot so a waiting thread can open a connection"""
+        with self._available:
+            self._size -= 1
+            self._available.notify()
@@ -0,0 +1,122 @@
+"""
+Renderers for Graph Node API
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from .encoding import dumps
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that encodes through orjson when it is installed.
+
+    Output is the same compact UTF-8 JSON the stock JSONRenderer produces.
+    Pretty-printed output (`Accept: application/json; indent=4`)
+    and values only DRF's encoder understands, such as datetimes, Decimals
+    and lazy translation strings, are left to the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is None:
+            try:
+                return dumps(data)
+            except (TypeError, ValueError):
+                pass
+
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer, available when msgpack is installed.
+
+    Encodes the same response data as the JSON renderer, in a compact
+    binary form that is cheaper to produce and parse.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    available = msgpack is not None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into MessagePack, returning a bytestring.
+        """
+        if data is None:
+            return b''
+        return msgpack.packb(data, use_bin_type=True, default=str)
+
+
+class ArrowStreamRenderer(BaseRenderer):
+    """
+    Apache Arrow IPC stream renderer, available when pyarrow is installed.
+
+    Node lists are sent as one record batch built from the `columns` the
+    service layer gathered for the page; object fields become struct
+    columns. The rest of the response (count, next link, errors) is JSON
+    in the schema metadata under the `graph_api` key.
+    """
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
+    charset = None
+    render_style = 'binary'
+    available = pa is not None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into an Arrow IPC stream, returning a bytestring.
+        """
+        if data is None:
+            return b''
+
+        columns = data.get('columns') or {}
+        envelope = {key: value for key, value in data.items() if key != 'columns'}
+        batch = pa.RecordBatch.from_arrays(
+            [self._to_array(values) for values in columns.values()],
+            names=list(columns),
+            metadata={b'graph_api': dumps(envelope)}
+        )
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+    def _to_array(self, values):
+        """
+        Convert a column (or nested dict of columns) to an Arrow array
+        """
+        if isinstance(values, dict):
+            return pa.StructArray.from_arrays(
+                [self._to_array(child) for child in values.values()],
+                names=list(values)
+            )
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed value types in one property; fall back to strings
+            return pa.array([None if value is None else str(value) for value in values])
+
+
+# Binary renderers whose optional dependency is installed
+BINARY_RENDERER_CLASSES = [
+    renderer for renderer in (MessagePackRenderer, ArrowStreamRenderer)
+    if renderer.available
+]
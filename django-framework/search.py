@@ -0,0 +1,180 @@
+"""
+Full-text search over node properties
+An inverted index of the words in every string property, ranked by BM25
+"""
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .indexes import fold
+
+# BM25 parameters: term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+# A posting packs (ordinal << TF_BITS) | term frequency into one integer,
+# so a term's postings are a single sorted array('Q')
+TF_BITS = 16
+TF_MAX = (1 << TF_BITS) - 1
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into folded words; punctuation separates words"""
+    return _WORD.findall(fold(text))
+
+
+def node_terms(node: Dict[str, Any]) -> Dict[str, int]:
+    """Get term -> frequency over every string property of a node"""
+    frequencies: Dict[str, int] = {}
+    for value in node["properties"].values():
+        if isinstance(value, str):
+            for term in tokenize(value):
+                frequencies[term] = frequencies.get(term, 0) + 1
+    return frequencies
+
+
+def _pack(ordinal: int, frequency: int) -> int:
+    return ordinal << TF_BITS | min(frequency, TF_MAX)
+
+
+class SearchIndex:
+    """
+    Inverted index from words to the nodes containing them
+
+    Each term maps to its postings in ordinal order, and each node's length
+    (word count) is kept for BM25's length normalization. A query adds up
+    per-term scores one term at a time, rarest first; once the best `limit`
+    scores so far cannot be overtaken by a node that only the remaining
+    terms contain, those terms only update nodes already scored (MaxScore).
+    """
+
+    def __init__(self, nodes: Sequence[Dict[str, Any]]):
+        # term -> packed postings in ascending ordinal order
+        self.postings: Dict[str, array] = {}
+        # ordinal -> number of words in the node
+        self.lengths = array('I')
+        self.total_length = 0
+
+        postings: Dict[str, List[int]] = {}
+        for ordinal, node in enumerate(nodes):
+            frequencies = node_terms(node)
+            for term, frequency in frequencies.items():
+                postings.setdefault(term, []).append(_pack(ordinal, frequency))
+            length = sum(frequencies.values())
+            self.lengths.append(length)
+            self.total_length += length
+        for term, packed in postings.items():
+            self.postings[term] = array('Q', packed)
+
+    def updated(self, before: Sequence[Dict[str, Any]], after: Sequence[Dict[str, Any]],
+                ordinals: Iterable[int]) -> "SearchIndex":
+        """
+        Build the index for a changed node list, sharing untouched postings
+
+        Args:
+            before: Node list this index was built over
+            after: Node list with some nodes replaced or appended
+            ordinals: Ordinals of every node replaced or appended
+
+        Returns:
+            A new SearchIndex; this one is left unchanged
+        """
+        index = SearchIndex.__new__(SearchIndex)
+        index.postings = dict(self.postings)
+        added = len(after) - len(self.lengths)
+        index.lengths = self.lengths + array('I', bytes(4 * added))
+        index.total_length = self.total_length
+
+        # term -> {ordinal: frequency, or 0 to remove}
+        changes: Dict[str, Dict[int, int]] = {}
+        for ordinal in set(ordinals):
+            old = node_terms(before[ordinal]) if ordinal < len(before) else {}
+            new = node_terms(after[ordinal])
+            for term in old.keys() - new.keys():
+                changes.setdefault(term, {})[ordinal] = 0
+            for term, frequency in new.items():
+                if old.get(term) != frequency:
+                    changes.setdefault(term, {})[ordinal] = frequency
+            length = sum(new.values())
+            index.total_length += length - index.lengths[ordinal]
+            index.lengths[ordinal] = length
+
+        for term, changed in changes.items():
+            kept = [packed for packed in index.postings.get(term, ())
+                    if packed >> TF_BITS not in changed]
+            kept.extend(_pack(ordinal, frequency)
+                        for ordinal, frequency in changed.items() if frequency)
+            if kept:
+                kept.sort()
+                index.postings[term] = array('Q', kept)
+            else:
+                index.postings.pop(term, None)
+        return index
+
+    def search(self, text: str, limit: int) -> List[Tuple[int, float]]:
+        """
+        Rank nodes against a free-text query with BM25
+
+        Args:
+            text: Query; nodes containing any of its words match
+            limit: Number of results to return
+
+        Returns:
+            Up to limit (ordinal, score) pairs, best first
+        """
+        count = len(self.lengths)
+        terms = [term for term in dict.fromkeys(tokenize(text)) if term in self.postings]
+        if not terms or not count or limit < 1:
+            return []
+
+        average_length = self.total_length / count or 1
+        lengths = self.lengths
+        # Per-node BM25 length normalization: K1 * (1 - B + B * length / average)
+        scale = K1 * B / average_length
+        base = K1 * (1 - B)
+
+        weighted = []
+        for term in terms:
+            postings = self.postings[term]
+            frequency = len(postings)
+            idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            weighted.append((idf, postings))
+        # Rarest (highest idf) first, so the threshold rises fastest
+        weighted.sort(key=lambda item: -item[0])
+        # A term adds less than idf * (K1 + 1) to any node's score
+        remaining = [0.0] * (len(weighted) + 1)
+        for position in range(len(weighted) - 1, -1, -1):
+            remaining[position] = remaining[position + 1] + weighted[position][0] * (K1 + 1)
+
+        scores: Dict[int, float] = {}
+        for position, (idf, postings) in enumerate(weighted):
+            weight = idf * (K1 + 1)
+            if len(scores) >= limit and \
+                    heapq.nlargest(limit, scores.values())[-1] >= remaining[position]:
+                # No unseen node can reach the top; only rescore known ones
+                if len(scores) * max(len(postings).bit_length(), 1) < len(postings):
+                    for ordinal in scores:
+                        found = bisect_left(postings, ordinal << TF_BITS)
+                        if found < len(postings) and postings[found] >> TF_BITS == ordinal:
+                            tf = postings[found] & TF_MAX
+                            scores[ordinal] += weight * tf / (tf + base + scale * lengths[ordinal])
+                else:
+                    for packed in postings:
+                        ordinal = packed >> TF_BITS
+                        if ordinal in scores:
+                            tf = packed & TF_MAX
+                            scores[ordinal] += weight * tf / (tf + base + scale * lengths[ordinal])
+                continue
+            for packed in postings:
+                ordinal = packed >> TF_BITS
+                tf = packed & TF_MAX
+                scores[ordinal] = scores.get(ordinal, 0.0) + \
+                    weight * tf / (tf + base + scale * lengths[ordinal])
+
+        # Ties go to the lower ordinal, i.e. node list order
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
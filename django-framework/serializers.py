@@ -1,33 +1,365 @@
 """
 Serializers for Graph Node API
 """
+import math
+from functools import lru_cache
+from typing import Any, Dict
+
 from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.settings import api_settings
+
+from .expressions import ExpressionError, parse_label_expression
+from .indexes import (
+    NODE_FIELDS,
+    RANGE_OPERATORS,
+    TEXT_OPERATORS,
+    TIMESTAMP_FIELDS,
+    auto_distance,
+    fold,
+    parse_timestamp,
+)
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor
+
+
+class NodeProjectionSerializer(serializers.Serializer):
+    """
+    Serializer for sparse fieldset parameters
+    """
+    fields = serializers.CharField(
+        required=False,
+        help_text="Comma-separated node fields to return (node_id is always included)"
+    )
+    properties = serializers.CharField(
+        required=False,
+        help_text="Comma-separated property names to return"
+    )
+
+    def validate_fields(self, value):
+        """
+        Split the field list and check every field exists on a node
+        """
+        fields = [f.strip() for f in value.split(',') if f.strip()]
+        invalid = [f for f in fields if f not in NODE_FIELDS]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Invalid field(s) {', '.join(invalid)}. Allowed fields are: {', '.join(NODE_FIELDS)}"
+            )
+        return fields
 
+    def validate_properties(self, value):
+        """
+        Split the property list
+        """
+        return [p.strip() for p in value.split(',') if p.strip()]
 
-class NodeQuerySerializer(serializers.Serializer):
+    def validate(self, attrs):
+        """
+        Combine fields and properties into a projection, or None for whole nodes
+        """
+        attrs = super().validate(attrs)
+        fields = attrs.get('fields')
+        properties = attrs.get('properties')
+        if fields is None and properties is None:
+            attrs['projection'] = None
+        else:
+            attrs['projection'] = (fields, properties)
+        return attrs
+
+
+class CursorPaginationSerializer(serializers.Serializer):
     """
-    Serializer for querying nodes by various criteria
+    Serializer for cursor pagination parameters
     """
+    cursor = serializers.CharField(
+        required=False,
+        help_text="Opaque cursor from the 'next' link of the previous page"
+    )
+    page_size = serializers.IntegerField(
+        required=False,
+        default=DEFAULT_PAGE_SIZE,
+        min_value=1,
+        max_value=MAX_PAGE_SIZE,
+        help_text="Number of nodes per page"
+    )
+
+    def validate_cursor(self, value):
+        """
+        Decode the cursor into the ordinal of the last node already returned
+        """
+        try:
+            return decode_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid cursor")
+
+
+class UpdatedSinceSerializer(serializers.Serializer):
+    """
+    Serializer for changed-since (delta) parameters
+    """
+    updated_since = serializers.CharField(
+        required=False,
+        help_text="Only return nodes updated strictly after this ISO 8601 timestamp, "
+                  "e.g. the high_water_mark of the previous poll"
+    )
+    high_water_mark = serializers.CharField(
+        required=False,
+        help_text="Set by 'next' links so every page reports the first page's high water mark"
+    )
+
+    def validate_updated_since(self, value):
+        """
+        Check the value is a timestamp, keeping it as given
+        """
+        try:
+            parse_timestamp(value)
+        except ValueError:
+            raise serializers.ValidationError(f"Expected an ISO 8601 timestamp, got '{value}'")
+        return value
+
+    validate_high_water_mark = validate_updated_since
+
+
+class NodeListQuerySerializer(CursorPaginationSerializer, NodeProjectionSerializer,
+                              UpdatedSinceSerializer):
+    """
+    Serializer for listing all nodes a page at a time
+    """
+
+
+class NodeCriteriaSerializer(UpdatedSinceSerializer):
+    """
+    Serializer for criteria selecting nodes
+
+    Criteria can be given as a single 'by'/'value' pair, as field=value
+    parameters (e.g. ?label=Person&city=Boston), as field__operator=value
+    comparisons on numeric and timestamp fields (e.g. ?age__gte=30), as
+    partial or typo-tolerant matches on text fields (e.g.
+    ?name__startswith=ali, ?name__fuzzy=Alice Jonson), as a boolean label
+    expression (e.g. ?labels=Person AND NOT Admin), or any mix of these.
+    All criteria must match.
+    """
+    # Whether at least one criterion must be given
+    CRITERIA_REQUIRED = True
+
+    ALLOWED_FIELDS = ['node_id', 'name', 'label', 'labels', 'type', 'email', 'age', 'city', 'status']
+    RANGE_FIELDS = ['age', 'employees'] + list(TIMESTAMP_FIELDS)
+    TEXT_FIELDS = ['name', 'email', 'city', 'status']
+    MAX_EDIT_DISTANCE = 3
+
     by = serializers.CharField(
-        required=True,
+        required=False,
         help_text="Field to query by (e.g., 'node_id', 'name', 'label', 'property_name')"
     )
     value = serializers.CharField(
-        required=True,
+        required=False,
         help_text="Value to search for"
     )
+    match = serializers.ChoiceField(
+        choices=['exact'] + list(TEXT_OPERATORS),
+        required=False,
+        default='exact',
+        help_text="How 'value' is matched against 'by': exact, startswith, contains or fuzzy"
+    )
+    max_distance = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        max_value=MAX_EDIT_DISTANCE,
+        help_text="Maximum edit distance for fuzzy matches (default: 0 up to 2 "
+                  "characters, 1 up to 5, else 2)"
+    )
+    explain = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Include the query plan and rows examined in the response"
+    )
 
     def validate_by(self, value):
         """
         Validate that 'by' parameter is one of the allowed fields
         """
-        allowed_fields = ['node_id', 'name', 'label', 'type', 'email', 'age', 'city', 'status']
+        allowed_fields = self.ALLOWED_FIELDS
         if value not in allowed_fields:
             raise serializers.ValidationError(
                 f"Invalid field '{value}'. Allowed fields are: {', '.join(allowed_fields)}"
             )
         return value
 
+    def validate(self, attrs):
+        """
+        Collect every criterion into a list of (field, operator, value) predicates
+        """
+        attrs = super().validate(attrs)
+        by = attrs.get('by')
+        value = attrs.get('value')
+        if (by is None) != (value is None):
+            raise serializers.ValidationError("'by' and 'value' must be provided together")
+
+        match = attrs.get('match', 'exact')
+        if match != 'exact' and by is not None and by not in self.TEXT_FIELDS:
+            raise serializers.ValidationError({
+                "match": [f"Match '{match}' is only supported on: {', '.join(self.TEXT_FIELDS)}"]
+            })
+
+        predicates = []
+        query_params = {}
+        if by is not None:
+            op = 'eq' if match == 'exact' else match
+            predicates.append((by, op, self._text_value(op, value, attrs)))
+            query_params.update(by=by, value=value)
+            if match != 'exact':
+                query_params['match'] = match
+        for field in self.ALLOWED_FIELDS:
+            for field_value in self._get_list(field):
+                predicates.append((field, 'eq', field_value))
+                query_params[field] = field_value
+        for field in self.RANGE_FIELDS:
+            for op in RANGE_OPERATORS:
+                param = f"{field}__{op}"
+                for field_value in self._get_list(param):
+                    predicates.append((field, op, self._parse_range_value(field, op, field_value)))
+                    query_params[param] = field_value
+        for field in self.TEXT_FIELDS:
+            for op in TEXT_OPERATORS:
+                param = f"{field}__{op}"
+                for field_value in self._get_list(param):
+                    predicates.append((field, op, self._text_value(op, field_value, attrs)))
+                    query_params[param] = field_value
+        if attrs.get('max_distance') is not None:
+            query_params['max_distance'] = attrs['max_distance']
+
+        for field, _, field_value in predicates:
+            if field == 'labels':
+                try:
+                    parse_label_expression(field_value)
+                except ExpressionError as exc:
+                    raise serializers.ValidationError({"labels": [f"Invalid label expression: {exc}"]})
+
+        if attrs.get('updated_since') is not None:
+            query_params['updated_since'] = attrs['updated_since']
+
+        if self.CRITERIA_REQUIRED and not predicates and 'updated_since' not in query_params:
+            raise serializers.ValidationError(
+                "Provide 'by' and 'value', or one or more field=value or "
+                "field__operator=value criteria (e.g. ?label=Person&age__gte=30)"
+            )
+
+        attrs['predicates'] = predicates
+        attrs['query_params'] = query_params
+        return attrs
+
+    def _text_value(self, op, value, attrs):
+        """
+        Pair a fuzzy value with its maximum edit distance
+        """
+        if op != 'fuzzy':
+            return value
+        distance = attrs.get('max_distance')
+        return (value, auto_distance(fold(value)) if distance is None else distance)
+
+    def _parse_range_value(self, field, op, value):
+        """
+        Convert a comparison value to the key type of the field's range index
+        """
+        parse = parse_timestamp if field in TIMESTAMP_FIELDS else float
+        try:
+            if op == 'between':
+                low, high = value.split(',')
+                return (parse(low.strip()), parse(high.strip()))
+            return parse(value)
+        except ValueError:
+            expected = "an ISO 8601 timestamp" if field in TIMESTAMP_FIELDS else "a number"
+            if op == 'between':
+                expected = f"two comma-separated values, each {expected}"
+            raise serializers.ValidationError(
+                {f"{field}__{op}": [f"Expected {expected}, got '{value}'"]}
+            )
+
+    def _get_list(self, field):
+        """Get every value given for a raw query parameter"""
+        if hasattr(self.initial_data, 'getlist'):
+            return self.initial_data.getlist(field)
+        if field in self.initial_data:
+            return [self.initial_data[field]]
+        return []
+
+
+class NodeQuerySerializer(CursorPaginationSerializer, NodeProjectionSerializer,
+                          NodeCriteriaSerializer):
+    """
+    Serializer for querying nodes by various criteria, a page at a time
+    """
+
+
+class AggregateQuerySerializer(NodeCriteriaSerializer):
+    """
+    Serializer for aggregation parameters; criteria are optional filters
+    """
+    CRITERIA_REQUIRED = False
+    GROUP_BY_FIELDS = ['label', 'type', 'name', 'email', 'age', 'city', 'status']
+    NUMERIC_FIELDS = ['age', 'employees']
+    MAX_GROUPS = 10000
+
+    group_by = serializers.ChoiceField(
+        choices=GROUP_BY_FIELDS,
+        required=False,
+        help_text="Field to group by; labels group by label, text case-insensitively"
+    )
+    field = serializers.ChoiceField(
+        choices=NUMERIC_FIELDS,
+        required=False,
+        help_text="Numeric field to report min, max and avg of"
+    )
+    bucket_size = serializers.FloatField(
+        required=False,
+        help_text="Width of histogram buckets over 'field'"
+    )
+    limit = serializers.IntegerField(
+        required=False,
+        default=100,
+        min_value=1,
+        max_value=MAX_GROUPS,
+        help_text="Maximum number of groups to return, largest first"
+    )
+
+    def validate_bucket_size(self, value):
+        """
+        Reject empty and unbounded buckets
+        """
+        if not math.isfinite(value):
+            raise serializers.ValidationError("Ensure this value is a finite number.")
+        if value <= 0:
+            raise serializers.ValidationError("Ensure this value is greater than 0.")
+        return value
+
+    def validate(self, attrs):
+        """
+        Check a histogram has a field to bucket
+        """
+        attrs = super().validate(attrs)
+        if attrs.get('bucket_size') is not None and attrs.get('field') is None:
+            raise serializers.ValidationError({
+                "bucket_size": ["'field' is required for a histogram"]
+            })
+        for param in ('group_by', 'field', 'bucket_size'):
+            if attrs.get(param) is not None:
+                attrs['query_params'][param] = attrs[param]
+        return attrs
+
+
+class NodeBatchSerializer(serializers.Serializer):
+    """
+    Serializer for looking up many nodes by ID in one request
+    """
+    MAX_BATCH_SIZE = 10000
+
+    node_ids = serializers.ListField(
+        child=serializers.CharField(),
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        help_text="List of node IDs to retrieve"
+    )
+
 
 class NodePropertySerializer(serializers.Serializer):
     """
@@ -49,6 +381,94 @@ class NodeRelationshipSerializer(serializers.Serializer):
     properties = serializers.DictField(required=False)
 
 
+class RelationshipQuerySerializer(serializers.Serializer):
+    """
+    Serializer for filtering the relationships of a node
+    """
+    direction = serializers.ChoiceField(
+        choices=['OUTGOING', 'INCOMING', 'BOTH'],
+        required=False,
+        default='BOTH',
+        help_text="Which edges to return relative to the node"
+    )
+    type = serializers.CharField(
+        required=False,
+        help_text="Comma-separated relationship types to keep (e.g. 'KNOWS,WORKS_AT')"
+    )
+
+    def validate_type(self, value):
+        """
+        Split the comma-separated type filter into a list
+        """
+        types = [t.strip() for t in value.split(',') if t.strip()]
+        if not types:
+            raise serializers.ValidationError("Provide at least one relationship type")
+        return types
+
+
+class NeighborhoodQuerySerializer(RelationshipQuerySerializer):
+    """
+    Serializer for bounded k-hop traversal parameters
+    """
+    depth = serializers.IntegerField(
+        required=False,
+        default=2,
+        min_value=1,
+        max_value=5,
+        help_text="Maximum number of hops from the node"
+    )
+    max_fanout = serializers.IntegerField(
+        required=False,
+        default=1000,
+        min_value=1,
+        max_value=10000,
+        help_text="Maximum relationships followed out of any single node"
+    )
+    limit = serializers.IntegerField(
+        required=False,
+        default=1000,
+        min_value=1,
+        max_value=10000,
+        help_text="Maximum number of nodes to return"
+    )
+
+
+class ShortestPathQuerySerializer(RelationshipQuerySerializer):
+    """
+    Serializer for shortest path parameters
+    """
+    target = serializers.CharField(
+        required=True,
+        help_text="ID of the node to find a path to"
+    )
+    max_depth = serializers.IntegerField(
+        required=False,
+        default=6,
+        min_value=1,
+        max_value=10,
+        help_text="Maximum path length in hops"
+    )
+
+
+class SearchQuerySerializer(NodeProjectionSerializer):
+    """
+    Serializer for full-text search parameters
+    """
+    MAX_LIMIT = 100
+
+    q = serializers.CharField(
+        required=True,
+        help_text="Words to search for across the string properties of every node"
+    )
+    limit = serializers.IntegerField(
+        required=False,
+        default=10,
+        min_value=1,
+        max_value=MAX_LIMIT,
+        help_text="Maximum number of results, best first"
+    )
+
+
 class NodeDetailSerializer(serializers.Serializer):
     """
     Serializer for complete node details
@@ -71,10 +491,219 @@ class NodeDetailSerializer(serializers.Serializer):
     )
 
 
+# Node fields the server sets on every write; clients may leave them out
+SERVER_SET_FIELDS = ("updated_at",)
+
+
+@lru_cache(maxsize=None)
+def _node_fields():
+    """Get NodeDetailSerializer's bound fields, built once and shared"""
+    return NodeDetailSerializer().fields
+
+
+def validate_node(data: Any) -> Dict[str, Any]:
+    """
+    Validate a node with the fields of NodeDetailSerializer
+
+    Each field is run directly, which is far cheaper than a serializer
+    instance per node when ingesting nodes in bulk, while the rules and
+    error messages stay those of the serializer. Timestamps are stored in
+    the serializer's output format. SERVER_SET_FIELDS may be left out, and
+    are then None.
+
+    Returns:
+        The node with only its NodeDetailSerializer fields, in field order
+
+    Raises:
+        serializers.ValidationError: With errors keyed by field
+    """
+    if not isinstance(data, dict):
+        message = serializers.Serializer.default_error_messages['invalid']
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                str(message).format(datatype=type(data).__name__)
+            ]
+        }, code='invalid')
+
+    node, errors = {}, {}
+    for name, field in _node_fields().items():
+        value = data.get(name, empty)
+        if value is empty and name in SERVER_SET_FIELDS:
+            # Kept in field order; upsert_nodes fills it in
+            node[name] = None
+            continue
+        try:
+            value = field.run_validation(value)
+        except serializers.ValidationError as exc:
+            errors[name] = exc.detail
+            continue
+        if isinstance(field, serializers.DateTimeField):
+            value = field.to_representation(value)
+        node[name] = value
+    if errors:
+        raise serializers.ValidationError(errors)
+    return node
+
+
+class BulkIngestQuerySerializer(serializers.Serializer):
+    """
+    Serializer for bulk ingest parameters
+    """
+    batch_size = serializers.IntegerField(
+        required=False,
+        default=10000,
+        min_value=1,
+        max_value=100000,
+        help_text="Nodes applied to the indexes per commit"
+    )
+
+
+class NodeBatchResponseSerializer(serializers.Serializer):
+    """
+    Serializer for response of a batch node lookup
+    """
+    count = serializers.IntegerField(help_text="Number of nodes found")
+    nodes = NodeDetailSerializer(many=True, help_text="Nodes found, in request order")
+    missing = serializers.ListField(
+        child=serializers.CharField(),
+        help_text="Requested node IDs that do not exist"
+    )
+
+
+class NodeRelationshipListResponseSerializer(serializers.Serializer):
+    """
+    Serializer for response containing the relationships of a node
+    """
+    node_id = serializers.CharField(help_text="Node the relationships belong to")
+    count = serializers.IntegerField(help_text="Number of relationships returned")
+    relationships = NodeRelationshipSerializer(
+        many=True,
+        help_text="Relationships seen from the node; target_node_id is the other endpoint"
+    )
+
+
+class NeighborSerializer(serializers.Serializer):
+    """
+    Serializer for a node reached by a traversal
+    """
+    distance = serializers.IntegerField(help_text="Number of hops from the start node")
+    node = NodeDetailSerializer(help_text="The node reached")
+
+
+class NeighborhoodResponseSerializer(serializers.Serializer):
+    """
+    Serializer for response of a k-hop traversal
+    """
+    node_id = serializers.CharField(help_text="Start node of the traversal")
+    count = serializers.IntegerField(help_text="Number of nodes reached")
+    truncated = serializers.BooleanField(
+        help_text="Whether the fan-out or result limit cut the traversal short"
+    )
+    results = NeighborSerializer(many=True, help_text="Nodes reached, nearest first")
+
+
+class SearchHitSerializer(serializers.Serializer):
+    """
+    Serializer for a node found by full-text search
+    """
+    score = serializers.FloatField(help_text="BM25 relevance score; higher is better")
+    node = NodeDetailSerializer(help_text="The node found")
+
+
+class SearchResponseSerializer(serializers.Serializer):
+    """
+    Serializer for response of a full-text search
+    """
+    query = serializers.CharField(help_text="The search text")
+    count = serializers.IntegerField(help_text="Number of results returned")
+    results = SearchHitSerializer(many=True, help_text="Matching nodes, most relevant first")
+
+
+class HistogramBucketSerializer(serializers.Serializer):
+    """
+    Serializer for one histogram bucket
+    """
+    start = serializers.FloatField(help_text="Lowest value in the bucket (inclusive)")
+    end = serializers.FloatField(help_text="End of the bucket (exclusive)")
+    count = serializers.IntegerField(help_text="Number of nodes in the bucket")
+
+
+class AggregateSummarySerializer(serializers.Serializer):
+    """
+    Serializer for the summary of a set of nodes
+    """
+    count = serializers.IntegerField(help_text="Number of nodes")
+    min = serializers.FloatField(required=False, allow_null=True, help_text="Smallest value of 'field'")
+    max = serializers.FloatField(required=False, allow_null=True, help_text="Largest value of 'field'")
+    avg = serializers.FloatField(required=False, allow_null=True, help_text="Mean value of 'field'")
+    histogram = HistogramBucketSerializer(
+        many=True,
+        required=False,
+        help_text="Non-empty buckets of 'field', when requested with bucket_size"
+    )
+
+
+class AggregateGroupSerializer(AggregateSummarySerializer):
+    """
+    Serializer for the summary of one group
+    """
+    value = serializers.JSONField(help_text="Label or property value of the group")
+
+
+class AggregateResponseSerializer(AggregateSummarySerializer):
+    """
+    Serializer for response of an aggregation
+    """
+    query_params = serializers.DictField(help_text="Parameters used for the aggregation")
+    group_count = serializers.IntegerField(
+        required=False,
+        help_text="Number of non-empty groups, when grouped"
+    )
+    groups = AggregateGroupSerializer(
+        many=True,
+        required=False,
+        help_text="Largest groups first, up to limit"
+    )
+    explain = serializers.DictField(
+        required=False,
+        help_text="Query plan of the filter, when requested with ?explain=1"
+    )
+
+
+class ShortestPathResponseSerializer(serializers.Serializer):
+    """
+    Serializer for response of a shortest path search
+    """
+    source = serializers.CharField(help_text="Start node of the path")
+    target = serializers.CharField(help_text="End node of the path")
+    length = serializers.IntegerField(help_text="Number of relationships on the path")
+    nodes = serializers.ListField(
+        child=serializers.CharField(),
+        help_text="Node IDs along the path, from source to target"
+    )
+    relationships = NodeRelationshipSerializer(
+        many=True,
+        help_text="Relationships along the path; target_node_id is the next node"
+    )
+
+
 class NodeListResponseSerializer(serializers.Serializer):
     """
     Serializer for response containing list of nodes
     """
     count = serializers.IntegerField(help_text="Total number of nodes found")
+    next = serializers.URLField(
+        allow_null=True,
+        help_text="Link to the next page of results, or null on the last page"
+    )
+    high_water_mark = serializers.CharField(
+        required=False,
+        help_text="Latest updated_at among the matches, when filtered with updated_since; "
+                  "pass it as updated_since on the next poll"
+    )
     query_params = serializers.DictField(help_text="Parameters used for the query")
+    explain = serializers.DictField(
+        required=False,
+        help_text="Query plan and rows examined, when requested with ?explain=1"
+    )
     nodes = NodeDetailSerializer(many=True, help_text="List of nodes matching the query")
@@ -1,10 +1,69 @@
 """
 Service layer for Graph Database operations
-This would typically connect to a real graph database (Neo4j, ArangoDB, etc.)
-For demo purposes, we're using dummy data
+Data comes from a pluggable backend (see backends.py); by default the
+built-in dummy data is served from memory
 """
+import logging
+import threading
+import time
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+
+from .adjacency import BOTH, RelationshipStore
+from .aggregates import Aggregator
+from .backends import BackendError, BackendUnavailable, GraphBackend, InMemoryBackend, load_backend
+from .cache import DEFAULT_MAX_SIZE, QueryCache, get_cache_config
+from .indexes import NodeIndex, Predicate, Projection, parse_timestamp, project_node
+from .planner import QueryPlanner
+from .search import SearchIndex
+from .singleflight import SingleFlight
+from .snapshots import (
+    DEFAULT_MAX_AGE,
+    SnapshotError,
+    get_snapshot_config,
+    load_snapshot,
+    save_snapshot,
+)
+from .traversal import TraversalEngine
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retrying a failed graph load, doubling up to the most
+LOAD_RETRY_MIN = 1.0
+LOAD_RETRY_MAX = 60.0
+
+
+class GraphNotLoaded(BackendUnavailable):
+    """The graph could not be loaded from the backend yet"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        # Seconds until the next load attempt
+        self.retry_after = retry_after
+
+
+class NodePage(NamedTuple):
+    """One page of query results"""
+    # Node dicts, or None when the page was requested encoded or columnar
+    nodes: Optional[List[Dict[str, Any]]]
+    count: int
+    next_after: Optional[int]
+    explain: Optional[Dict[str, Any]] = None
+    # (JSON bytes, ETag) per node, when requested with encoded=True
+    encoded: Optional[List[Tuple[bytes, str]]] = None
+    # field -> values for the whole page, when requested with columnar=True
+    columns: Optional[Dict[str, Any]] = None
+    # Latest updated_at among all matches, when filtered with updated_since
+    high_water_mark: Optional[str] = None
+
+
+class GraphSnapshot(NamedTuple):
+    """One committed version of the graph"""
+    index: NodeIndex
+    relationships: RelationshipStore
+    search: SearchIndex
 
 
 class GraphDatabaseService:
@@ -137,6 +196,408 @@ class GraphDatabaseService:
         },
     ]
     
+    # Dummy relationships between the nodes above
+    DUMMY_RELATIONSHIPS = [
+        {
+            "relationship_id": "r001",
+            "type": "KNOWS",
+            "source": "n001",
+            "target": "n002",
+            "properties": {
+                "since": "2023-02-01",
+                "weight": 0.8
+            }
+        },
+        {
+            "relationship_id": "r002",
+            "type": "KNOWS",
+            "source": "n002",
+            "target": "n003",
+            "properties": {
+                "since": "2022-12-05",
+                "weight": 0.6
+            }
+        },
+        {
+            "relationship_id": "r003",
+            "type": "MANAGES",
+            "source": "n003",
+            "target": "n001",
+            "properties": {
+                "since": "2023-01-20"
+            }
+        },
+        {
+            "relationship_id": "r004",
+            "type": "MANAGES",
+            "source": "n003",
+            "target": "n002",
+            "properties": {
+                "since": "2022-11-25"
+            }
+        },
+        {
+            "relationship_id": "r005",
+            "type": "WORKS_AT",
+            "source": "n001",
+            "target": "n005",
+            "properties": {
+                "role": "Engineer",
+                "since": "2023-01-15"
+            }
+        },
+        {
+            "relationship_id": "r006",
+            "type": "WORKS_AT",
+            "source": "n002",
+            "target": "n005",
+            "properties": {
+                "role": "Designer",
+                "since": "2022-11-20"
+            }
+        },
+        {
+            "relationship_id": "r007",
+            "type": "WORKS_AT",
+            "source": "n003",
+            "target": "n005",
+            "properties": {
+                "role": "Director",
+                "since": "2021-03-10"
+            }
+        },
+        {
+            "relationship_id": "r008",
+            "type": "KNOWS",
+            "source": "n004",
+            "target": "n001",
+            "properties": {
+                "since": "2023-06-01",
+                "weight": 0.4
+            }
+        },
+        {
+            "relationship_id": "r009",
+            "type": "FOLLOWS",
+            "source": "n006",
+            "target": "n001",
+            "properties": {
+                "since": "2024-02-14"
+            }
+        },
+        {
+            "relationship_id": "r010",
+            "type": "KNOWS",
+            "source": "n006",
+            "target": "n004",
+            "properties": {
+                "since": "2023-09-30",
+                "weight": 0.9
+            }
+        },
+    ]
+    
+    # Where nodes and relationships are loaded from; see get_backend()
+    _backend: GraphBackend = None
+    
+    # Indexes over the backend's nodes and relationships. Readers take the
+    # current snapshot once per call and never lock; writers build a new
+    # snapshot and swap it in whole, under _write_lock.
+    _snapshot: "GraphSnapshot" = None
+    _write_lock = threading.Lock()
+    
+    # Incremented every time the dataset (and so its indexes) changes
+    _version = 0
+    
+    # Results of recent queries for the current dataset version; see
+    # get_query_cache()
+    _query_cache: QueryCache = None
+    
+    # Coalesces concurrent identical backend loads and query executions
+    _flights = SingleFlight()
+    
+    # When a failed load may next be retried (time.monotonic()), and the
+    # wait after the next failure
+    _load_retry_at = 0.0
+    _load_backoff = LOAD_RETRY_MIN
+    
+    @classmethod
+    def get_backend(cls) -> GraphBackend:
+        """
+        Get the configured backend
+        
+        The GRAPH_BACKEND setting picks it; without one, the dummy data
+        is served from memory.
+        """
+        if cls._backend is None:
+            cls._backend = load_backend() or InMemoryBackend(
+                cls.DUMMY_NODES, cls.DUMMY_RELATIONSHIPS
+            )
+        return cls._backend
+    
+    @classmethod
+    def set_backend(cls, backend: GraphBackend):
+        """Switch to another backend and reload the graph from it"""
+        previous = cls._backend
+        cls._backend = backend
+        try:
+            cls.build_indexes()
+        except Exception:
+            cls._backend = previous
+            raise
+        if previous is not None and previous is not backend:
+            previous.close()
+    
+    @classmethod
+    def get_query_cache(cls) -> QueryCache:
+        """Get the query result cache, sized by the GRAPH_QUERY_CACHE setting"""
+        if cls._query_cache is None:
+            config = get_cache_config()
+            cls._query_cache = QueryCache(config.get('MAX_SIZE', DEFAULT_MAX_SIZE))
+        return cls._query_cache
+    
+    @classmethod
+    def _execute(cls, index: NodeIndex,
+                 predicates: List[Predicate]) -> Tuple[List[int], Dict[str, Any]]:
+        """
+        Run a conjunctive query through the result cache
+        
+        Returns:
+            Tuple of (ascending matching ordinals, explain output)
+        """
+        cache = cls.get_query_cache()
+        key = frozenset(index.cache_key(predicate) for predicate in predicates)
+        cached = cache.get(key, index.version)
+        if cached is not None:
+            ordinals, plan = cached
+            return ordinals, dict(plan, cached=True)
+        # Requests missing together (e.g. right after the data changed) run
+        # the query once between them
+        ordinals, plan = cls._flights.do(
+            ("query", index.version, key), cls._execute_uncached, index, predicates, key
+        )
+        return ordinals, dict(plan, cached=False)
+    
+    @classmethod
+    def _execute_uncached(cls, index: NodeIndex, predicates: List[Predicate],
+                          key: frozenset) -> Tuple[List[int], Dict[str, Any]]:
+        """Run a query with the planner and cache its result"""
+        ordinals, plan = QueryPlanner(index).execute(predicates)
+        cls.get_query_cache().put(key, index.version, ordinals, plan)
+        return ordinals, plan
+    
+    @classmethod
+    def build_indexes(cls):
+        """
+        Load the graph from the backend and build the lookup indexes
+        
+        Callers arriving while a build from the same backend is running
+        wait for that build instead of loading the graph again.
+        
+        Raises:
+            BackendError: If the backend cannot be read
+        """
+        backend = cls.get_backend()
+        cls._flights.do(("build", id(backend)), cls._build_from, backend)
+    
+    @classmethod
+    def _build_from(cls, backend: GraphBackend):
+        """Load the graph from a backend and swap in new indexes over it"""
+        nodes = backend.fetch_nodes()
+        relationships = backend.fetch_relationships()
+        
+        with cls._write_lock:
+            cls._version += 1
+            index = NodeIndex(nodes, version=cls._version)
+            cls._snapshot = GraphSnapshot(
+                index, RelationshipStore(relationships, index.ids, len(index.nodes)),
+                SearchIndex(index.nodes)
+            )
+    
+    @classmethod
+    def get_snapshot(cls) -> "GraphSnapshot":
+        """
+        Get the current snapshot, loading the graph on first use
+        
+        Raises:
+            GraphNotLoaded: If the graph is not loaded and the backend
+                cannot be read (or was not readable moments ago)
+        """
+        snapshot = cls._snapshot
+        if snapshot is None:
+            cls.ensure_loaded()
+            snapshot = cls._snapshot
+        return snapshot
+    
+    @classmethod
+    def ensure_loaded(cls):
+        """
+        Load the graph unless it is loaded already
+        
+        A failed load is logged and retried by a later call, after a wait
+        that doubles with each failure from LOAD_RETRY_MIN to LOAD_RETRY_MAX
+        seconds, so an unavailable backend is not hammered by every request.
+        
+        Raises:
+            GraphNotLoaded: If the graph could not be loaded
+        """
+        if cls._snapshot is not None:
+            return
+        wait = cls._load_retry_at - time.monotonic()
+        if wait > 0:
+            raise GraphNotLoaded("Graph data is not available yet", wait)
+        try:
+            cls._flights.do(("load",), cls.load_indexes)
+        except BackendError as exc:
+            backoff = cls._load_backoff
+            cls._load_retry_at = time.monotonic() + backoff
+            cls._load_backoff = min(backoff * 2, LOAD_RETRY_MAX)
+            logger.warning("Cannot load the graph, retrying in %.0f s: %s", backoff, exc)
+            raise GraphNotLoaded(f"Graph data is not available yet: {exc}", backoff) from exc
+        cls._load_backoff = LOAD_RETRY_MIN
+    
+    @classmethod
+    def load_indexes(cls):
+        """
+        Get the indexes ready at startup
+        
+        With the GRAPH_SNAPSHOT setting, a usable snapshot file is loaded
+        instead of rebuilding from the backend; failing that, the indexes
+        are built and saved there for the next worker that starts.
+        """
+        config = get_snapshot_config()
+        if config is None:
+            cls.build_indexes()
+            return
+        
+        path = config['PATH']
+        try:
+            snapshot = load_snapshot(path, cls._snapshot_source(),
+                                     config.get('MAX_AGE', DEFAULT_MAX_AGE))
+            if not isinstance(snapshot, GraphSnapshot):
+                raise SnapshotError(f"{path} does not hold a graph snapshot")
+        except SnapshotError as exc:
+            logger.info("Building indexes: %s", exc)
+        else:
+            with cls._write_lock:
+                cls._snapshot = snapshot
+                cls._version = max(cls._version, snapshot.index.version)
+            return
+        
+        cls.build_indexes()
+        try:
+            cls.save_snapshot(path)
+        except OSError as exc:
+            logger.warning("Cannot save index snapshot to %s: %s", path, exc)
+    
+    @classmethod
+    def save_snapshot(cls, path: Optional[str] = None) -> int:
+        """
+        Save the current indexes to a snapshot file
+        
+        Args:
+            path: File to write, or None for the GRAPH_SNAPSHOT path
+            
+        Returns:
+            Size of the file in bytes
+            
+        Raises:
+            ValueError: If no path is given or configured
+        """
+        if path is None:
+            config = get_snapshot_config()
+            if config is None:
+                raise ValueError("No path given and GRAPH_SNAPSHOT is not set")
+            path = config['PATH']
+        return save_snapshot(path, cls.get_snapshot(), cls._snapshot_source())
+    
+    @classmethod
+    def _snapshot_source(cls) -> str:
+        """Identify the backend, and the data it serves, a snapshot is built from"""
+        return cls.get_backend().source()
+    
+    @classmethod
+    def upsert_nodes(cls, nodes: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """
+        Insert or replace a batch of validated nodes as one commit
+        
+        The indexes are updated copy-on-write and published with a single
+        swap, so readers see all of the batch or none of it and never wait.
+        Changes are held in this process only; the backend is not written.
+        
+        Every node's updated_at is set to the time of the commit, whatever
+        the client sent, so each write shows up in updated_since polls.
+        
+        Args:
+            nodes: Nodes to upsert, matched on node_id
+        
+        Returns:
+            Tuple of (nodes created, nodes replaced, new dataset version)
+        """
+        cls.ensure_loaded()
+        with cls._write_lock:
+            snapshot = cls._snapshot
+            version = cls._version + 1
+            updated_at = cls._commit_timestamp(snapshot.index)
+            nodes = [dict(node, updated_at=updated_at) for node in nodes]
+            index, created, replaced = snapshot.index.apply(nodes, version)
+            relationships = snapshot.relationships
+            if created:
+                relationships = relationships.with_nodes(index.ids, len(index.nodes))
+            search = snapshot.search.updated(
+                snapshot.index.nodes, index.nodes,
+                (index.ids[node["node_id"]] for node in nodes)
+            )
+            cls._snapshot = GraphSnapshot(index, relationships, search)
+            cls._version = version
+        return created, replaced, version
+    
+    @staticmethod
+    def _commit_timestamp(index: NodeIndex) -> str:
+        """
+        Get the updated_at for a commit: now, but always later than every
+        updated_at already indexed, so a poller's high water mark (even one
+        set by a timestamp in the future) never hides the commit
+        """
+        now = datetime.now(timezone.utc).timestamp()
+        ranges = index.ranges.get("updated_at")
+        if ranges is not None and ranges.keys:
+            now = max(now, ranges.keys[-1] + 1e-6)
+        stamp = datetime.fromtimestamp(now, timezone.utc)
+        return stamp.isoformat(timespec="microseconds").replace("+00:00", "Z")
+    
+    @classmethod
+    def ingest_nodes(cls, nodes: Iterable[Dict[str, Any]], batch_size: int) -> Dict[str, int]:
+        """
+        Upsert a stream of validated nodes, committing batch_size at a time
+        
+        Index maintenance is paid once per batch rather than once per node.
+        
+        Args:
+            nodes: Nodes to upsert, consumed lazily
+            batch_size: Nodes per commit
+        
+        Returns:
+            Dict with the number of nodes created and updated, and of batches committed
+        """
+        result = {"created": 0, "updated": 0, "batches": 0}
+        
+        def commit(batch):
+            created, replaced, _ = cls.upsert_nodes(batch)
+            result["created"] += created
+            result["updated"] += replaced
+            result["batches"] += 1
+        
+        batch = []
+        for node in nodes:
+            batch.append(node)
+            if len(batch) >= batch_size:
+                commit(batch)
+                batch = []
+        if batch:
+            commit(batch)
+        return result
+    
     @classmethod
     def get_nodes_by_criteria(cls, by: str, value: str) -> List[Dict[str, Any]]:
         """
@@ -149,35 +610,370 @@ class GraphDatabaseService:
         Returns:
             List of nodes matching the criteria
         """
-        results = []
+        index = cls.get_snapshot().index
+        ordinals, _ = cls._execute(index, [(by, "eq", value)])
+        return index.materialize(ordinals)
+    
+    @classmethod
+    def search_nodes(cls, query: str, limit: int = 10,
+                     projection: Optional[Projection] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Full-text search across the string properties of every node
+        
+        Args:
+            query: Free text; nodes containing any of its words match
+            limit: Maximum number of results
+            projection: (fields, properties) to keep, or None for whole nodes
+            
+        Returns:
+            Up to limit (BM25 score, node) pairs, best match first
+        """
+        snapshot = cls.get_snapshot()
+        hits = snapshot.search.search(query, limit)
+        nodes = snapshot.index.materialize([ordinal for ordinal, _ in hits], projection)
+        return [(score, node) for (_, score), node in zip(hits, nodes)]
+    
+    @classmethod
+    def aggregate_nodes(cls, predicates: Optional[List[Predicate]] = None,
+                        group_by: Optional[str] = None, field: Optional[str] = None,
+                        bucket_size: Optional[float] = None, limit: int = 100,
+                        explain: bool = False,
+                        updated_since: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Count and summarize nodes, optionally filtered and grouped
+        
+        Answered from the indexes alone: groups are posting lists and
+        numeric summaries come from range indexes, so no node is read.
+        
+        Args:
+            predicates: (field, operator, value) triples that must all match,
+                or None for all nodes
+            group_by: Field to group by ('label'/'type' or a property name)
+            field: Numeric field to report min, max and avg of
+            bucket_size: Histogram bucket width over field
+            limit: Maximum number of groups to return, largest first
+            explain: Whether to include the filter's query plan
+            updated_since: ISO 8601 timestamp; only nodes updated after it count
+            
+        Returns:
+            Dict with the overall count and summaries, plus groups when grouped
+            
+        Raises:
+            HistogramError: If a histogram would have too many buckets
+        """
+        index = cls.get_snapshot().index
+        if updated_since is not None:
+            predicates = list(predicates or []) + [
+                ("updated_at", "gt", parse_timestamp(updated_since))
+            ]
+        ordinals = plan = None
+        if predicates:
+            ordinals, plan = cls._execute(index, predicates)
+        
+        result = Aggregator(index).aggregate(ordinals, group_by, field, bucket_size, limit)
+        if explain and plan is not None:
+            result["explain"] = plan
+        return result
+    
+    @classmethod
+    def get_query_cache_stats(cls) -> Dict[str, Any]:
+        """
+        Get the query cache's hit/miss counters and occupancy, plus how
+        many calls shared another caller's in-flight execution
+        """
+        return dict(cls.get_query_cache().stats(), coalesced=cls._flights.shared)
+    
+    @classmethod
+    def get_dataset_version(cls) -> int:
+        """Get the version of the dataset currently being served"""
+        return cls.get_snapshot().index.version
+    
+    @classmethod
+    def get_nodes_page(cls, predicates: Optional[List[Predicate]] = None,
+                       after: Optional[int] = None, limit: int = 100,
+                       explain: bool = False, encoded: bool = False,
+                       columnar: bool = False,
+                       projection: Optional[Projection] = None,
+                       updated_since: Optional[str] = None) -> NodePage:
+        """
+        Retrieve one page of nodes, optionally filtered by criteria
+        
+        Pages are keyed on the node ordinal, so each page is a seek into
+        an index rather than an offset over the full result. Several
+        predicates are combined with AND, most selective first.
+        
+        With updated_since, only nodes changed after that time match, and
+        the page carries the latest updated_at among every match as the
+        high water mark to poll from next time (updated_since itself when
+        nothing changed).
+        
+        Args:
+            predicates: (field, operator, value) triples that must all match,
+                or None for all nodes
+            after: Ordinal of the last node on the previous page
+            limit: Maximum number of nodes to return
+            explain: Whether to include the query plan in the result
+            encoded: Whether to return JSON bytes of each node instead of dicts
+            columnar: Whether to return the page as columns instead of dicts
+            projection: (fields, properties) to keep, or None for whole nodes
+            updated_since: ISO 8601 timestamp; only nodes updated after it match
+            
+        Returns:
+            NodePage with the nodes, total matches and next cursor ordinal
+        """
+        index = cls.get_snapshot().index
+        plan = None
+        if updated_since is not None:
+            predicates = list(predicates or []) + [
+                ("updated_at", "gt", parse_timestamp(updated_since))
+            ]
+        if not predicates:
+            ordinals = None
+            total = len(index.nodes)
+        else:
+            ordinals, plan = cls._execute(index, predicates)
+            total = len(ordinals)
+        
+        page, next_after = index.page(ordinals, after, limit)
+        nodes = encoded_nodes = columns = None
+        if encoded:
+            encoded_nodes = [index.encode(ordinal, projection) for ordinal in page]
+        elif columnar:
+            columns = index.columns(page, projection)
+        else:
+            nodes = index.materialize(page, projection)
+        
+        high_water_mark = None
+        if updated_since is not None:
+            latest = index.latest("updated_at", ordinals)
+            high_water_mark = updated_since if latest is None else index.nodes[latest]["updated_at"]
+        return NodePage(
+            nodes, total, next_after, plan if explain else None, encoded_nodes, columns,
+            high_water_mark
+        )
+    
+    @classmethod
+    def get_node_by_id(cls, node_id: str,
+                       projection: Optional[Projection] = None) -> Dict[str, Any]:
+        """Get a single node by ID, optionally keeping only some fields"""
+        index = cls.get_snapshot().index
+        ordinal = index.ordinal_of(node_id)
+        if ordinal is None:
+            return None
+        if projection is None:
+            return index.nodes[ordinal]
+        return project_node(index.nodes[ordinal], *projection)
+    
+    @classmethod
+    def get_encoded_node(cls, node_id: str, projection: Optional[Projection] = None
+                         ) -> Optional[Tuple[bytes, str, Optional[float]]]:
+        """
+        Get a node as pre-encoded JSON
+        
+        Args:
+            node_id: ID of the node
+            projection: (fields, properties) to keep, or None for the whole node
+            
+        Returns:
+            Tuple of (JSON bytes, ETag, updated_at as epoch seconds),
+            or None if the node does not exist
+        """
+        index = cls.get_snapshot().index
+        ordinal = index.ordinal_of(node_id)
+        if ordinal is None:
+            return None
+        body, etag = index.encode(ordinal, projection)
+        return body, etag, index.modified_at(ordinal)
+    
+    @classmethod
+    def get_nodes_by_ids(cls, node_ids: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Get many nodes by ID in a single pass over the ID index
+        
+        Args:
+            node_ids: IDs to look up; duplicates are resolved once
+            
+        Returns:
+            Tuple of (nodes found in request order, IDs that were not found)
+        """
+        index = cls.get_snapshot().index
+        nodes = index.nodes
+        found = []
+        missing = []
         
-        for node in cls.DUMMY_NODES:
-            if by == "node_id":
-                if node["node_id"] == value:
-                    results.append(node)
-            elif by == "label" or by == "type":
-                if value in node["labels"]:
-                    results.append(node)
-            elif by in node["properties"]:
-                # Check if property value matches (case-insensitive for strings)
-                prop_value = node["properties"][by]
-                if isinstance(prop_value, str) and isinstance(value, str):
-                    if prop_value.lower() == value.lower():
-                        results.append(node)
-                elif str(prop_value) == value:
-                    results.append(node)
+        for node_id in dict.fromkeys(node_ids):
+            ordinal = index.ordinal_of(node_id)
+            if ordinal is None:
+                missing.append(node_id)
+            else:
+                found.append(nodes[ordinal])
         
-        return results
+        return found, missing
     
     @classmethod
-    def get_node_by_id(cls, node_id: str) -> Dict[str, Any]:
-        """Get a single node by ID"""
-        for node in cls.DUMMY_NODES:
-            if node["node_id"] == node_id:
-                return node
-        return None
+    def get_relationships(cls, node_id: str, direction: str = BOTH,
+                          types: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the relationships of a node
+        
+        Args:
+            node_id: ID of the node
+            direction: OUTGOING, INCOMING or BOTH
+            types: Relationship types to keep, or None for all
+            
+        Returns:
+            List of relationships seen from the node, or None if the node does not exist
+        """
+        snapshot = cls.get_snapshot()
+        index, store = snapshot.index, snapshot.relationships
+        ordinal = index.ordinal_of(node_id)
+        if ordinal is None:
+            return None
+        
+        nodes = index.nodes
+        return [
+            store.describe(edge, side, nodes[neighbor]["node_id"])
+            for neighbor, edge, side in store.expand(ordinal, direction, types)
+        ]
+    
+    @classmethod
+    def get_neighborhood(cls, node_id: str, depth: int = 2, direction: str = BOTH,
+                         types: Optional[List[str]] = None,
+                         max_fanout: Optional[int] = None,
+                         limit: Optional[int] = None) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        Get every node within a number of hops of a node
+        
+        Args:
+            node_id: ID of the start node
+            depth: Maximum number of hops
+            direction: OUTGOING, INCOMING or BOTH
+            types: Relationship types to follow, or None for all
+            max_fanout: Maximum edges followed out of any single node
+            limit: Maximum number of nodes to return
+            
+        Returns:
+            Tuple of ([{"distance", "node"}] in BFS order, whether a limit was hit),
+            or None if the start node does not exist
+        """
+        snapshot = cls.get_snapshot()
+        index = snapshot.index
+        start = index.ordinal_of(node_id)
+        if start is None:
+            return None
+        
+        engine = TraversalEngine(snapshot.relationships, len(index.nodes))
+        found, truncated = engine.neighborhood(
+            start, depth, direction, types, max_fanout, limit
+        )
+        nodes = index.nodes
+        results = [
+            {"distance": distance, "node": nodes[ordinal]}
+            for ordinal, distance in found
+        ]
+        return results, truncated
+    
+    @classmethod
+    def get_shortest_path(cls, source_id: str, target_id: str, max_depth: int = 6,
+                          direction: str = BOTH,
+                          types: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find a shortest path between two nodes
+        
+        Args:
+            source_id: ID of the start node
+            target_id: ID of the end node
+            max_depth: Maximum path length in hops
+            direction: OUTGOING, INCOMING or BOTH
+            types: Relationship types to follow, or None for all
+            
+        Returns:
+            Dict with the node IDs and relationships along the path, or None
+            if either node is missing or no path exists within max_depth
+        """
+        snapshot = cls.get_snapshot()
+        index, store = snapshot.index, snapshot.relationships
+        source = index.ordinal_of(source_id)
+        target = index.ordinal_of(target_id)
+        if source is None or target is None:
+            return None
+        
+        engine = TraversalEngine(store, len(index.nodes))
+        hops = engine.shortest_path(source, target, max_depth, direction, types)
+        if hops is None:
+            return None
+        
+        nodes = index.nodes
+        node_ids = [nodes[ordinal]["node_id"] for ordinal, _, _ in hops]
+        relationships = [
+            store.describe(edge, edge_direction, node_ids[i + 1])
+            for i, (_, edge, edge_direction) in enumerate(hops[1:])
+        ]
+        return {
+            "length": len(relationships),
+            "nodes": node_ids,
+            "relationships": relationships
+        }
     
     @classmethod
     def get_all_nodes(cls) -> List[Dict[str, Any]]:
         """Get all nodes in the graph"""
-        return cls.DUMMY_NODES
+        return cls.get_snapshot().index.nodes
+    
+    @classmethod
+    def iter_nodes(cls) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all nodes in the graph one at a time
+        
+        The node list is captured by this call, so a long-running export
+        sees a consistent view of the graph, and a graph that cannot be
+        loaded fails here rather than partway through a response.
+        """
+        return iter(cls.get_snapshot().index.nodes)
+
+
+
+class AsyncGraphDatabaseService:
+    """
+    Async interface to the graph database, used by the async views
+    
+    Mirrors the read methods of GraphDatabaseService. Reads never lock;
+    they take the current snapshot. Each call still runs in a worker
+    thread, not on the event loop, because a read can wait for another
+    request's identical query to finish (see _execute), and filtering and
+    encoding a large page takes real CPU time. The same goes for the
+    first read after a failed startup load, which retries the load. The
+    calls are not thread-sensitive, so concurrent requests run in
+    parallel threads rather than queueing on the single sync thread.
+    """
+    
+    @classmethod
+    async def get_nodes_page(cls, predicates: Optional[List[Predicate]] = None,
+                             after: Optional[int] = None, limit: int = 100,
+                             explain: bool = False, encoded: bool = False,
+                             columnar: bool = False,
+                             projection: Optional[Projection] = None,
+                             updated_since: Optional[str] = None) -> NodePage:
+        """Retrieve one page of nodes; see GraphDatabaseService.get_nodes_page"""
+        return await sync_to_async(GraphDatabaseService.get_nodes_page, thread_sensitive=False)(
+            predicates, after=after, limit=limit, explain=explain,
+            encoded=encoded, columnar=columnar, projection=projection,
+            updated_since=updated_since
+        )
+    
+    @classmethod
+    async def get_node_by_id(cls, node_id: str,
+                             projection: Optional[Projection] = None) -> Dict[str, Any]:
+        """Get a single node by ID; see GraphDatabaseService.get_node_by_id"""
+        return await sync_to_async(GraphDatabaseService.get_node_by_id, thread_sensitive=False)(
+            node_id, projection
+        )
+    
+    @classmethod
+    async def get_encoded_node(cls, node_id: str, projection: Optional[Projection] = None
+                               ) -> Optional[Tuple[bytes, str, Optional[float]]]:
+        """Get a node as pre-encoded JSON; see GraphDatabaseService.get_encoded_node"""
+        return await sync_to_async(GraphDatabaseService.get_encoded_node, thread_sensitive=False)(
+            node_id, projection
+        )
+
@@ -53,6 +53,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'graph_api.wsgi.application'
+ASGI_APPLICATION = 'graph_api.asgi.application'
+
+# Route the node list and lookup endpoints to their async views. Turn on
+# only when serving through asgi.py; under WSGI the sync views are faster.
+GRAPH_ASYNC_VIEWS = False
 
 DATABASES = {
     'default': {
@@ -77,11 +82,55 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'graph_nodes.renderers.FastJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    # Answers 503 while the graph backend cannot be reached
+    'EXCEPTION_HANDLER': 'graph_nodes.exceptions.exception_handler',
 }
 
+# Graph backend. Without this setting the built-in sample data is served
+# from memory; to load from a graph server (see graph_server.py) instead.
+# The graph is loaded from the backend when a worker starts and served from
+# in-memory indexes; while the backend is unreachable, requests get 503 and
+# the load is retried with backoff:
+# GRAPH_BACKEND = {
+#     'BACKEND': 'graph_nodes.backends.NetworkBackend',
+#     'OPTIONS': {'host': '127.0.0.1', 'port': 7688, 'pool_size': 8, 'timeout': 5.0},
+# }
+# or, to share one memory-mapped copy of the nodes between worker processes
+# (write the file with `python -m graph_nodes.nodestore`). Only the node
+# records are shared; every worker still builds its own indexes, roughly
+# 2 KB per node (see nodestore.py):
+# GRAPH_BACKEND = {
+#     'BACKEND': 'graph_nodes.backends.MappedBackend',
+#     'OPTIONS': {'path': '/var/lib/graph_api/graph.nodes'},
+# }
+
+# Index snapshot. When set, workers load the indexes from this file at
+# startup instead of rebuilding them, and rebuild (and rewrite the file)
+# when it is missing, corrupt, built from another backend (or the same one
+# pointed at another file or server), or older than MAX_AGE seconds:
+# GRAPH_SNAPSHOT = {
+#     'PATH': '/var/lib/graph_api/graph.snapshot',
+#     'MAX_AGE': 3600,
+# }
+
+# Query result cache. Results of frequent criteria are kept until the data
+# changes; MAX_SIZE budgets the node ordinals held (0 turns it off). Watch
+# hit_rate at /api/nodes/cache/ to size it. ENCODED_MAX_BYTES budgets the
+# pre-encoded node JSON each worker keeps for node responses:
+# GRAPH_QUERY_CACHE = {
+#     'MAX_SIZE': 1000000,
+#     'ENCODED_MAX_BYTES': 64 * 1024 * 1024,
+# }
+
+# Who may change the graph (POST /api/nodes/bulk/): dotted DRF permission
+# classes that must all allow the request. Defaults to admin users only:
+# GRAPH_WRITE_PERMISSION_CLASSES = [
+#     'rest_framework.permissions.IsAdminUser',
+# ]
+
 # Swagger Settings
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
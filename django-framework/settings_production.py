@@ -0,0 +1,18 @@
+"""
+Production settings for graph_api project.
+
+Use with DJANGO_SETTINGS_MODULE=graph_api.settings_production
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+# Machine-readable renderers only: no browsable API, and content
+# negotiation has a single candidate to check.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'graph_nodes.renderers.FastJSONRenderer',
+    ],
+}
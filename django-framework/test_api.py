@@ -2,14 +2,28 @@
 """
 Test script for Graph Database API
 Run this after starting the server to verify all endpoints work correctly
+(the parts with no endpoint are tested by `python manage.py test graph_nodes`)
+
+The tests that ingest nodes log in as an admin user; create one with
+`python manage.py createsuperuser` and pass its credentials in the
+GRAPH_API_USER and GRAPH_API_PASSWORD environment variables.
 """
 
+import os
+import uuid
 import requests
 import json
+from datetime import datetime
 from typing import Dict, Any
 
 BASE_URL = "http://127.0.0.1:8000/api"
 
+# IDs of the sample nodes the server starts with, in node order
+SAMPLE_NODE_IDS = ["n001", "n002", "n003", "n004", "n005", "n006"]
+
+# Basic auth credentials of an admin user, for POST /api/nodes/bulk/
+ADMIN_AUTH = (os.environ.get("GRAPH_API_USER", ""), os.environ.get("GRAPH_API_PASSWORD", ""))
+
 def print_section(title: str):
     """Print a formatted section header"""
     print("\n" + "=" * 70)
@@ -23,6 +37,15 @@ def print_result(test_name: str, passed: bool, details: str = ""):
     if details:
         print(f"       {details}")
 
+def parse_time(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp as the API writes them"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def fetch_all_nodes():
+    """Get every node currently served, in node order"""
+    response = requests.get(f"{BASE_URL}/nodes/export/")
+    return [json.loads(line) for line in response.iter_lines() if line]
+
 def test_get_node_by_id():
     """Test: Get node by ID"""
     print_section("Test 1: Get Node by ID")
@@ -159,11 +182,13 @@ def test_get_all_nodes():
         passed = response.status_code == 200
         print_result("Status Code 200", passed)
         
-        passed = data.get("count") == 6
-        print_result("All 6 Nodes Retrieved", passed, f"Count: {data.get('count')}")
+        # The six sample nodes, plus any added by the bulk ingest test
+        node_ids = [node.get("node_id") for node in data.get("nodes", [])]
+        passed = data.get("count") >= 6 and node_ids[:6] == SAMPLE_NODE_IDS
+        print_result("All Nodes Retrieved", passed, f"Count: {data.get('count')}")
         
         if data.get("nodes"):
-            passed = len(data["nodes"]) == 6
+            passed = len(data["nodes"]) == data.get("count")
             print_result("Correct Node Array Length", passed, f"Length: {len(data['nodes'])}")
         
         return True
@@ -268,6 +293,764 @@ def test_response_structure():
         print_result("Test Execution", False, str(e))
         return False
 
+def test_cursor_pagination():
+    """Test: Cursor pagination over all nodes"""
+    print_section("Test 11: Cursor Pagination")
+    
+    try:
+        response = requests.get(f"{BASE_URL}/nodes/all/", params={"page_size": 4})
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        total = data.get("count", 0)
+        passed = len(data.get("nodes", [])) == 4 and total >= 6
+        print_result("First Page Size", passed, f"Length: {len(data.get('nodes', []))}")
+        
+        passed = data.get("next") is not None
+        print_result("Next Link Present", passed, f"Next: {data.get('next')}")
+        
+        node_ids = [node.get("node_id") for node in data.get("nodes", [])]
+        response = requests.get(data["next"])
+        data = response.json()
+        
+        if data.get("nodes"):
+            node_id = data["nodes"][0].get("node_id")
+            passed = node_id == "n005"
+            print_result("Continues After Cursor", passed, f"ID: {node_id}")
+        
+        # Other tests may have ingested nodes, so follow the links to the end
+        pages = 2
+        node_ids += [node.get("node_id") for node in data.get("nodes", [])]
+        while data.get("next") is not None and pages <= total:
+            data = requests.get(data["next"]).json()
+            node_ids += [node.get("node_id") for node in data.get("nodes", [])]
+            pages += 1
+        
+        passed = data.get("next") is None and 0 < len(data.get("nodes", [])) <= 4
+        print_result("Last Page", passed, f"Length: {len(data.get('nodes', []))}")
+        
+        passed = len(node_ids) == total and len(set(node_ids)) == total
+        print_result("Every Node Once", passed, f"Seen: {len(node_ids)} of {total}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_export_ndjson():
+    """Test: Streaming NDJSON export"""
+    print_section("Test 12: NDJSON Export")
+    
+    try:
+        response = requests.get(f"{BASE_URL}/nodes/export/", stream=True)
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        content_type = response.headers.get("Content-Type", "")
+        passed = content_type.startswith("application/x-ndjson")
+        print_result("NDJSON Content Type", passed, f"Type: {content_type}")
+        
+        nodes = [json.loads(line) for line in response.iter_lines() if line]
+        count = requests.get(f"{BASE_URL}/nodes/all/", params={"page_size": 1}).json().get("count")
+        node_ids = [node.get("node_id") for node in nodes]
+        passed = len(nodes) == count and node_ids[:6] == SAMPLE_NODE_IDS
+        print_result("All Nodes Streamed", passed, f"Count: {len(nodes)}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_batch_lookup():
+    """Test: Batch lookup of many node IDs"""
+    print_section("Test 13: Batch Node Lookup")
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/nodes/batch/",
+            json={"node_ids": ["n003", "n001", "n999"]}
+        )
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        node_ids = [node.get("node_id") for node in data.get("nodes", [])]
+        passed = node_ids == ["n003", "n001"]
+        print_result("Nodes In Request Order", passed, f"IDs: {node_ids}")
+        
+        passed = data.get("missing") == ["n999"]
+        print_result("Missing IDs Reported", passed, f"Missing: {data.get('missing')}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_multi_criteria():
+    """Test: Several criteria combined in one query"""
+    print_section("Test 14: Multiple Criteria")
+    
+    try:
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"label": "Person", "city": "Boston", "explain": 1}
+        )
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        node_ids = [node.get("node_id") for node in data.get("nodes", [])]
+        passed = node_ids == ["n004"]
+        print_result("Intersection Correct", passed, f"IDs: {node_ids}")
+        
+        plan = data.get("explain", {}).get("plan", [])
+        passed = bool(plan) and plan[0].get("field") == "city"
+        print_result("Most Selective Index First", passed, f"Plan: {plan}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_range_criteria():
+    """Test: Typed range criteria on numeric and timestamp fields"""
+    print_section("Test 15: Range Criteria")
+    
+    try:
+        response = requests.get(f"{BASE_URL}/nodes/", params={"age__between": "30,40"})
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        ages = sorted(node["properties"].get("age") for node in data.get("nodes", []))
+        passed = ages == [31, 35]
+        print_result("Ages Within Range", passed, f"Ages: {ages}")
+        
+        # Bounded above, since nodes ingested by other tests are stamped now
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"updated_at__between": "2024-10-28T00:00:00Z,2024-10-31T00:00:00Z"}
+        )
+        data = response.json()
+        passed = data.get("count") == 3
+        print_result("Recently Updated Nodes", passed, f"Count: {data.get('count')}")
+        
+        response = requests.get(f"{BASE_URL}/nodes/", params={"age__gt": "old"})
+        passed = response.status_code == 400
+        print_result("Invalid Number Rejected", passed, f"Code: {response.status_code}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_partial_match():
+    """Test: Prefix and substring matching on text fields"""
+    print_section("Test 16: Partial Matches")
+    
+    try:
+        response = requests.get(f"{BASE_URL}/nodes/", params={"name__startswith": "ali"})
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        names = [node["properties"].get("name") for node in data.get("nodes", [])]
+        passed = names == ["Alice Johnson", "Alice Cooper"]
+        print_result("Prefix Matches", passed, f"Names: {names}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"by": "email", "value": "EXAMPLE.com", "match": "contains"}
+        )
+        data = response.json()
+        passed = data.get("count") == 4
+        print_result("Substring Matches", passed, f"Count: {data.get('count')}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_node_relationships():
+    """Test: Relationships of a node"""
+    print_section("Test 17: Node Relationships")
+    
+    try:
+        response = requests.get(f"{BASE_URL}/nodes/n003/relationships/")
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        passed = data.get("count") == len(data.get("relationships", [])) > 0
+        print_result("Relationships Returned", passed, f"Count: {data.get('count')}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/n003/relationships/",
+            params={"direction": "OUTGOING", "type": "MANAGES"}
+        )
+        data = response.json()
+        targets = sorted(rel.get("target_node_id") for rel in data.get("relationships", []))
+        passed = targets == ["n001", "n002"]
+        print_result("Direction And Type Filters", passed, f"Targets: {targets}")
+        
+        response = requests.get(f"{BASE_URL}/nodes/n999/relationships/")
+        passed = response.status_code == 404
+        print_result("Unknown Node 404", passed, f"Code: {response.status_code}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_traversal():
+    """Test: K-hop neighborhood and shortest path"""
+    print_section("Test 18: Graph Traversal")
+    
+    try:
+        response = requests.get(f"{BASE_URL}/nodes/n004/neighborhood/", params={"depth": 1})
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        neighbors = sorted(item["node"]["node_id"] for item in data.get("results", []))
+        passed = neighbors == ["n001", "n006"]
+        print_result("One-Hop Neighbors", passed, f"IDs: {neighbors}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/n004/shortest-path/",
+            params={"target": "n005"}
+        )
+        data = response.json()
+        passed = response.status_code == 200 and data.get("length") == 2
+        print_result("Shortest Path Found", passed, f"Path: {data.get('nodes')}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/n005/shortest-path/",
+            params={"target": "n004", "direction": "OUTGOING"}
+        )
+        passed = response.status_code == 404
+        print_result("No Directed Path 404", passed, f"Code: {response.status_code}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_conditional_get():
+    """Test: ETag and conditional GET"""
+    print_section("Test 19: Conditional GET")
+    
+    try:
+        response = requests.get(f"{BASE_URL}/nodes/n001/")
+        etag = response.headers.get("ETag")
+        
+        passed = response.status_code == 200 and bool(etag)
+        print_result("ETag Returned", passed, f"ETag: {etag}")
+        
+        passed = "Last-Modified" in response.headers
+        print_result("Last-Modified Returned", passed, response.headers.get("Last-Modified", ""))
+        
+        response = requests.get(f"{BASE_URL}/nodes/n001/", headers={"If-None-Match": etag})
+        passed = response.status_code == 304 and not response.content
+        print_result("304 Not Modified", passed, f"Code: {response.status_code}")
+        
+        response = requests.get(f"{BASE_URL}/nodes/all/")
+        response = requests.get(
+            f"{BASE_URL}/nodes/all/",
+            headers={"If-None-Match": response.headers.get("ETag", "")}
+        )
+        passed = response.status_code == 304
+        print_result("List 304 Not Modified", passed, f"Code: {response.status_code}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_sparse_fieldsets():
+    """Test: Returning only requested fields and properties"""
+    print_section("Test 20: Sparse Fieldsets")
+    
+    try:
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"label": "Person", "fields": "labels", "properties": "name"}
+        )
+        nodes = response.json().get("nodes", [])
+        passed = response.status_code == 200 and bool(nodes) and all(
+            set(node) == {"node_id", "labels", "properties"}
+            and set(node["properties"]) <= {"name"}
+            for node in nodes
+        )
+        print_result("Projected Query", passed, f"First node: {nodes[0] if nodes else None}")
+        
+        response = requests.get(f"{BASE_URL}/nodes/n001/", params={"fields": "degree"})
+        data = response.json()
+        passed = response.status_code == 200 and set(data) == {"node_id", "degree"}
+        print_result("Projected Node", passed, f"Keys: {sorted(data)}")
+        
+        response = requests.get(f"{BASE_URL}/nodes/all/", params={"fields": "bogus"})
+        passed = response.status_code == 400
+        print_result("Unknown Field Rejected", passed, f"Code: {response.status_code}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_binary_formats():
+    """Test: MessagePack and Arrow IPC list responses"""
+    print_section("Test 21: Binary Formats")
+    
+    try:
+        response = requests.get(
+            f"{BASE_URL}/nodes/all/", headers={"Accept": "application/msgpack"}
+        )
+        passed = (response.status_code == 200
+                  and response.headers.get("Content-Type") == "application/msgpack")
+        print_result("MessagePack", passed, f"Code: {response.status_code}, {len(response.content)} bytes")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"label": "Person"},
+            headers={"Accept": "application/vnd.apache.arrow.stream"}
+        )
+        passed = response.status_code == 200
+        try:
+            import pyarrow
+            table = pyarrow.ipc.open_stream(response.content).read_all()
+            passed = passed and table.num_rows == 5
+            details = f"Columns: {table.column_names}"
+        except ImportError:
+            details = f"{len(response.content)} bytes (pyarrow not installed locally)"
+        print_result("Arrow IPC Stream", passed, details)
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_concurrent_requests():
+    """Test: Many requests in flight at once"""
+    print_section("Test 22: Concurrent Requests")
+    
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        urls = [f"{BASE_URL}/nodes/?label=Person", f"{BASE_URL}/nodes/n001/",
+                f"{BASE_URL}/nodes/all/"] * 20
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            codes = list(pool.map(lambda url: requests.get(url).status_code, urls))
+        
+        passed = all(code == 200 for code in codes)
+        print_result("All Requests Succeeded", passed, f"{codes.count(200)}/{len(codes)} returned 200")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_bulk_ingest():
+    """Test: NDJSON bulk ingest of new and updated nodes"""
+    print_section("Test 23: Bulk Ingest")
+    
+    try:
+        # A node of its own, named uniquely per run, so the sample nodes
+        # other tests rely on are never changed and the suite can be rerun
+        suffix = uuid.uuid4().hex[:8]
+        node = {
+            "node_id": f"bulk-{suffix}",
+            "labels": ["Imported"],
+            "properties": {"name": f"Imported {suffix}", "city": f"Bulkton {suffix}"},
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+            "relationship_count": 0,
+            "degree": {"incoming": 0, "outgoing": 0, "total": 0}
+        }
+        changed = dict(node, properties=dict(node["properties"], status="imported"))
+        body = "\n".join([
+            json.dumps(node),
+            json.dumps(changed),
+            json.dumps({"node_id": f"bulk-{suffix}-invalid"}),
+        ])
+        
+        response = requests.post(
+            f"{BASE_URL}/nodes/bulk/?batch_size=1",
+            data=body,
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        passed = response.status_code in (401, 403)
+        print_result("Anonymous Upload Rejected", passed, f"Status: {response.status_code}")
+        
+        if not all(ADMIN_AUTH):
+            print_result("Admin Credentials Set", False,
+                         "Set GRAPH_API_USER and GRAPH_API_PASSWORD to an admin user")
+            return True
+        
+        response = requests.post(
+            f"{BASE_URL}/nodes/bulk/?batch_size=1",
+            data=body,
+            headers={"Content-Type": "application/x-ndjson"},
+            auth=ADMIN_AUTH
+        )
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        passed = data.get("created") == 1 and data.get("updated") == 1
+        print_result("Created And Updated", passed,
+                     f"Created: {data.get('created')}, updated: {data.get('updated')}")
+        
+        errors = data.get("errors", [])
+        passed = data.get("failed") == 1 and errors and errors[0].get("line") == 3
+        print_result("Invalid Line Reported", passed, f"Errors: {errors}")
+        
+        response = requests.get(f"{BASE_URL}/nodes/", params={"city": f"Bulkton {suffix}"})
+        nodes = response.json().get("nodes", [])
+        node_ids = [n.get("node_id") for n in nodes]
+        passed = node_ids == [node["node_id"]] and nodes[0]["properties"].get("status") == "imported"
+        print_result("Ingested Nodes Queryable", passed, f"IDs: {node_ids}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_updated_since():
+    """Test: Changed-since polling with a high water mark"""
+    print_section("Test 24: Updated Since")
+    
+    try:
+        since = "2024-10-28T00:00:00Z"
+        response = requests.get(f"{BASE_URL}/nodes/all/", params={"updated_since": since})
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        # Nodes ingested by other tests count as changed, so expect what is served now
+        changed = [
+            node for node in fetch_all_nodes()
+            if parse_time(node["updated_at"]) > parse_time(since)
+        ]
+        expected = sorted(node["node_id"] for node in changed)
+        node_ids = sorted(node.get("node_id") for node in data.get("nodes", []))
+        passed = node_ids == expected and {"n002", "n003", "n005"} <= set(node_ids)
+        print_result("Only Changed Nodes", passed, f"IDs: {node_ids}")
+        
+        high_water_mark = data.get("high_water_mark")
+        latest = max(changed, key=lambda node: parse_time(node["updated_at"]))
+        passed = high_water_mark == latest["updated_at"]
+        print_result("High Water Mark", passed, f"Mark: {high_water_mark}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/all/",
+            params={"updated_since": high_water_mark}
+        )
+        data = response.json()
+        passed = data.get("count") == 0 and data.get("high_water_mark") == high_water_mark
+        print_result("No Changes After Mark", passed, f"Count: {data.get('count')}")
+        
+        if not all(ADMIN_AUTH):
+            print_result("Admin Credentials Set", False,
+                         "Set GRAPH_API_USER and GRAPH_API_PASSWORD to an admin user")
+            return True
+        
+        # A write shows up after the mark even when it claims an older updated_at
+        suffix = uuid.uuid4().hex[:8]
+        node = {
+            "node_id": f"delta-{suffix}",
+            "labels": ["Imported"],
+            "properties": {"name": f"Imported {suffix}", "city": f"Bulkton {suffix}"},
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+            "relationship_count": 0,
+            "degree": {"incoming": 0, "outgoing": 0, "total": 0}
+        }
+        requests.post(
+            f"{BASE_URL}/nodes/bulk/",
+            data=json.dumps(node),
+            headers={"Content-Type": "application/x-ndjson"},
+            auth=ADMIN_AUTH
+        )
+        response = requests.get(
+            f"{BASE_URL}/nodes/all/",
+            params={"updated_since": high_water_mark}
+        )
+        data = response.json()
+        node_ids = [n.get("node_id") for n in data.get("nodes", [])]
+        passed = node_ids == [node["node_id"]] and data.get("high_water_mark") > high_water_mark
+        print_result("Ingested Node Reported", passed, f"IDs: {node_ids}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_label_expressions():
+    """Test: Boolean label expressions"""
+    print_section("Test 25: Label Expressions")
+    
+    try:
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"labels": "Person AND NOT Admin"}
+        )
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        # Other tests may have ingested nodes, so expect what is served now
+        nodes = fetch_all_nodes()
+        expected = sorted(
+            node["node_id"] for node in nodes
+            if "Person" in node["labels"] and "Admin" not in node["labels"]
+        )
+        node_ids = sorted(node.get("node_id") for node in data.get("nodes", []))
+        passed = node_ids == expected and {"n001", "n002", "n004", "n006"} <= set(node_ids)
+        print_result("Person AND NOT Admin", passed, f"IDs: {node_ids}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"labels": "(User OR Admin) AND Person"}
+        )
+        expected = sorted(
+            node["node_id"] for node in nodes
+            if "Person" in node["labels"] and {"User", "Admin"} & set(node["labels"])
+        )
+        node_ids = sorted(node.get("node_id") for node in response.json().get("nodes", []))
+        passed = node_ids == expected and {"n001", "n002", "n003", "n004", "n006"} <= set(node_ids)
+        print_result("Parenthesized OR", passed, f"IDs: {node_ids}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"labels": "Person AND"}
+        )
+        passed = response.status_code == 400
+        print_result("Malformed Expression Rejected", passed, f"Status: {response.status_code}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"labels": "(" * 3000 + "Person" + ")" * 3000}
+        )
+        passed = response.status_code == 400
+        print_result("Deep Nesting Rejected", passed, f"Status: {response.status_code}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_query_cache():
+    """Test: Query result cache hits and normalization"""
+    print_section("Test 26: Query Cache")
+    
+    try:
+        response = requests.get(f"{BASE_URL}/nodes/cache/")
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        before = response.json()
+        requests.get(f"{BASE_URL}/nodes/", params={"status": "active"})
+        requests.get(f"{BASE_URL}/nodes/", params={"status": "ACTIVE"})
+        after = requests.get(f"{BASE_URL}/nodes/cache/").json()
+        
+        passed = after.get("hits", 0) >= before.get("hits", 0) + 1
+        print_result("Repeated Query Hits Cache", passed,
+                     f"Hits: {before.get('hits')} -> {after.get('hits')}")
+        
+        passed = all(key in after for key in ("misses", "hit_rate", "size", "max_size"))
+        print_result("Counters Reported", passed)
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_request_coalescing():
+    """Test: Concurrent identical queries after a data change"""
+    print_section("Test 27: Request Coalescing")
+    
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if not all(ADMIN_AUTH):
+            print_result("Admin Credentials Set", False,
+                         "Set GRAPH_API_USER and GRAPH_API_PASSWORD to an admin user")
+            return True
+        
+        # Bump the dataset version with a node of this test's own, so every
+        # request below misses the cache at the same time
+        suffix = uuid.uuid4().hex[:8]
+        node = {
+            "node_id": f"coalesce-{suffix}",
+            "labels": ["Imported"],
+            "properties": {"name": f"Imported {suffix}", "city": f"Bulkton {suffix}"},
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+            "relationship_count": 0,
+            "degree": {"incoming": 0, "outgoing": 0, "total": 0}
+        }
+        response = requests.post(
+            f"{BASE_URL}/nodes/bulk/",
+            data=json.dumps(node),
+            headers={"Content-Type": "application/x-ndjson"},
+            auth=ADMIN_AUTH
+        )
+        passed = response.status_code == 200
+        print_result("Dataset Version Bumped", passed, f"Version: {response.json().get('version')}")
+        
+        before = requests.get(f"{BASE_URL}/nodes/cache/").json()
+        
+        # Only sample nodes match, whatever other tests have ingested
+        def fetch(_):
+            response = requests.get(f"{BASE_URL}/nodes/", params={"label": "Person", "status": "active"})
+            return response.status_code, sorted(
+                node.get("node_id") for node in response.json().get("nodes", [])
+            )
+        
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(fetch, range(16)))
+        
+        passed = all(result == results[0] for result in results) and \
+            results[0] == (200, ["n001", "n002", "n003", "n006"])
+        print_result("Identical Results", passed, f"Result: {results[0]}")
+        
+        # A query over six nodes finishes in microseconds, so whether any of
+        # these requests overlapped is down to timing; tests.py checks that
+        # overlapping ones are coalesced
+        after = requests.get(f"{BASE_URL}/nodes/cache/").json()
+        misses = after.get("misses", 0) - before.get("misses", 0)
+        coalesced = after.get("coalesced", 0) - before.get("coalesced", 0)
+        passed = misses >= 1 and 0 <= coalesced < misses
+        print_result("Counters Consistent", passed,
+                     f"Misses: {misses}, coalesced: {coalesced}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_search():
+    """Test: Ranked full-text search"""
+    print_section("Test 28: Full-Text Search")
+    
+    try:
+        response = requests.get(f"{BASE_URL}/nodes/search/", params={"q": "alice"})
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        results = data.get("results", [])
+        passed = bool(results) and results[0].get("node", {}).get("node_id") == "n001"
+        print_result("Best Match First", passed,
+                     f"Top: {results[0].get('node', {}).get('node_id') if results else None}")
+        
+        response = requests.get(f"{BASE_URL}/nodes/search/", params={"q": "example", "limit": 2})
+        scores = [result.get("score") for result in response.json().get("results", [])]
+        passed = len(scores) == 2 and scores == sorted(scores, reverse=True)
+        print_result("Limit And Ranking", passed, f"Scores: {scores}")
+        
+        response = requests.get(f"{BASE_URL}/nodes/search/")
+        passed = response.status_code == 400
+        print_result("Missing Query Rejected", passed, f"Status: {response.status_code}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_fuzzy_match():
+    """Test: Typo-tolerant name lookups"""
+    print_section("Test 29: Fuzzy Match")
+    
+    try:
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"by": "name", "value": "Alice Jonson", "match": "fuzzy"}
+        )
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        node_ids = [node.get("node_id") for node in data.get("nodes", [])]
+        passed = node_ids == ["n001"]
+        print_result("Typo Matched", passed, f"IDs: {node_ids}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/",
+            params={"name__fuzzy": "Alise Johnsen", "max_distance": 1}
+        )
+        passed = response.status_code == 404
+        print_result("Distance Bound Respected", passed, f"Status: {response.status_code}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
+def test_aggregate():
+    """Test: Group-by counts and numeric summaries"""
+    print_section("Test 30: Aggregate")
+    
+    try:
+        response = requests.get(
+            f"{BASE_URL}/nodes/aggregate/", params={"group_by": "city", "label": "Person"}
+        )
+        data = response.json()
+        
+        passed = response.status_code == 200
+        print_result("Status Code 200", passed)
+        
+        total = sum(group.get("count", 0) for group in data.get("groups", []))
+        passed = total == data.get("count")
+        print_result("Group Counts Add Up", passed, f"Total: {total}, Count: {data.get('count')}")
+        
+        response = requests.get(
+            f"{BASE_URL}/nodes/aggregate/",
+            params={"label": "Person", "field": "age", "bucket_size": 10}
+        )
+        data = response.json()
+        histogram = data.get("histogram", [])
+        passed = data.get("min") is not None and data.get("min") <= data.get("avg") <= data.get("max")
+        print_result("Min/Avg/Max", passed,
+                     f"Min: {data.get('min')}, Avg: {data.get('avg')}, Max: {data.get('max')}")
+        
+        passed = bool(histogram) and sum(bucket.get("count", 0) for bucket in histogram) <= data.get("count", 0)
+        print_result("Histogram", passed, f"Buckets: {len(histogram)}")
+        
+        response = requests.get(f"{BASE_URL}/nodes/aggregate/", params={"bucket_size": 10})
+        passed = response.status_code == 400
+        print_result("Histogram Needs Field", passed, f"Status: {response.status_code}")
+        
+        codes = [
+            requests.get(
+                f"{BASE_URL}/nodes/aggregate/",
+                params={"field": "age", "bucket_size": bucket_size}
+            ).status_code
+            for bucket_size in ("nan", "inf", "0.001")
+        ]
+        passed = codes == [400, 400, 400]
+        print_result("Bad Bucket Sizes Rejected", passed, f"Status: {codes}")
+        
+        return True
+    except Exception as e:
+        print_result("Test Execution", False, str(e))
+        return False
+
 def main():
     """Run all tests"""
     print("\n" + "=" * 70)
@@ -299,7 +1082,27 @@ def main():
         test_get_node_by_id_direct,
         test_invalid_field,
         test_node_not_found,
-        test_response_structure
+        test_response_structure,
+        test_cursor_pagination,
+        test_export_ndjson,
+        test_batch_lookup,
+        test_multi_criteria,
+        test_range_criteria,
+        test_partial_match,
+        test_node_relationships,
+        test_traversal,
+        test_conditional_get,
+        test_sparse_fieldsets,
+        test_binary_formats,
+        test_concurrent_requests,
+        test_bulk_ingest,
+        test_updated_since,
+        test_label_expressions,
+        test_query_cache,
+        test_request_coalescing,
+        test_search,
+        test_fuzzy_match,
+        test_aggregate
     ]
     
     passed_tests = 0
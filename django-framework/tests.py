@@ -0,0 +1,402 @@
+"""
+In-process tests for the parts of the graph_nodes app with no HTTP endpoint
+
+Run with `python manage.py test graph_nodes`; the HTTP API is tested by
+test_api.py against a running server.
+"""
+import asyncio
+import math
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.test import SimpleTestCase, override_settings
+from django.urls import path, resolve
+from rest_framework.renderers import JSONRenderer
+
+from . import encoding
+from .backends import BackendUnavailable, MappedBackend, NetworkBackend
+from .cache import EncodedCache, QueryCache
+from .graph_server import start_server
+from .indexes import NodeIndex
+from .nodestore import write_node_store
+from .planner import QueryPlanner
+from .renderers import FastJSONRenderer
+from .services import AsyncGraphDatabaseService, GraphDatabaseService, GraphNotLoaded
+from .snapshots import SnapshotError, load_snapshot
+from .views import AsyncGetAllNodesView, AsyncGetNodeByIdView, AsyncGetNodesView
+
+# The async list and lookup views, as routed with GRAPH_ASYNC_VIEWS on
+urlpatterns = [
+    path('api/nodes/', AsyncGetNodesView.as_view()),
+    path('api/nodes/all/', AsyncGetAllNodesView.as_view()),
+    path('api/nodes/<str:node_id>/', AsyncGetNodeByIdView.as_view()),
+]
+
+
+class NetworkBackendTests(SimpleTestCase):
+    """Pooled network backend against the stand-in graph server"""
+
+    def setUp(self):
+        self.server = start_server()
+        self.backend = NetworkBackend(port=self.server.server_address[1], pool_size=2,
+                                      batch_size=4, timeout=1.0, retries=1, backoff=0.01)
+        self.addCleanup(self.backend.close)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fetch_graph(self):
+        nodes = self.backend.fetch_nodes()
+        relationships = self.backend.fetch_relationships()
+        self.assertEqual(len(nodes), 6)
+        self.assertTrue(relationships)
+
+    def test_connection_reused(self):
+        self.backend.fetch_nodes()
+        self.backend.fetch_relationships()
+        self.assertEqual(self.backend.pool.size, 1)
+
+    def test_source_names_the_server(self):
+        other = NetworkBackend(port=self.server.server_address[1] + 1)
+        self.addCleanup(other.close)
+        self.assertNotEqual(other.source(), self.backend.source())
+
+    def test_server_down_reported(self):
+        self.server.shutdown()
+        self.server.server_close()
+        with self.assertRaises(BackendUnavailable):
+            self.backend.fetch_nodes()
+
+
+class GraphLoadingTests(SimpleTestCase):
+    """Loading the graph on first use while the backend is down"""
+
+    def setUp(self):
+        self.backend = mock.Mock()
+        self.backend.fetch_nodes.side_effect = BackendUnavailable("connection refused")
+        self.backend.source.return_value = "down"
+        for name, value in (("_backend", self.backend), ("_snapshot", None),
+                            ("_load_retry_at", 0.0), ("_load_backoff", 1.0)):
+            patcher = mock.patch.object(GraphDatabaseService, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_failed_load_backs_off(self):
+        with self.assertLogs("graph_nodes.services", "WARNING"), \
+                self.assertRaises(GraphNotLoaded):
+            GraphDatabaseService.get_snapshot()
+        # Retried only once the backoff has passed
+        with self.assertRaises(GraphNotLoaded):
+            GraphDatabaseService.get_snapshot()
+        self.assertEqual(self.backend.fetch_nodes.call_count, 1)
+
+    def test_request_answered_with_503(self):
+        with self.assertLogs("graph_nodes.services", "WARNING"):
+            response = self.client.get("/api/nodes/export/")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response)
+
+    def test_loaded_once_backend_recovers(self):
+        with self.assertLogs("graph_nodes.services", "WARNING"), \
+                self.assertRaises(GraphNotLoaded):
+            GraphDatabaseService.get_snapshot()
+        self.backend.fetch_nodes.side_effect = None
+        self.backend.fetch_nodes.return_value = GraphDatabaseService.DUMMY_NODES
+        self.backend.fetch_relationships.return_value = GraphDatabaseService.DUMMY_RELATIONSHIPS
+        GraphDatabaseService._load_retry_at = 0.0
+        self.assertIn("n001", GraphDatabaseService.get_snapshot().index.ids)
+
+
+class MappedStoreTests(SimpleTestCase):
+    """Memory-mapped node store written once and read lazily"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.nodes = GraphDatabaseService.DUMMY_NODES
+        self.relationships = GraphDatabaseService.DUMMY_RELATIONSHIPS
+        path = os.path.join(directory.name, "graph.nodes")
+        write_node_store(path, self.nodes, self.relationships)
+        self.backend = MappedBackend(path)
+        self.addCleanup(self.backend.close)
+
+    def test_nodes_decoded_on_access(self):
+        mapped = self.backend.fetch_nodes()
+        self.assertEqual(len(mapped), len(self.nodes))
+        self.assertEqual(mapped[2], self.nodes[2])
+
+    def test_round_trip(self):
+        self.assertEqual(list(self.backend.fetch_nodes()), self.nodes)
+        self.assertEqual(self.backend.fetch_relationships(), self.relationships)
+
+    def test_source_names_the_file(self):
+        path = os.path.join(os.path.dirname(self.backend.path), "other.nodes")
+        write_node_store(path, self.nodes[:2], [])
+        other = MappedBackend(path)
+        self.addCleanup(other.close)
+        self.assertIn(self.backend.path, self.backend.source())
+        self.assertNotEqual(other.source(), self.backend.source())
+
+
+class IndexSnapshotTests(SimpleTestCase):
+    """Saving the indexes and loading them back"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "graph.snapshot")
+        self.source = GraphDatabaseService._snapshot_source()
+        self.assertGreater(GraphDatabaseService.save_snapshot(self.path), 0)
+
+    def test_indexes_loaded(self):
+        snapshot = load_snapshot(self.path, self.source)
+        self.assertEqual(snapshot.index.ids, GraphDatabaseService.get_snapshot().index.ids)
+
+    def test_corruption_detected(self):
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.path, self.source)
+
+    def test_other_source_rejected(self):
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.path, "another.Backend")
+
+    def test_other_key_rejected(self):
+        # A file not written with this SECRET_KEY is never unpickled
+        with override_settings(SECRET_KEY="another key"), \
+                mock.patch("pickle.loads") as loads, self.assertRaises(SnapshotError):
+            load_snapshot(self.path, self.source)
+        loads.assert_not_called()
+
+
+class QueryCacheTests(SimpleTestCase):
+    """Query result cache across dataset generations"""
+
+    def test_newer_generation_empties_cache(self):
+        cache = QueryCache(max_size=100)
+        cache.put("key", 1, [1, 2])
+        self.assertIsNone(cache.get("key", 2))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_older_generation_is_ignored(self):
+        cache = QueryCache(max_size=100)
+        cache.put("key", 2, [1, 2])
+        # A reader still on generation 1 misses without evicting generation 2
+        self.assertIsNone(cache.get("key", 1))
+        cache.put("key", 1, [3])
+        self.assertEqual(cache.get("key", 2), ([1, 2], None))
+        self.assertEqual(cache.stats()["generation"], 2)
+
+
+class EncodedCacheTests(SimpleTestCase):
+    """Encoded node cache shared between index versions"""
+
+    def setUp(self):
+        self.index = NodeIndex([dict(node) for node in GraphDatabaseService.DUMMY_NODES])
+
+    def test_budget_evicts_least_recently_used(self):
+        cache = EncodedCache(max_bytes=1000)
+        for key in range(10):
+            cache.put(key, b"x" * 200, "etag")
+        self.assertLessEqual(cache.size, 1000)
+        self.assertIsNone(cache.get(0))
+        self.assertIsNotNone(cache.get(9))
+
+    def test_unchanged_nodes_stay_cached_after_apply(self):
+        first = self.index.encode(0)
+        changed = dict(self.index.nodes[1], updated_at="2099-01-01T00:00:00.000000Z")
+        index, _, replaced = self.index.apply([changed], version=1)
+        self.assertEqual(replaced, 1)
+        self.assertIs(index.encoded, self.index.encoded)
+        self.assertIs(index.encode(0)[0], first[0])
+        self.assertIn(b"2099-01-01", index.encode(1)[0])
+        self.assertNotIn(b"2099-01-01", self.index.encode(1)[0])
+
+    def test_replacement_without_newer_timestamp_starts_afresh(self):
+        self.index.encode(1)
+        changed = dict(self.index.nodes[1], properties={"name": "Renamed"})
+        index, _, _ = self.index.apply([changed], version=1)
+        self.assertIsNot(index.encoded, self.index.encoded)
+        self.assertIn(b"Renamed", index.encode(1)[0])
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """FastJSONRenderer renders what DRF's JSONRenderer does, with or without orjson"""
+
+    data = {
+        "name": "Zoë 東京",
+        "note": "line\u2028separator\u2029here",
+        "at": datetime(2024, 10, 20, 14, 22, tzinfo=timezone.utc),
+        "scores": [1, 2.5, None],
+    }
+
+    def render(self, renderer, data, media_type="application/json"):
+        return renderer.render(data, media_type, {})
+
+    def assert_same_as_drf(self, data, media_type="application/json"):
+        expected = self.render(JSONRenderer(), data, media_type)
+        self.assertEqual(self.render(FastJSONRenderer(), data, media_type), expected)
+        with mock.patch.object(encoding, "orjson", None):
+            self.assertEqual(self.render(FastJSONRenderer(), data, media_type), expected)
+
+    def test_compact(self):
+        self.assert_same_as_drf({key: value for key, value in self.data.items() if key != "at"})
+
+    def test_datetimes(self):
+        self.assert_same_as_drf(self.data)
+
+    def test_indent(self):
+        self.assert_same_as_drf(self.data, "application/json; indent=4")
+
+    def test_non_finite_floats_rejected(self):
+        for value in (math.nan, math.inf, -math.inf):
+            data = {"nested": [{"value": value}], "missing": None}
+            with self.assertRaises(ValueError):
+                self.render(JSONRenderer(), data)
+            with self.assertRaises(ValueError):
+                self.render(FastJSONRenderer(), data)
+            with mock.patch.object(encoding, "orjson", None), self.assertRaises(ValueError):
+                self.render(FastJSONRenderer(), data)
+
+    def test_loads_rejects_nan_without_orjson(self):
+        with mock.patch.object(encoding, "orjson", None), self.assertRaises(ValueError):
+            encoding.loads(b'{"value": NaN}')
+
+
+class ListETagTests(SimpleTestCase):
+    """List ETags depend on the data, not on how the query was answered"""
+
+    def test_explain_etag_ignores_query_cache_hits(self):
+        GraphDatabaseService.get_query_cache().clear()
+        url = "/api/nodes/?by=label&value=Person&explain=1"
+        first = self.client.get(url, HTTP_ACCEPT="application/json")
+        second = self.client.get(url, HTTP_ACCEPT="application/json")
+        self.assertFalse(first.json()["explain"]["cached"])
+        self.assertTrue(second.json()["explain"]["cached"])
+        self.assertEqual(first["ETag"], second["ETag"])
+        revalidated = self.client.get(url, HTTP_ACCEPT="application/json",
+                                      HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(revalidated.status_code, 304)
+
+
+class RequestCoalescingTests(SimpleTestCase):
+    """Concurrent identical cache misses run the query once"""
+
+    def test_overlapping_misses_share_one_execution(self):
+        service = GraphDatabaseService
+        index = service.get_snapshot().index
+        predicates = [("city", "eq", "Chicago")]
+        service.get_query_cache().clear()
+
+        started, release = threading.Event(), threading.Event()
+        executions = []
+        execute = QueryPlanner.execute
+
+        def blocking_execute(planner, predicates):
+            executions.append(predicates)
+            started.set()
+            release.wait(5)
+            return execute(planner, predicates)
+
+        before = service.get_query_cache_stats()["coalesced"]
+        with mock.patch.object(QueryPlanner, "execute", blocking_execute), \
+                ThreadPoolExecutor(max_workers=4) as pool:
+            calls = [pool.submit(service._execute, index, predicates)]
+            self.assertTrue(started.wait(5))
+            calls += [pool.submit(service._execute, index, predicates) for _ in range(3)]
+            # Hold the first execution until the other three are waiting on it
+            deadline = time.monotonic() + 5
+            while service.get_query_cache_stats()["coalesced"] < before + 3 \
+                    and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+            results = [call.result()[0] for call in calls]
+
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(service.get_query_cache_stats()["coalesced"], before + 3)
+        self.assertEqual(results, [[index.ids["n003"]]] * 4)
+
+
+class AsyncServiceTests(SimpleTestCase):
+    """Async reads run off the event loop"""
+
+    def test_reads_run_in_worker_thread(self):
+        threads = []
+        get_node_by_id = GraphDatabaseService.get_node_by_id
+
+        def recording(node_id, projection=None):
+            threads.append(threading.get_ident())
+            return get_node_by_id(node_id, projection)
+
+        async def read():
+            return threading.get_ident(), await AsyncGraphDatabaseService.get_node_by_id("n001")
+
+        with mock.patch.object(GraphDatabaseService, "get_node_by_id", recording):
+            loop_thread, node = asyncio.run(read())
+        self.assertEqual(node["node_id"], "n001")
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTests(SimpleTestCase):
+    """Async list and lookup views end to end, through AsyncClient"""
+
+    def test_routed_views_are_async(self):
+        for url in ("/api/nodes/", "/api/nodes/all/", "/api/nodes/n001/"):
+            self.assertTrue(iscoroutinefunction(resolve(url).func))
+
+    async def test_get_nodes(self):
+        response = await self.async_client.get("/api/nodes/", {"by": "label", "value": "Person"},
+                                               headers={"Accept": "application/json"})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["count"], len(body["nodes"]))
+        self.assertIn("n001", [node["node_id"] for node in body["nodes"]])
+        self.assertTrue(all("Person" in node["labels"] for node in body["nodes"]))
+
+    async def test_get_nodes_invalid(self):
+        response = await self.async_client.get("/api/nodes/", {"by": "no such field"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.json())
+
+    async def test_get_all_nodes(self):
+        response = await self.async_client.get("/api/nodes/all/", {"page_size": 2},
+                                               headers={"Accept": "application/json"})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["count"], len(GraphDatabaseService.get_all_nodes()))
+        self.assertEqual(len(body["nodes"]), 2)
+        self.assertIsNotNone(body["next"])
+
+    async def test_get_node_by_id(self):
+        response = await self.async_client.get("/api/nodes/n001/",
+                                               headers={"Accept": "application/json"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["node_id"], "n001")
+        revalidated = await self.async_client.get("/api/nodes/n001/", headers={
+            "Accept": "application/json", "If-None-Match": response["ETag"],
+        })
+        self.assertEqual(revalidated.status_code, 304)
+
+    async def test_get_node_by_id_projected(self):
+        response = await self.async_client.get("/api/nodes/n001/", {"properties": "name"},
+                                               headers={"Accept": "application/json"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()["properties"]), ["name"])
+
+    async def test_get_node_by_id_missing(self):
+        response = await self.async_client.get("/api/nodes/n999/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"error": "Node with ID 'n999' not found"})
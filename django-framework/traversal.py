@@ -0,0 +1,175 @@
+"""
+Graph traversal over CSR relationship storage
+Bounded k-hop expansion and bidirectional shortest-path search
+"""
+from typing import List, Dict, Optional, Tuple
+
+from .adjacency import BOTH, INCOMING, OUTGOING, RelationshipStore
+
+
+REVERSE_DIRECTION = {OUTGOING: INCOMING, INCOMING: OUTGOING, BOTH: BOTH}
+
+
+class Bitset:
+    """
+    Fixed-size set of node ordinals, one bit per node
+
+    A visited set over a million nodes costs 125 KB, however large the
+    frontier grows.
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, size: int):
+        self.bits = bytearray((size + 7) >> 3)
+
+    def __contains__(self, ordinal: int) -> bool:
+        return bool(self.bits[ordinal >> 3] & (1 << (ordinal & 7)))
+
+    def add(self, ordinal: int) -> bool:
+        """Add an ordinal, returning False if it was already present"""
+        byte, mask = ordinal >> 3, 1 << (ordinal & 7)
+        if self.bits[byte] & mask:
+            return False
+        self.bits[byte] |= mask
+        return True
+
+
+class TraversalEngine:
+    """
+    Breadth-first traversals bounded by depth, fan-out and result count
+    """
+
+    def __init__(self, store: RelationshipStore, node_count: int):
+        self.store = store
+        self.node_count = node_count
+
+    def neighborhood(self, start: int, max_depth: int, direction: str = BOTH,
+                     types: Optional[List[str]] = None, max_fanout: Optional[int] = None,
+                     limit: Optional[int] = None) -> Tuple[List[Tuple[int, int]], bool]:
+        """
+        Find every node within max_depth hops of a start node
+
+        Args:
+            start: Ordinal of the start node (not included in the result)
+            max_depth: Maximum number of hops
+            direction: OUTGOING, INCOMING or BOTH
+            types: Relationship types to follow, or None for all
+            max_fanout: Maximum edges followed out of any single node
+            limit: Maximum number of nodes to return
+
+        Returns:
+            Tuple of ((ordinal, distance) in BFS order, whether a limit cut the search short)
+        """
+        visited = Bitset(self.node_count)
+        visited.add(start)
+        frontier = [start]
+        found = []
+        truncated = False
+
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for ordinal in frontier:
+                followed = 0
+                for neighbor, _, _ in self.store.expand(ordinal, direction, types):
+                    if max_fanout is not None and followed >= max_fanout:
+                        truncated = True
+                        break
+                    followed += 1
+                    if not visited.add(neighbor):
+                        continue
+                    found.append((neighbor, depth))
+                    if limit is not None and len(found) >= limit:
+                        return found, True
+                    next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return found, truncated
+
+    def shortest_path(self, source: int, target: int, max_depth: int,
+                      direction: str = BOTH,
+                      types: Optional[List[str]] = None) -> Optional[List[Tuple[int, int, str]]]:
+        """
+        Find a shortest path with a BFS from both ends
+
+        The smaller frontier is expanded one full level at a time, so the
+        search touches roughly the square root of the nodes a one-sided
+        BFS would.
+
+        Args:
+            source: Ordinal of the start node
+            target: Ordinal of the end node
+            max_depth: Maximum path length in hops
+            direction: OUTGOING follows edges forward from source,
+                INCOMING backward, BOTH ignores edge direction
+            types: Relationship types to follow, or None for all
+
+        Returns:
+            List of (node ordinal, edge ordinal, edge direction) hops from
+            source to target, where the first entry has edge -1, or None if
+            no path exists within max_depth
+        """
+        if source == target:
+            return [(source, -1, direction)]
+
+        # ordinal -> (parent ordinal, edge ordinal, edge direction, depth)
+        parents: List[Dict[int, Tuple[int, int, str, int]]] = [
+            {source: (-1, -1, direction, 0)},
+            {target: (-1, -1, direction, 0)},
+        ]
+        visited = [Bitset(self.node_count), Bitset(self.node_count)]
+        visited[0].add(source)
+        visited[1].add(target)
+        frontiers = [[source], [target]]
+        directions = [direction, REVERSE_DIRECTION[direction]]
+        depths = [0, 0]
+
+        while frontiers[0] and frontiers[1] and depths[0] + depths[1] < max_depth:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            other = 1 - side
+            depths[side] += 1
+            best = None
+            next_frontier = []
+
+            for ordinal in frontiers[side]:
+                for neighbor, edge, edge_direction in self.store.expand(
+                        ordinal, directions[side], types):
+                    if not visited[side].add(neighbor):
+                        continue
+                    parents[side][neighbor] = (ordinal, edge, edge_direction, depths[side])
+                    next_frontier.append(neighbor)
+                    if neighbor in visited[other]:
+                        length = depths[side] + parents[other][neighbor][3]
+                        if length <= max_depth and (best is None or length < best[0]):
+                            best = (length, neighbor)
+
+            if best is not None:
+                return self._join(parents, best[1])
+            frontiers[side] = next_frontier
+
+        return None
+
+    @staticmethod
+    def _join(parents: List[Dict[int, Tuple[int, int, str, int]]],
+              meeting: int) -> List[Tuple[int, int, str]]:
+        """Stitch the two half-paths together at the meeting node"""
+        forward = []
+        ordinal = meeting
+        while ordinal != -1:
+            parent, edge, edge_direction, _ = parents[0][ordinal]
+            forward.append((ordinal, edge, edge_direction))
+            ordinal = parent
+        forward.reverse()
+
+        # The backward half was expanded in reverse, so each hop flips
+        path = forward
+        ordinal = meeting
+        while True:
+            parent, edge, edge_direction, _ = parents[1][ordinal]
+            if parent == -1:
+                break
+            path.append((parent, edge, REVERSE_DIRECTION[edge_direction]))
+            ordinal = parent
+        return path
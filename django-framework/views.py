@@ -1,80 +1,1133 @@
 """
 Views for Graph Node API
 """
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from .aggregates import HistogramError
+from .encoding import dumps, encode_envelope, etag_for, loads
+from .pagination import get_next_link
+from .parsers import NDJSONParser
+from .permissions import CanWriteGraph
+from .renderers import BINARY_RENDERER_CLASSES, ArrowStreamRenderer
 from .serializers import (
+    AggregateQuerySerializer,
+    AggregateResponseSerializer,
+    BulkIngestQuerySerializer,
+    NodeBatchSerializer,
+    NodeBatchResponseSerializer,
     NodeQuerySerializer,
     NodeDetailSerializer,
-    NodeListResponseSerializer
+    NodeListQuerySerializer,
+    NodeListResponseSerializer,
+    NodeProjectionSerializer,
+    NodeRelationshipListResponseSerializer,
+    NeighborhoodQuerySerializer,
+    NeighborhoodResponseSerializer,
+    RelationshipQuerySerializer,
+    SearchQuerySerializer,
+    SearchResponseSerializer,
+    ShortestPathQuerySerializer,
+    ShortestPathResponseSerializer,
+    validate_node
+)
+from .services import AsyncGraphDatabaseService, GraphDatabaseService
+
+
+PAGINATION_PARAMETERS = [
+    openapi.Parameter(
+        'cursor',
+        openapi.IN_QUERY,
+        description="Opaque cursor taken from the 'next' link of the previous page",
+        type=openapi.TYPE_STRING,
+        required=False
+    ),
+    openapi.Parameter(
+        'page_size',
+        openapi.IN_QUERY,
+        description="Number of nodes per page (default 100, max 1000)",
+        type=openapi.TYPE_INTEGER,
+        required=False
+    ),
+]
+
+UPDATED_SINCE_PARAMETERS = [
+    openapi.Parameter(
+        'updated_since',
+        openapi.IN_QUERY,
+        description="Only return nodes updated strictly after this ISO 8601 timestamp; "
+                    "pass the high_water_mark of the previous poll",
+        type=openapi.TYPE_STRING,
+        required=False
+    ),
+]
+
+PROJECTION_PARAMETERS = [
+    openapi.Parameter(
+        'fields',
+        openapi.IN_QUERY,
+        description="Comma-separated node fields to return, e.g. 'labels,properties' "
+                    "(node_id is always included)",
+        type=openapi.TYPE_STRING,
+        required=False
+    ),
+    openapi.Parameter(
+        'properties',
+        openapi.IN_QUERY,
+        description="Comma-separated property names to return, e.g. 'name,email'",
+        type=openapi.TYPE_STRING,
+        required=False
+    ),
+]
+
+# List endpoints can also answer in the compact binary formats
+LIST_RENDERER_CLASSES = api_settings.DEFAULT_RENDERER_CLASSES + BINARY_RENDERER_CLASSES
+
+
+def wants_json(request):
+    """Whether content negotiation picked plain JSON for this request"""
+    return request.accepted_renderer.format == 'json'
+
+
+def wants_columns(request):
+    """Whether content negotiation picked a columnar format for this request"""
+    return request.accepted_renderer.format == ArrowStreamRenderer.format
+
+
+def conditional_json_response(request, etag, render, last_modified=None):
+    """
+    Send pre-encoded JSON, or 304 Not Modified if the client's copy is current
+    
+    Args:
+        request: The incoming request
+        etag: Quoted ETag of the representation
+        render: Callable returning the body; only called when it must be sent
+        last_modified: Modification time as epoch seconds, if known
+    """
+    response = HttpResponse(content_type='application/json')
+    response['ETag'] = etag
+    if last_modified is not None:
+        last_modified = int(last_modified)
+        response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ['Accept'])
+    
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=response
+    )
+    if conditional is response:
+        response.content = render()
+    return conditional
+
+
+def get_high_water_mark(data, page):
+    """
+    Get the high water mark to report for a changed-since poll, or None
+    
+    Later pages keep the one their first page reported (carried in the
+    'next' link) rather than a newer one, so nothing updated while the
+    client was paging is skipped by its next poll.
+    """
+    if page.high_water_mark is None:
+        return None
+    return data.get('high_water_mark') or page.high_water_mark
+
+
+# Explain fields that differ between requests for the same data, e.g.
+# whether the query cache was hit; they are left out of list ETags
+VOLATILE_EXPLAIN_FIELDS = ("cached",)
+
+
+def encoded_list_response(request, envelope, page):
+    """
+    Send a list response built from cached node bytes, with an ETag
+    
+    The ETag is derived from the envelope and the per-node ETags, so a
+    304 is answered without assembling the body. Volatile explain fields
+    do not count, so the same data always gets the same ETag.
+    """
+    encoded = page.encoded
+    tagged = envelope
+    if "explain" in envelope:
+        tagged = dict(envelope, explain={
+            key: value for key, value in envelope["explain"].items()
+            if key not in VOLATILE_EXPLAIN_FIELDS
+        })
+    etag = etag_for(dumps(tagged), *(node_etag.encode() for _, node_etag in encoded))
+    return conditional_json_response(
+        request, etag, lambda: encode_envelope(envelope, (body for body, _ in encoded))
+    )
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose HTTP handlers are coroutines
+    
+    DRF dispatches synchronously, so this runs the same request handling
+    (authentication, content negotiation, exception handling) around an
+    awaited handler. Under ASGI a worker can then hold many requests in
+    flight at once. Under WSGI Django would run each request through
+    async_to_sync, on an event loop in another thread, which only adds
+    latency; the async views are therefore only routed when the
+    GRAPH_ASYNC_VIEWS setting is on.
+    """
+    
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Keep the coroutine marker through DRF's csrf_exempt wrapper
+        if cls.view_is_async and not iscoroutinefunction(view):
+            markcoroutinefunction(view)
+        return view
+    
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        `.dispatch()` for coroutine handlers
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        
+        try:
+            # Authentication may read the session store, which must not
+            # happen on the event loop
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            
+            # Get the appropriate handler method
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(),
+                                  self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            
+            response = handler(request, *args, **kwargs)
+            if iscoroutinefunction(handler):
+                response = await response
+        
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+GET_NODES_SCHEMA = swagger_auto_schema(
+    operation_description="""
+    Retrieve nodes from the graph database based on specified criteria.
+    
+    **Query Parameters:**
+    - `by`: The field to query by (e.g., 'node_id', 'name', 'label', 'email', 'city', 'status', 'age')
+    - `value`: The value to search for in the specified field
+    
+    **Examples:**
+    - Get node by ID: `?by=node_id&value=n001`
+    - Get nodes by name: `?by=name&value=Alice Johnson`
+    - Get nodes by label: `?by=label&value=Person`
+    - Get nodes by city: `?by=city&value=New York`
+    - Get nodes by status: `?by=status&value=active`
+    
+    **Multiple Criteria:**
+    Any supported field can also be passed directly as `field=value`.
+    All criteria must match; the most selective index is used first.
+    - People in Boston: `?label=Person&city=Boston`
+    - Active users: `?by=label&value=User&status=active`
+    - Show the query plan: `?label=Person&city=Boston&explain=1`
+    
+    **Range Criteria:**
+    `age`, `employees`, `created_at` and `updated_at` accept
+    `field__gt`, `field__gte`, `field__lt`, `field__lte` and
+    `field__between` (two comma-separated bounds, inclusive).
+    Timestamps are ISO 8601.
+    - Users aged 30-40: `?label=User&age__between=30,40`
+    - Updated since a date: `?updated_at__gte=2024-10-28T00:00:00Z`
+    
+    **Changes Since:**
+    `updated_since` returns only nodes updated strictly after the given
+    time, alongside any other criteria, and adds `high_water_mark` (the
+    latest `updated_at` among the matches) to the response. Poll again
+    with `updated_since` set to it to get only the next changes.
+    
+    **Partial Matches:**
+    `name`, `email`, `city` and `status` accept `field__startswith` and
+    `field__contains` (case-insensitive). With `by`/`value`, pass
+    `match=startswith` or `match=contains` instead.
+    - Autocomplete: `?name__startswith=ali`
+    - Email domain: `?by=email&value=example.com&match=contains`
+    
+    **Typo-Tolerant Matches:**
+    The same fields accept `field__fuzzy` (or `match=fuzzy`): values within
+    `max_distance` insertions, deletions or substitutions of the query,
+    ignoring case. Without `max_distance` it is 0 for queries up to 2
+    characters, 1 up to 5 and 2 beyond.
+    - `?by=name&value=Alice Jonson&match=fuzzy`
+    - `?city__fuzzy=Bostn&max_distance=1`
+    
+    **Label Expressions:**
+    `labels` takes a boolean expression over labels with `AND`, `OR`,
+    `NOT` and parentheses, answered with bitmap operations per label.
+    Quote labels containing spaces or named like a keyword.
+    - People who are not admins: `?labels=Person AND NOT Admin`
+    - `?labels=(User OR Admin) AND Person`
+    
+    **Pagination:**
+    Results are returned in pages of `page_size` nodes. Follow the `next`
+    link (or pass its `cursor`) to fetch the following page.
+    
+    **Sparse Fieldsets:**
+    `fields` keeps only the listed node fields and `properties` only the
+    listed properties; everything else is left out of the response.
+    - Names only: `?label=Person&fields=properties&properties=name`
+    
+    **Binary Formats:**
+    Send `Accept: application/msgpack` (or `?format=msgpack`) for
+    MessagePack, or `Accept: application/vnd.apache.arrow.stream`
+    (`?format=arrow`) for a columnar Arrow IPC stream. Both need their
+    optional package (msgpack, pyarrow) installed on the server.
+    
+    **Supported 'by' fields:**
+    - `node_id`: Unique node identifier
+    - `name`: Node name property
+    - `label` or `type`: Node label/type
+    - `labels`: Boolean label expression
+    - `email`: Email property
+    - `age`: Age property
+    - `city`: City property
+    - `status`: Status property
+    """,
+    manual_parameters=[
+        openapi.Parameter(
+            'by',
+            openapi.IN_QUERY,
+            description="Field to query by (node_id, name, label, labels, type, email, age, city, status)",
+            type=openapi.TYPE_STRING,
+            required=False,
+            enum=['node_id', 'name', 'label', 'labels', 'type', 'email', 'age', 'city', 'status']
+        ),
+        openapi.Parameter(
+            'value',
+            openapi.IN_QUERY,
+            description="Value to search for (required with 'by')",
+            type=openapi.TYPE_STRING,
+            required=False
+        ),
+        openapi.Parameter(
+            'labels',
+            openapi.IN_QUERY,
+            description="Boolean label expression, e.g. 'Person AND NOT Admin'",
+            type=openapi.TYPE_STRING,
+            required=False
+        ),
+        openapi.Parameter(
+            'match',
+            openapi.IN_QUERY,
+            description="How 'value' is matched: exact (default), startswith, contains or fuzzy",
+            type=openapi.TYPE_STRING,
+            required=False,
+            enum=['exact', 'startswith', 'contains', 'fuzzy']
+        ),
+        openapi.Parameter(
+            'max_distance',
+            openapi.IN_QUERY,
+            description="Maximum edit distance for fuzzy matches (0-3; default by query length)",
+            type=openapi.TYPE_INTEGER,
+            required=False
+        ),
+        openapi.Parameter(
+            'explain',
+            openapi.IN_QUERY,
+            description="Include the chosen query plan and rows examined",
+            type=openapi.TYPE_BOOLEAN,
+            required=False
+        ),
+    ] + PAGINATION_PARAMETERS + PROJECTION_PARAMETERS + UPDATED_SINCE_PARAMETERS,
+    responses={
+        200: openapi.Response(
+            description="Successful retrieval of nodes",
+            schema=NodeListResponseSerializer(),
+            examples={
+                "application/json": {
+                    "count": 1,
+                    "next": None,
+                    "query_params": {
+                        "by": "name",
+                        "value": "Alice Johnson"
+                    },
+                    "nodes": [
+                        {
+                            "node_id": "n001",
+                            "labels": ["Person", "User"],
+                            "properties": {
+                                "name": "Alice Johnson",
+                                "email": "alice@example.com",
+                                "age": 28,
+                                "city": "New York",
+                                "status": "active",
+                                "join_date": "2023-01-15"
+                            },
+                            "created_at": "2023-01-15T10:30:00Z",
+                            "updated_at": "2024-10-20T14:22:00Z",
+                            "relationship_count": 5,
+                            "degree": {
+                                "incoming": 3,
+                                "outgoing": 2,
+                                "total": 5
+                            }
+                        }
+                    ]
+                }
+            }
+        ),
+        400: openapi.Response(
+            description="Bad request - Invalid parameters",
+            examples={
+                "application/json": {
+                    "error": "Invalid field 'invalid_field'. Allowed fields are: node_id, name, label, type, email, age, city, status"
+                }
+            }
+        ),
+        404: openapi.Response(
+            description="No nodes found matching the criteria",
+            examples={
+                "application/json": {
+                    "count": 0,
+                    "query_params": {
+                        "by": "name",
+                        "value": "NonExistent"
+                    },
+                    "nodes": [],
+                    "message": "No nodes found matching the specified criteria"
+                }
+            }
+        )
+    },
+    tags=['Graph Nodes']
 )
-from .services import GraphDatabaseService
 
 
 class GetNodesView(APIView):
     """
-    API endpoint to retrieve nodes from the graph database based on criteria.
-    
-    This endpoint accepts multiple query parameters to filter nodes by various fields
-    such as node_id, name, label, or any custom property.
+    API endpoint to retrieve nodes from the graph database based on criteria.
+    
+    This endpoint accepts multiple query parameters to filter nodes by various fields
+    such as node_id, name, label, or any custom property.
+    """
+    renderer_classes = LIST_RENDERER_CLASSES
+    
+    @GET_NODES_SCHEMA
+    def get(self, request):
+        """
+        Handle GET request to retrieve nodes
+        """
+        # Validate query parameters
+        serializer = NodeQuerySerializer(data=request.query_params)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Extract validated data
+        data = serializer.validated_data
+        
+        # Query the graph database
+        page = GraphDatabaseService.get_nodes_page(**self.page_arguments(request, data))
+        return self.page_response(request, data, page)
+    
+    @staticmethod
+    def page_arguments(request, data):
+        """
+        Get the get_nodes_page arguments for a validated query
+        """
+        return dict(
+            predicates=data['predicates'],
+            after=data.get('cursor'),
+            limit=data['page_size'],
+            explain=data['explain'],
+            encoded=wants_json(request),
+            columnar=wants_columns(request),
+            projection=data['projection'],
+            updated_since=data.get('updated_since')
+        )
+    
+    @staticmethod
+    def page_response(request, data, page):
+        """
+        Build the response for one page of matching nodes
+        """
+        high_water_mark = get_high_water_mark(data, page)
+        
+        # Prepare response
+        response_data = {
+            "count": page.count,
+            "next": get_next_link(request, page.next_after, high_water_mark)
+        }
+        if high_water_mark is not None:
+            response_data["high_water_mark"] = high_water_mark
+        response_data["query_params"] = data['query_params']
+        response_data["nodes"] = page.nodes if page.nodes is not None else []
+        if page.explain is not None:
+            response_data["explain"] = page.explain
+        
+        # Add message if no nodes found
+        if page.count == 0:
+            response_data["message"] = "No nodes found matching the specified criteria"
+            return Response(response_data, status=status.HTTP_404_NOT_FOUND)
+        
+        # Serve cached node bytes directly when the client wants JSON
+        if page.encoded is not None:
+            del response_data["nodes"]
+            return encoded_list_response(request, response_data, page)
+        
+        if page.columns is not None:
+            del response_data["nodes"]
+            response_data["columns"] = page.columns
+        
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+GET_ALL_NODES_SCHEMA = swagger_auto_schema(
+    operation_description="""
+    Retrieve all nodes from the graph database.
+    
+    This endpoint returns all nodes without any filtering.
+    Useful for getting a complete view of the graph structure.
+    
+    Results are returned in pages of `page_size` nodes. Follow the `next`
+    link (or pass its `cursor`) to fetch the following page.
+    
+    Pass `fields` and/or `properties` to return only part of each node.
+    
+    Pass `updated_since` to return only nodes updated strictly after that
+    time. The response then carries `high_water_mark`; poll again with
+    `updated_since` set to it to fetch just the next changes.
+    
+    Send `Accept: application/msgpack` for MessagePack or
+    `Accept: application/vnd.apache.arrow.stream` for a columnar Arrow
+    IPC stream (`?format=msgpack` / `?format=arrow` also work).
+    
+    JSON responses carry an `ETag`; send it back in `If-None-Match` to
+    get `304 Not Modified` when the page has not changed.
+    """,
+    manual_parameters=(PAGINATION_PARAMETERS + PROJECTION_PARAMETERS
+                       + UPDATED_SINCE_PARAMETERS),
+    responses={
+        200: openapi.Response(
+            description="Successful retrieval of all nodes",
+            schema=NodeListResponseSerializer(),
+            examples={
+                "application/json": {
+                    "count": 6,
+                    "next": None,
+                    "nodes": [
+                        {
+                            "node_id": "n001",
+                            "labels": ["Person", "User"],
+                            "properties": {
+                                "name": "Alice Johnson",
+                                "email": "alice@example.com",
+                                "age": 28,
+                                "city": "New York",
+                                "status": "active"
+                            },
+                            "created_at": "2023-01-15T10:30:00Z",
+                            "updated_at": "2024-10-20T14:22:00Z",
+                            "relationship_count": 5,
+                            "degree": {
+                                "incoming": 3,
+                                "outgoing": 2,
+                                "total": 5
+                            }
+                        }
+                    ]
+                }
+            }
+        )
+    },
+    tags=['Graph Nodes']
+)
+
+
+class GetAllNodesView(APIView):
+    """
+    API endpoint to retrieve all nodes from the graph database.
+    """
+    renderer_classes = LIST_RENDERER_CLASSES
+    
+    @GET_ALL_NODES_SCHEMA
+    def get(self, request):
+        """
+        Handle GET request to retrieve all nodes
+        """
+        serializer = NodeListQuerySerializer(data=request.query_params)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        page = GraphDatabaseService.get_nodes_page(**self.page_arguments(request, data))
+        return self.page_response(request, data, page)
+    
+    @staticmethod
+    def page_arguments(request, data):
+        """
+        Get the get_nodes_page arguments for a validated listing
+        """
+        return dict(
+            after=data.get('cursor'),
+            limit=data['page_size'],
+            encoded=wants_json(request),
+            columnar=wants_columns(request),
+            projection=data['projection'],
+            updated_since=data.get('updated_since')
+        )
+    
+    @staticmethod
+    def page_response(request, data, page):
+        """
+        Build the response for one page of nodes
+        """
+        high_water_mark = get_high_water_mark(data, page)
+        
+        response_data = {
+            "count": page.count,
+            "next": get_next_link(request, page.next_after, high_water_mark)
+        }
+        if high_water_mark is not None:
+            response_data["high_water_mark"] = high_water_mark
+        
+        # Serve cached node bytes directly when the client wants JSON
+        if page.encoded is not None:
+            return encoded_list_response(request, response_data, page)
+        
+        if page.columns is not None:
+            response_data["columns"] = page.columns
+        else:
+            response_data["nodes"] = page.nodes
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+GET_NODE_BY_ID_SCHEMA = swagger_auto_schema(
+    operation_description="""
+    Retrieve a specific node by its unique identifier.
+    
+    **Path Parameter:**
+    - `node_id`: The unique identifier of the node
+    
+    **Example:**
+    - `/api/nodes/n001/`
+    - Name and labels only: `/api/nodes/n001/?fields=labels&properties=name`
+    
+    **Caching:**
+    JSON responses carry an `ETag` and a `Last-Modified` taken from the
+    node's `updated_at`. Send `If-None-Match` or `If-Modified-Since` to
+    get `304 Not Modified` when the node has not changed.
+    """,
+    manual_parameters=PROJECTION_PARAMETERS,
+    responses={
+        200: openapi.Response(
+            description="Node found successfully",
+            schema=NodeDetailSerializer(),
+            examples={
+                "application/json": {
+                    "node_id": "n001",
+                    "labels": ["Person", "User"],
+                    "properties": {
+                        "name": "Alice Johnson",
+                        "email": "alice@example.com",
+                        "age": 28,
+                        "city": "New York",
+                        "status": "active",
+                        "join_date": "2023-01-15"
+                    },
+                    "created_at": "2023-01-15T10:30:00Z",
+                    "updated_at": "2024-10-20T14:22:00Z",
+                    "relationship_count": 5,
+                    "degree": {
+                        "incoming": 3,
+                        "outgoing": 2,
+                        "total": 5
+                    }
+                }
+            }
+        ),
+        404: openapi.Response(
+            description="Node not found",
+            examples={
+                "application/json": {
+                    "error": "Node with ID 'n999' not found"
+                }
+            }
+        )
+    },
+    tags=['Graph Nodes']
+)
+
+
+class GetNodeByIdView(APIView):
+    """
+    API endpoint to retrieve a specific node by its ID.
+    """
+    
+    @GET_NODE_BY_ID_SCHEMA
+    def get(self, request, node_id):
+        """
+        Handle GET request to retrieve a specific node by ID
+        """
+        serializer = NodeProjectionSerializer(data=request.query_params)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        projection = serializer.validated_data['projection']
+        
+        # Serve the cached node bytes directly when the client wants JSON
+        if wants_json(request):
+            encoded = GraphDatabaseService.get_encoded_node(node_id, projection)
+            return self.node_response(request, node_id, encoded=encoded)
+        node = GraphDatabaseService.get_node_by_id(node_id, projection)
+        return self.node_response(request, node_id, node=node)
+    
+    @staticmethod
+    def node_response(request, node_id, encoded=None, node=None):
+        """
+        Build the response for a node looked up encoded or as a dict
+        """
+        if encoded is not None:
+            body, etag, modified = encoded
+            return conditional_json_response(request, etag, lambda: body, modified)
+        if node is not None:
+            return Response(node, status=status.HTTP_200_OK)
+        
+        return Response(
+            {"error": f"Node with ID '{node_id}' not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+
+class AsyncGetNodesView(AsyncAPIView, GetNodesView):
+    """
+    Async version of GetNodesView, routed when GRAPH_ASYNC_VIEWS is set
+    """
+    
+    @GET_NODES_SCHEMA
+    async def get(self, request):
+        """
+        Handle GET request to retrieve nodes
+        """
+        serializer = NodeQuerySerializer(data=request.query_params)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        page = await AsyncGraphDatabaseService.get_nodes_page(
+            **self.page_arguments(request, data)
+        )
+        return self.page_response(request, data, page)
+
+
+class AsyncGetAllNodesView(AsyncAPIView, GetAllNodesView):
+    """
+    Async version of GetAllNodesView, routed when GRAPH_ASYNC_VIEWS is set
+    """
+    
+    @GET_ALL_NODES_SCHEMA
+    async def get(self, request):
+        """
+        Handle GET request to retrieve all nodes
+        """
+        serializer = NodeListQuerySerializer(data=request.query_params)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        page = await AsyncGraphDatabaseService.get_nodes_page(
+            **self.page_arguments(request, data)
+        )
+        return self.page_response(request, data, page)
+
+
+class AsyncGetNodeByIdView(AsyncAPIView, GetNodeByIdView):
+    """
+    Async version of GetNodeByIdView, routed when GRAPH_ASYNC_VIEWS is set
+    """
+    
+    @GET_NODE_BY_ID_SCHEMA
+    async def get(self, request, node_id):
+        """
+        Handle GET request to retrieve a specific node by ID
+        """
+        serializer = NodeProjectionSerializer(data=request.query_params)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        projection = serializer.validated_data['projection']
+        
+        if wants_json(request):
+            encoded = await AsyncGraphDatabaseService.get_encoded_node(node_id, projection)
+            return self.node_response(request, node_id, encoded=encoded)
+        node = await AsyncGraphDatabaseService.get_node_by_id(node_id, projection)
+        return self.node_response(request, node_id, node=node)
+
+
+class GetNodeRelationshipsView(APIView):
+    """
+    API endpoint to retrieve the relationships of a specific node.
+    """
+    
+    @swagger_auto_schema(
+        operation_description="""
+        Retrieve the relationships connected to a node.
+        
+        **Path Parameter:**
+        - `node_id`: The unique identifier of the node
+        
+        **Query Parameters:**
+        - `direction`: `OUTGOING`, `INCOMING` or `BOTH` (default)
+        - `type`: Comma-separated relationship types to keep
+        
+        **Examples:**
+        - `/api/nodes/n001/relationships/`
+        - `/api/nodes/n003/relationships/?direction=OUTGOING&type=MANAGES`
+        """,
+        query_serializer=RelationshipQuerySerializer,
+        responses={
+            200: openapi.Response(
+                description="Relationships retrieved successfully",
+                schema=NodeRelationshipListResponseSerializer(),
+                examples={
+                    "application/json": {
+                        "node_id": "n003",
+                        "count": 1,
+                        "relationships": [
+                            {
+                                "relationship_id": "r003",
+                                "type": "MANAGES",
+                                "direction": "OUTGOING",
+                                "target_node_id": "n001",
+                                "properties": {
+                                    "since": "2023-01-20"
+                                }
+                            }
+                        ]
+                    }
+                }
+            ),
+            404: openapi.Response(
+                description="Node not found",
+                examples={
+                    "application/json": {
+                        "error": "Node with ID 'n999' not found"
+                    }
+                }
+            )
+        },
+        tags=['Graph Nodes']
+    )
+    def get(self, request, node_id):
+        """
+        Handle GET request to retrieve the relationships of a node
+        """
+        serializer = RelationshipQuerySerializer(data=request.query_params)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        relationships = GraphDatabaseService.get_relationships(
+            node_id,
+            direction=serializer.validated_data['direction'],
+            types=serializer.validated_data.get('type')
+        )
+        
+        if relationships is None:
+            return Response(
+                {"error": f"Node with ID '{node_id}' not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        response_data = {
+            "node_id": node_id,
+            "count": len(relationships),
+            "relationships": relationships
+        }
+        
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class GetNodeNeighborhoodView(APIView):
+    """
+    API endpoint to retrieve every node within a number of hops of a node.
+    """
+    
+    @swagger_auto_schema(
+        operation_description="""
+        Retrieve every node within `depth` hops of a node, nearest first.
+        
+        **Path Parameter:**
+        - `node_id`: The unique identifier of the start node
+        
+        **Query Parameters:**
+        - `depth`: Maximum number of hops (default 2, max 5)
+        - `direction`: `OUTGOING`, `INCOMING` or `BOTH` (default)
+        - `type`: Comma-separated relationship types to follow
+        - `max_fanout`: Maximum relationships followed out of any node (default 1000)
+        - `limit`: Maximum number of nodes returned (default 1000)
+        
+        `truncated` is true when `max_fanout` or `limit` cut the traversal short.
+        
+        **Example:**
+        - `/api/nodes/n001/neighborhood/?depth=2`
+        """,
+        query_serializer=NeighborhoodQuerySerializer,
+        responses={
+            200: openapi.Response(
+                description="Traversal completed",
+                schema=NeighborhoodResponseSerializer(),
+                examples={
+                    "application/json": {
+                        "node_id": "n004",
+                        "count": 1,
+                        "truncated": False,
+                        "results": [
+                            {
+                                "distance": 1,
+                                "node": {
+                                    "node_id": "n001",
+                                    "labels": ["Person", "User"],
+                                    "properties": {
+                                        "name": "Alice Johnson"
+                                    },
+                                    "created_at": "2023-01-15T10:30:00Z",
+                                    "updated_at": "2024-10-20T14:22:00Z",
+                                    "relationship_count": 5,
+                                    "degree": {
+                                        "incoming": 3,
+                                        "outgoing": 2,
+                                        "total": 5
+                                    }
+                                }
+                            }
+                        ]
+                    }
+                }
+            ),
+            404: openapi.Response(
+                description="Node not found",
+                examples={
+                    "application/json": {
+                        "error": "Node with ID 'n999' not found"
+                    }
+                }
+            )
+        },
+        tags=['Graph Traversal']
+    )
+    def get(self, request, node_id):
+        """
+        Handle GET request to traverse the neighborhood of a node
+        """
+        serializer = NeighborhoodQuerySerializer(data=request.query_params)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        result = GraphDatabaseService.get_neighborhood(
+            node_id,
+            depth=data['depth'],
+            direction=data['direction'],
+            types=data.get('type'),
+            max_fanout=data['max_fanout'],
+            limit=data['limit']
+        )
+        
+        if result is None:
+            return Response(
+                {"error": f"Node with ID '{node_id}' not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        results, truncated = result
+        response_data = {
+            "node_id": node_id,
+            "count": len(results),
+            "truncated": truncated,
+            "results": results
+        }
+        
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class GetShortestPathView(APIView):
+    """
+    API endpoint to find how two nodes are connected.
+    """
+    
+    @swagger_auto_schema(
+        operation_description="""
+        Find a shortest path from a node to a target node.
+        
+        **Path Parameter:**
+        - `node_id`: The unique identifier of the start node
+        
+        **Query Parameters:**
+        - `target`: ID of the node to reach (required)
+        - `max_depth`: Maximum path length in hops (default 6, max 10)
+        - `direction`: `OUTGOING` follows relationships forward, `INCOMING`
+          backward, `BOTH` (default) ignores their direction
+        - `type`: Comma-separated relationship types to follow
+        
+        **Example:**
+        - `/api/nodes/n004/shortest-path/?target=n005`
+        """,
+        query_serializer=ShortestPathQuerySerializer,
+        responses={
+            200: openapi.Response(
+                description="Path found",
+                schema=ShortestPathResponseSerializer(),
+                examples={
+                    "application/json": {
+                        "source": "n004",
+                        "target": "n005",
+                        "length": 2,
+                        "nodes": ["n004", "n001", "n005"],
+                        "relationships": [
+                            {
+                                "relationship_id": "r008",
+                                "type": "KNOWS",
+                                "direction": "OUTGOING",
+                                "target_node_id": "n001",
+                                "properties": {
+                                    "since": "2023-06-01",
+                                    "weight": 0.4
+                                }
+                            },
+                            {
+                                "relationship_id": "r005",
+                                "type": "WORKS_AT",
+                                "direction": "OUTGOING",
+                                "target_node_id": "n005",
+                                "properties": {
+                                    "role": "Engineer",
+                                    "since": "2023-01-15"
+                                }
+                            }
+                        ]
+                    }
+                }
+            ),
+            404: openapi.Response(
+                description="Node not found or no path within max_depth",
+                examples={
+                    "application/json": {
+                        "error": "No path from 'n005' to 'n004' within 6 hops"
+                    }
+                }
+            )
+        },
+        tags=['Graph Traversal']
+    )
+    def get(self, request, node_id):
+        """
+        Handle GET request to find a shortest path
+        """
+        serializer = ShortestPathQuerySerializer(data=request.query_params)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        target = data['target']
+        for endpoint in (node_id, target):
+            if GraphDatabaseService.get_node_by_id(endpoint) is None:
+                return Response(
+                    {"error": f"Node with ID '{endpoint}' not found"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+        
+        path = GraphDatabaseService.get_shortest_path(
+            node_id,
+            target,
+            max_depth=data['max_depth'],
+            direction=data['direction'],
+            types=data.get('type')
+        )
+        
+        if path is None:
+            return Response(
+                {"error": f"No path from '{node_id}' to '{target}' within {data['max_depth']} hops"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        response_data = {
+            "source": node_id,
+            "target": target,
+            **path
+        }
+        
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class GetNodesByIdsView(APIView):
+    """
+    API endpoint to retrieve many nodes by ID in a single request.
     """
     
     @swagger_auto_schema(
         operation_description="""
-        Retrieve nodes from the graph database based on specified criteria.
+        Retrieve many nodes by their unique identifiers in one round trip.
         
-        **Query Parameters:**
-        - `by`: The field to query by (e.g., 'node_id', 'name', 'label', 'email', 'city', 'status', 'age')
-        - `value`: The value to search for in the specified field
+        **Request Body:**
+        - `node_ids`: List of node IDs to look up (max 10000)
         
-        **Examples:**
-        - Get node by ID: `?by=node_id&value=n001`
-        - Get nodes by name: `?by=name&value=Alice Johnson`
-        - Get nodes by label: `?by=label&value=Person`
-        - Get nodes by city: `?by=city&value=New York`
-        - Get nodes by status: `?by=status&value=active`
-        
-        **Supported 'by' fields:**
-        - `node_id`: Unique node identifier
-        - `name`: Node name property
-        - `label` or `type`: Node label/type
-        - `email`: Email property
-        - `age`: Age property
-        - `city`: City property
-        - `status`: Status property
+        Nodes are returned in request order; IDs that do not exist are listed
+        under `missing` instead of failing the whole request.
         """,
-        manual_parameters=[
-            openapi.Parameter(
-                'by',
-                openapi.IN_QUERY,
-                description="Field to query by (node_id, name, label, type, email, age, city, status)",
-                type=openapi.TYPE_STRING,
-                required=True,
-                enum=['node_id', 'name', 'label', 'type', 'email', 'age', 'city', 'status']
-            ),
-            openapi.Parameter(
-                'value',
-                openapi.IN_QUERY,
-                description="Value to search for",
-                type=openapi.TYPE_STRING,
-                required=True
-            ),
-        ],
+        request_body=NodeBatchSerializer,
         responses={
             200: openapi.Response(
-                description="Successful retrieval of nodes",
-                schema=NodeListResponseSerializer(),
+                description="Batch lookup completed",
+                schema=NodeBatchResponseSerializer(),
                 examples={
                     "application/json": {
                         "count": 1,
-                        "query_params": {
-                            "by": "name",
-                            "value": "Alice Johnson"
-                        },
                         "nodes": [
                             {
                                 "node_id": "n001",
@@ -96,196 +1149,478 @@ class GetNodesView(APIView):
                                     "total": 5
                                 }
                             }
-                        ]
+                        ],
+                        "missing": ["n999"]
                     }
                 }
             ),
             400: openapi.Response(
-                description="Bad request - Invalid parameters",
+                description="Bad request - Invalid body",
+                examples={
+                    "application/json": {
+                        "error": {"node_ids": ["This field is required."]}
+                    }
+                }
+            )
+        },
+        tags=['Graph Nodes']
+    )
+    def post(self, request):
+        """
+        Handle POST request to retrieve nodes by a list of IDs
+        """
+        serializer = NodeBatchSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        nodes, missing = GraphDatabaseService.get_nodes_by_ids(
+            serializer.validated_data['node_ids']
+        )
+        
+        response_data = {
+            "count": len(nodes),
+            "nodes": nodes,
+            "missing": missing
+        }
+        
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class BulkIngestNodesView(APIView):
+    """
+    API endpoint to insert or replace nodes in bulk from an NDJSON upload.
+    """
+    parser_classes = [NDJSONParser]
+    permission_classes = [CanWriteGraph]
+    
+    # Per-line errors included in the response; the rest are only counted
+    MAX_REPORTED_ERRORS = 100
+    
+    @swagger_auto_schema(
+        operation_description="""
+        Insert or replace nodes from a newline-delimited JSON body
+        (`Content-Type: application/x-ndjson`), one node per line.
+        
+        Each line is validated like a node in any other response. A node
+        whose `node_id` exists replaces it; any other node is added. Invalid
+        lines are skipped and reported by line number without failing the
+        rest of the upload.
+        
+        Valid nodes are committed `batch_size` at a time. Each batch is
+        applied to a copy of the indexes and published at once, so readers
+        never see part of a batch and are never blocked by the ingest.
+        
+        `updated_at` may be left out: every ingested node is stamped with
+        the time of its commit, so it shows up in `updated_since` polls.
+        
+        Ingested nodes are held by this server process only.
+        
+        Only admin users may ingest, unless the
+        GRAPH_WRITE_PERMISSION_CLASSES setting says otherwise.
+        """,
+        manual_parameters=[
+            openapi.Parameter(
+                'batch_size',
+                openapi.IN_QUERY,
+                description="Nodes committed per batch (default 10000, max 100000)",
+                type=openapi.TYPE_INTEGER,
+                required=False
+            ),
+        ],
+        request_body=openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description="One JSON node per line"
+        ),
+        responses={
+            200: openapi.Response(
+                description="Upload processed",
                 examples={
                     "application/json": {
-                        "error": "Invalid field 'invalid_field'. Allowed fields are: node_id, name, label, type, email, age, city, status"
+                        "received": 3,
+                        "created": 1,
+                        "updated": 1,
+                        "failed": 1,
+                        "batches": 1,
+                        "version": 2,
+                        "errors": [
+                            {"line": 3, "error": {"labels": ["This field is required."]}}
+                        ]
                     }
                 }
             ),
-            404: openapi.Response(
-                description="No nodes found matching the criteria",
+            400: openapi.Response(
+                description="Bad request - Empty upload, or no valid nodes",
                 examples={
                     "application/json": {
-                        "count": 0,
-                        "query_params": {
-                            "by": "name",
-                            "value": "NonExistent"
-                        },
-                        "nodes": [],
-                        "message": "No nodes found matching the specified criteria"
+                        "error": "Request body must contain at least one node"
                     }
                 }
-            )
+            ),
+            401: openapi.Response(description="Credentials are missing or invalid"),
+            403: openapi.Response(description="Not allowed to ingest nodes"),
+            415: openapi.Response(description="Body is not application/x-ndjson")
         },
         tags=['Graph Nodes']
     )
-    def get(self, request):
+    def post(self, request):
         """
-        Handle GET request to retrieve nodes
+        Handle POST request to ingest nodes
         """
-        # Validate query parameters
-        serializer = NodeQuerySerializer(data=request.query_params)
+        query_serializer = BulkIngestQuerySerializer(data=request.query_params)
         
-        if not serializer.is_valid():
+        if not query_serializer.is_valid():
             return Response(
-                {"error": serializer.errors},
+                {"error": query_serializer.errors},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Extract validated data
-        by = serializer.validated_data['by']
-        value = serializer.validated_data['value']
+        errors = []
+        counts = {"received": 0, "failed": 0}
         
-        # Query the graph database
-        nodes = GraphDatabaseService.get_nodes_by_criteria(by, value)
+        def valid_nodes():
+            # request.data is {} rather than an iterator when the body is empty
+            for number, line in request.data or ():
+                counts["received"] += 1
+                try:
+                    yield validate_node(loads(line))
+                    continue
+                except ValidationError as exc:
+                    error = exc.detail
+                except ValueError as exc:
+                    error = f"Invalid JSON: {exc}"
+                counts["failed"] += 1
+                if len(errors) < self.MAX_REPORTED_ERRORS:
+                    errors.append({"line": number, "error": error})
+        
+        result = GraphDatabaseService.ingest_nodes(
+            valid_nodes(), query_serializer.validated_data['batch_size']
+        )
+        
+        if not counts["received"]:
+            return Response(
+                {"error": "Request body must contain at least one node"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Prepare response
         response_data = {
-            "count": len(nodes),
-            "query_params": {
-                "by": by,
-                "value": value
-            },
-            "nodes": nodes
+            "received": counts["received"],
+            "created": result["created"],
+            "updated": result["updated"],
+            "failed": counts["failed"],
+            "batches": result["batches"],
+            "version": GraphDatabaseService.get_dataset_version(),
+            "errors": errors
         }
         
-        # Add message if no nodes found
-        if len(nodes) == 0:
-            response_data["message"] = "No nodes found matching the specified criteria"
-            return Response(response_data, status=status.HTTP_404_NOT_FOUND)
-        
+        if not result["batches"]:
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
         return Response(response_data, status=status.HTTP_200_OK)
 
 
-class GetAllNodesView(APIView):
+class ExportNodesView(APIView):
     """
-    API endpoint to retrieve all nodes from the graph database.
+    API endpoint to stream every node in the graph as NDJSON.
+    """
+    
+    # Flush the response roughly every 64 KiB of encoded nodes
+    chunk_size = 64 * 1024
+    
+    @swagger_auto_schema(
+        operation_description="""
+        Stream all nodes from the graph database as newline-delimited JSON.
+        
+        Each line of the response body is one node object. Nodes are encoded
+        and sent as they are read, so memory use stays flat regardless of the
+        size of the graph. Intended for bulk sync jobs; use `/api/nodes/all/`
+        for paginated access.
+        """,
+        responses={
+            200: openapi.Response(
+                description="NDJSON stream of all nodes",
+                examples={
+                    "application/x-ndjson": (
+                        '{"node_id":"n001","labels":["Person","User"],...}\n'
+                        '{"node_id":"n002","labels":["Person","User"],...}\n'
+                    )
+                }
+            )
+        },
+        tags=['Graph Nodes']
+    )
+    def get(self, request):
+        """
+        Handle GET request to stream all nodes
+        """
+        response = StreamingHttpResponse(
+            self.stream_nodes(GraphDatabaseService.iter_nodes()),
+            content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = 'attachment; filename="nodes.ndjson"'
+        return response
+    
+    def stream_nodes(self, nodes):
+        """
+        Encode nodes one per line, yielding buffered chunks of bytes
+        """
+        buffer = []
+        size = 0
+        
+        for node in nodes:
+            line = dumps(node) + b'\n'
+            buffer.append(line)
+            size += len(line)
+            if size >= self.chunk_size:
+                yield b''.join(buffer)
+                buffer = []
+                size = 0
+        
+        if buffer:
+            yield b''.join(buffer)
+
+
+class AggregateNodesView(APIView):
+    """
+    API endpoint to count and summarize nodes without listing them.
     """
     
     @swagger_auto_schema(
         operation_description="""
-        Retrieve all nodes from the graph database.
+        Count nodes, optionally per group, with min, max, avg and a
+        histogram of a numeric field. Answered from the indexes without
+        reading any node.
+        
+        **Query Parameters:**
+        - `group_by`: `label` (or `type`), `name`, `email`, `age`, `city` or `status`
+        - `field`: Numeric field to summarize (`age`, `employees`)
+        - `bucket_size`: Histogram bucket width over `field`
+        - `limit`: Maximum number of groups, largest first (default 100)
+        - Any criteria accepted by `/api/nodes/` filter the nodes counted
+        
+        Labels group by label, so a node with two labels counts in both
+        groups. Text values group case-insensitively under their lower-case
+        form.
         
-        This endpoint returns all nodes without any filtering.
-        Useful for getting a complete view of the graph structure.
+        **Examples:**
+        - Nodes per city: `?group_by=city`
+        - Active people per city: `?group_by=city&label=Person&status=active`
+        - Age spread per label: `?group_by=label&field=age&bucket_size=10`
         """,
+        query_serializer=AggregateQuerySerializer,
         responses={
             200: openapi.Response(
-                description="Successful retrieval of all nodes",
-                schema=NodeListResponseSerializer(),
+                description="Aggregation computed",
+                schema=AggregateResponseSerializer(),
                 examples={
                     "application/json": {
-                        "count": 6,
-                        "nodes": [
-                            {
-                                "node_id": "n001",
-                                "labels": ["Person", "User"],
-                                "properties": {
-                                    "name": "Alice Johnson",
-                                    "email": "alice@example.com",
-                                    "age": 28,
-                                    "city": "New York",
-                                    "status": "active"
-                                },
-                                "created_at": "2023-01-15T10:30:00Z",
-                                "updated_at": "2024-10-20T14:22:00Z",
-                                "relationship_count": 5,
-                                "degree": {
-                                    "incoming": 3,
-                                    "outgoing": 2,
-                                    "total": 5
-                                }
-                            }
+                        "count": 4,
+                        "min": 28,
+                        "max": 42,
+                        "avg": 33.75,
+                        "query_params": {"label": "Person", "group_by": "city", "field": "age"},
+                        "group_count": 3,
+                        "groups": [
+                            {"value": "boston", "count": 2, "min": 28, "max": 42, "avg": 35.0},
+                            {"value": "new york", "count": 1, "min": 28, "max": 28, "avg": 28.0}
                         ]
                     }
                 }
+            ),
+            400: openapi.Response(
+                description="Bad request - Invalid parameters",
+                examples={
+                    "application/json": {
+                        "error": {"bucket_size": ["'field' is required for a histogram"]}
+                    }
+                }
             )
         },
         tags=['Graph Nodes']
     )
     def get(self, request):
         """
-        Handle GET request to retrieve all nodes
+        Handle GET request to aggregate nodes
         """
-        nodes = GraphDatabaseService.get_all_nodes()
+        serializer = AggregateQuerySerializer(data=request.query_params)
         
-        response_data = {
-            "count": len(nodes),
-            "nodes": nodes
-        }
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        try:
+            result = GraphDatabaseService.aggregate_nodes(
+                data['predicates'],
+                group_by=data.get('group_by'),
+                field=data.get('field'),
+                bucket_size=data.get('bucket_size'),
+                limit=data['limit'],
+                explain=data['explain'],
+                updated_since=data.get('updated_since')
+            )
+        except HistogramError as exc:
+            return Response(
+                {"error": {"bucket_size": [str(exc)]}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        response_data = {key: result[key] for key in ("count", "min", "max", "avg", "histogram")
+                         if key in result}
+        response_data["query_params"] = data['query_params']
+        for key in ("group_count", "groups", "explain"):
+            if key in result:
+                response_data[key] = result[key]
         
         return Response(response_data, status=status.HTTP_200_OK)
 
 
-class GetNodeByIdView(APIView):
+class SearchNodesView(APIView):
     """
-    API endpoint to retrieve a specific node by its ID.
+    API endpoint for ranked full-text search across node properties.
     """
     
     @swagger_auto_schema(
         operation_description="""
-        Retrieve a specific node by its unique identifier.
+        Search the words in every string property of every node (name,
+        email, city, status, ...), most relevant first.
         
-        **Path Parameter:**
-        - `node_id`: The unique identifier of the node
+        **Query Parameters:**
+        - `q`: Free text; nodes containing any of its words match
+        - `limit`: Maximum number of results (default 10, max 100)
+        - `fields`, `properties`: Sparse fieldsets, as on `/api/nodes/`
         
-        **Example:**
-        - `/api/nodes/n001/`
+        Words are matched case-insensitively and punctuation splits them,
+        so `example` matches `alice@example.com`. Results are ranked by
+        BM25: rarer words and more occurrences in shorter nodes score higher.
+        
+        **Examples:**
+        - `/api/nodes/search/?q=alice`
+        - `/api/nodes/search/?q=boston active&limit=5`
         """,
+        query_serializer=SearchQuerySerializer,
         responses={
             200: openapi.Response(
-                description="Node found successfully",
-                schema=NodeDetailSerializer(),
+                description="Matching nodes, most relevant first",
+                schema=SearchResponseSerializer(),
                 examples={
                     "application/json": {
-                        "node_id": "n001",
-                        "labels": ["Person", "User"],
-                        "properties": {
-                            "name": "Alice Johnson",
-                            "email": "alice@example.com",
-                            "age": 28,
-                            "city": "New York",
-                            "status": "active",
-                            "join_date": "2023-01-15"
-                        },
-                        "created_at": "2023-01-15T10:30:00Z",
-                        "updated_at": "2024-10-20T14:22:00Z",
-                        "relationship_count": 5,
-                        "degree": {
-                            "incoming": 3,
-                            "outgoing": 2,
-                            "total": 5
-                        }
+                        "query": "alice",
+                        "count": 1,
+                        "results": [
+                            {
+                                "score": 1.8123,
+                                "node": {
+                                    "node_id": "n001",
+                                    "labels": ["Person", "User"],
+                                    "properties": {
+                                        "name": "Alice Johnson",
+                                        "email": "alice@example.com"
+                                    },
+                                    "created_at": "2023-01-15T10:30:00Z",
+                                    "updated_at": "2024-10-20T14:22:00Z",
+                                    "relationship_count": 5,
+                                    "degree": {
+                                        "incoming": 3,
+                                        "outgoing": 2,
+                                        "total": 5
+                                    }
+                                }
+                            }
+                        ]
                     }
                 }
             ),
             404: openapi.Response(
-                description="Node not found",
+                description="No nodes match the search",
                 examples={
                     "application/json": {
-                        "error": "Node with ID 'n999' not found"
+                        "query": "zebra",
+                        "count": 0,
+                        "results": [],
+                        "message": "No nodes found matching the search"
                     }
                 }
             )
         },
         tags=['Graph Nodes']
     )
-    def get(self, request, node_id):
+    def get(self, request):
         """
-        Handle GET request to retrieve a specific node by ID
+        Handle GET request to search nodes
         """
-        node = GraphDatabaseService.get_node_by_id(node_id)
+        serializer = SearchQuerySerializer(data=request.query_params)
         
-        if node is None:
+        if not serializer.is_valid():
             return Response(
-                {"error": f"Node with ID '{node_id}' not found"},
-                status=status.HTTP_404_NOT_FOUND
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
             )
         
-        return Response(node, status=status.HTTP_200_OK)
+        data = serializer.validated_data
+        hits = GraphDatabaseService.search_nodes(
+            data['q'],
+            limit=data['limit'],
+            projection=data['projection']
+        )
+        
+        response_data = {
+            "query": data['q'],
+            "count": len(hits),
+            "results": [{"score": round(score, 4), "node": node} for score, node in hits]
+        }
+        
+        if not hits:
+            response_data["message"] = "No nodes found matching the search"
+            return Response(response_data, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class QueryCacheStatsView(APIView):
+    """
+    API endpoint to report how well the query result cache is doing.
+    """
+    
+    @swagger_auto_schema(
+        operation_description="""
+        Get the query result cache's counters, to size it with the
+        `GRAPH_QUERY_CACHE` setting.
+        
+        `size` and `max_size` count cached ordinals (plus one per entry).
+        The cache empties whenever the dataset version (`generation`)
+        changes, e.g. after a bulk ingest; `invalidations` counts those.
+        Identical queries that miss at the same time run once between
+        them; `coalesced` counts the requests that shared another's run.
+        """,
+        responses={
+            200: openapi.Response(
+                description="Cache statistics",
+                examples={
+                    "application/json": {
+                        "enabled": True,
+                        "generation": 3,
+                        "entries": 120,
+                        "size": 48211,
+                        "max_size": 1000000,
+                        "hits": 9876,
+                        "misses": 432,
+                        "hit_rate": 0.9581,
+                        "evictions": 0,
+                        "invalidations": 2,
+                        "coalesced": 14
+                    }
+                }
+            )
+        },
+        tags=['Graph Nodes']
+    )
+    def get(self, request):
+        """
+        Handle GET request for cache statistics
+        """
+        return Response(GraphDatabaseService.get_query_cache_stats(), status=status.HTTP_200_OK)